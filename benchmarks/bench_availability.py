@@ -0,0 +1,97 @@
+"""
+Microbenchmark of the availability conversion.
+
+Compares the former nested loop (courts x bookings x hours) with the bitmask based
+`AvailabilityGrid` on synthetic reservation payloads of increasing size.
+
+Run from the project root with:
+    python -m benchmarks.bench_availability
+"""
+
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from src.booking.availability_engine import AvailabilityGrid
+from src.booking.constants import CourtAvailability, CourtBooking
+
+
+def generate_bookings(
+    num_courts: int, bookings_per_court: int, seed: int = 42
+) -> tuple[list[str], list[CourtBooking]]:
+    """Generate random 30 - 120 minute bookings between 07:00 and 22:00."""
+    rng = random.Random(seed)
+    day = datetime(2025, 6, 1)
+    court_names = [f"Platz {i}" for i in range(num_courts)]
+    bookings = []
+    for court_name in court_names:
+        for _ in range(bookings_per_court):
+            start = day + timedelta(minutes=rng.randrange(7 * 60, 21 * 60, 30))
+            end = start + timedelta(minutes=rng.choice((30, 60, 90, 120)))
+            bookings.append(
+                CourtBooking(court_name=court_name, start_time=start, end_time=end)
+            )
+    return court_names, bookings
+
+
+def nested_loop_availabilities(
+    court_names: list[str], bookings: list[CourtBooking]
+) -> list[CourtAvailability]:
+    """Reference implementation of the former `convert_bookings_to_availabilities`."""
+    all_court_availabilities = []
+    for court_name in sorted(set(court_names)):
+        bookable_hours = {hour: True for hour in range(7, 22)}
+        court_bookings = [b for b in bookings if b.court_name == court_name]
+        for booking in court_bookings:
+            current_time = booking.start_time
+            while current_time < booking.end_time:
+                hour_start = current_time
+                hour_end = current_time + timedelta(hours=1)
+                if not (
+                    booking.end_time <= hour_start or booking.start_time >= hour_end
+                ):
+                    bookable_hours[current_time.hour] = False
+                current_time += timedelta(hours=1)
+        all_court_availabilities.append(
+            CourtAvailability(court_name=court_name, availability=bookable_hours)
+        )
+    return all_court_availabilities
+
+
+def bitmask_availabilities(
+    court_names: list[str], bookings: list[CourtBooking]
+) -> list[CourtAvailability]:
+    return AvailabilityGrid(
+        court_names=court_names, bookings=bookings
+    ).to_court_availabilities()
+
+
+def main():
+    print(
+        f"{'courts':>7} {'bookings':>9} {'nested [ms]':>12} {'bitmask [ms]':>13} {'speedup':>8}"
+    )
+    for num_courts, bookings_per_court in [(23, 10), (100, 20), (500, 20), (1000, 40)]:
+        court_names, bookings = generate_bookings(num_courts, bookings_per_court)
+        repeat = 3
+        nested = min(
+            timeit.repeat(
+                lambda: nested_loop_availabilities(court_names, bookings),
+                number=1,
+                repeat=repeat,
+            )
+        )
+        bitmask = min(
+            timeit.repeat(
+                lambda: bitmask_availabilities(court_names, bookings),
+                number=1,
+                repeat=repeat,
+            )
+        )
+        print(
+            f"{num_courts:>7} {len(bookings):>9} {nested * 1e3:>12.2f} "
+            f"{bitmask * 1e3:>13.2f} {nested / bitmask:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
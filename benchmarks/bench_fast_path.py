@@ -0,0 +1,122 @@
+"""
+Hit rate and latency of the rule-based fast path.
+
+Parses a corpus of typical user queries, reports which share is answered by the fast path
+and how long parsing and answering takes from the sample payloads in
+`benchmarks/payloads`. With `--agent-seconds` the latency saved per hit is estimated
+against the given mean latency of an agent answer (several LLM turns and tool calls).
+
+Run from the project root with:
+    python -m benchmarks.bench_fast_path [--agent-seconds 6.0]
+"""
+
+import argparse
+import json
+import timeit
+from datetime import date, datetime
+
+from benchmarks.bench_tool_output import PAYLOAD_DIR
+from src.agent.fast_path import format_answer, parse_query, search_query
+from src.booking.booking_fetcher import CourtBookingFetcher
+from src.booking.constants import AvailabilitySnapshot
+
+# Outdoor queries are asked on the day of the outdoor payload, indoor ones on the day of
+# the indoor payload
+QUERIES: dict[str, list[str]] = {
+    "outdoor_2025-06-14.json": [
+        "Ich möchte heute um 18 Uhr am T-Platz spielen.",
+        "Ist heute Abend ab 19 Uhr ein Platz frei?",
+        "Freie Plätze heute zwischen 10 und 13 Uhr für 90 Minuten",
+        "Heute Morgen auf Platz 3 spielen",
+        "Kann ich heute um 17:30 für 2 Stunden spielen?",
+        "Heute nachmittag noch ein Platz frei?",
+        "Ich suche heute einen Sandplatz um 18 Uhr",
+        "Sag mir Bescheid wenn heute um 19 Uhr ein Platz frei wird",
+        "Welche Plätze haben Wingfield?",
+        "Hallo!",
+        "Heute oder morgen um 18 Uhr?",
+        "Wann ist diese Woche noch etwas frei?",
+    ],
+    "indoor_2025-01-18.json": [
+        "Ich suche freie Hallenplätze für heute Abend ab 19 Uhr.",
+        "Hallenplatz heute um 20 Uhr",
+        "Platz 8 heute von 9 bis 12 Uhr",
+        "Heute um 7 Uhr abends in der Halle spielen",
+        "Ist heute ein Einzelplatz in der Halle frei?",
+        "Heute spielen?",
+    ],
+}
+
+
+def load_snapshot(file_name: str) -> AvailabilitySnapshot:
+    raw_bookings = json.loads((PAYLOAD_DIR / file_name).read_text())
+    target_date = datetime.strptime(
+        raw_bookings["reservations"][0]["date"], "%m/%d/%Y"
+    ).date()
+    for_indoors = file_name.startswith("indoor")
+    booking_fetcher = CourtBookingFetcher(
+        target_date=target_date, for_indoors=for_indoors, raw_bookings=raw_bookings
+    )
+    return AvailabilitySnapshot(
+        target_date=target_date,
+        for_indoors=for_indoors,
+        fetched_at=datetime.now(),
+        court_bookings=booking_fetcher.get_court_bookings(),
+        court_availabilities=booking_fetcher.get_court_availabilities(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument(
+        "--agent-seconds",
+        type=float,
+        default=None,
+        help="Mean latency of an agent answer to estimate the latency saved",
+    )
+    args = parser.parse_args()
+
+    hits, total = 0, 0
+    fast_path_seconds = []
+    for file_name, queries in QUERIES.items():
+        snapshot = load_snapshot(file_name)
+        today: date = snapshot.target_date
+        for query_text in queries:
+            total += 1
+            query = parse_query(query_text, today=today)
+            if query is None:
+                print(f"agent      {query_text}")
+                continue
+            hits += 1
+
+            def answer():
+                slots, alternatives = search_query(snapshot, query)
+                return format_answer(query, slots, alternatives)
+
+            seconds = (
+                timeit.timeit(
+                    lambda: parse_query(query_text, today=today) and answer(),
+                    number=args.repeat,
+                )
+                / args.repeat
+            )
+            fast_path_seconds.append(seconds)
+            print(f"fast path  {query_text}  ({seconds * 1e3:.2f} ms)")
+            print("           " + answer().replace("\n", "\n           "))
+
+    mean_fast_path = sum(fast_path_seconds) / len(fast_path_seconds)
+    print(f"\nHit rate: {hits}/{total} = {hits / total:.0%}")
+    print(
+        f"Mean fast path latency (parse + search + format): {mean_fast_path * 1e3:.2f} ms"
+    )
+    if args.agent_seconds is not None:
+        saved = args.agent_seconds - mean_fast_path
+        print(
+            f"Latency saved: {saved:.2f} s per hit, "
+            f"{saved * hits / total:.2f} s per query on average"
+        )
+
+
+if __name__ == "__main__":
+    main()
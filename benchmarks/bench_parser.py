@@ -0,0 +1,90 @@
+"""
+Microbenchmark of the eBuSy reservation parser.
+
+Compares the former per-reservation parsing (three `strptime` calls and a validated
+pydantic model per reservation) with the bulk parser, which parses every distinct
+(date, time) pair once.
+
+Run from the project root with:
+    python -m benchmarks.bench_parser
+"""
+
+import random
+import timeit
+from datetime import datetime
+
+from src.booking.constants import CourtBooking
+from src.booking.reservation_parser import parse_reservations
+
+
+def generate_reservations(
+    num_courts: int, reservations_per_court: int, num_days: int = 1, seed: int = 42
+) -> tuple[list[dict], dict[int, str]]:
+    """Generate raw eBuSy reservations on half hour boundaries between 07:00 and 22:00."""
+    rng = random.Random(seed)
+    stc_id_to_name = {1000 + i: f"Platz {i}" for i in range(num_courts)}
+    reservations = []
+    for day in range(num_days):
+        date_str = f"06/{day + 1:02d}/2025"
+        for stc_id in stc_id_to_name:
+            for _ in range(reservations_per_court):
+                start = rng.randrange(7 * 60, 21 * 60, 30)
+                end = start + rng.choice((30, 60, 90))
+                reservations.append(
+                    {
+                        "court": stc_id,
+                        "date": date_str,
+                        "fromTime": f"{start // 60:02d}:{start % 60:02d}",
+                        "toTime": f"{end // 60:02d}:{end % 60:02d}",
+                    }
+                )
+    return reservations, stc_id_to_name
+
+
+def per_reservation_parse(
+    reservations: list[dict], stc_id_to_name: dict[int, str]
+) -> list[CourtBooking]:
+    """Reference implementation of the former `_parse_reservation_booking` loop."""
+    court_bookings = []
+    for reservation in reservations:
+        reservation_date = datetime.strptime(reservation["date"], "%m/%d/%Y").date()
+        from_time = datetime.strptime(reservation["fromTime"], "%H:%M").time()
+        to_time = datetime.strptime(reservation["toTime"], "%H:%M").time()
+        court_bookings.append(
+            CourtBooking(
+                court_name=stc_id_to_name[reservation["court"]],
+                start_time=datetime.combine(reservation_date, from_time),
+                end_time=datetime.combine(reservation_date, to_time),
+            )
+        )
+    return court_bookings
+
+
+def main():
+    parsers = {
+        "per-reservation": per_reservation_parse,
+        "bulk": parse_reservations,
+    }
+    print(
+        f"{'reservations':>12} " + " ".join(f"{name + ' [ms]':>20}" for name in parsers)
+    )
+    for num_courts, per_court, num_days in [(23, 8, 1), (23, 8, 7), (200, 10, 7)]:
+        reservations, stc_id_to_name = generate_reservations(
+            num_courts, per_court, num_days
+        )
+        timings = [
+            min(
+                timeit.repeat(
+                    lambda: parser(reservations, stc_id_to_name), number=1, repeat=5
+                )
+            )
+            for parser in parsers.values()
+        ]
+        print(
+            f"{len(reservations):>12} "
+            + " ".join(f"{seconds * 1e3:>20.2f}" for seconds in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Measurement harness for the output formats of `get_court_availability_tool`.
+
+For every eBuSy reservations payload in `benchmarks/payloads` (file names starting with
+'indoor' are indoor courts) the tool response is encoded in the 'model' format (stringified by the agent SDK) and the 'compact' format, and the
+prompt token count and encoding time are reported. With `--llm <model>` each encoded
+payload is additionally sent to the LLM to measure the end-to-end latency and the prompt
+tokens billed by the API (requires OPENAI_API_KEY).
+
+Afterwards the output of `get_court_attributes_tool` is compared: the previously returned
+list of all `Court` models against the cached compact encoding for a few filters.
+
+Run from the project root with:
+    python -m benchmarks.bench_tool_output [--llm gpt-4o-mini]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+from src.booking.booking_fetcher import CourtBookingFetcher
+from src.booking.constants import (
+    AVAILABILITY_OUTPUT_FORMAT_COMPACT,
+    AVAILABILITY_OUTPUT_FORMAT_MODEL,
+    CourtAvailabilityResponse,
+)
+from src.booking.encoding import encode_availability_response, encode_court_attributes
+from src.data.courts import COURT_ATTRIBUTES, COURT_REGISTRY
+
+PAYLOAD_DIR = Path(__file__).parent / "payloads"
+OUTPUT_FORMATS = (AVAILABILITY_OUTPUT_FORMAT_MODEL, AVAILABILITY_OUTPUT_FORMAT_COMPACT)
+COURT_ATTRIBUTE_FILTERS: dict[str, dict] = {
+    "all": {},
+    "granulat": {"court_type": "granulat"},
+    "hall, not singles-only": {"is_indoors": True, "is_singles_only": False},
+    "location 'hinten'": {"location": "hinten"},
+}
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_ENCODING.encode(text))
+
+    TOKEN_COUNT_METHOD = "tiktoken o200k_base"
+except ImportError:
+
+    def count_tokens(text: str) -> int:
+        return round(len(text) / 4)
+
+    TOKEN_COUNT_METHOD = "approximation, 4 characters per token"
+
+
+def load_payload_response(path: Path) -> CourtAvailabilityResponse:
+    """Build the availability tool response of a payload file."""
+    raw_bookings = json.loads(path.read_text())
+    target_date = datetime.strptime(
+        raw_bookings["reservations"][0]["date"], "%m/%d/%Y"
+    ).date()
+    booking_fetcher = CourtBookingFetcher(
+        target_date=target_date,
+        for_indoors=path.name.startswith("indoor"),
+        raw_bookings=raw_bookings,
+    )
+    return CourtAvailabilityResponse(
+        snapshot_age_seconds=0,
+        court_availabilities=booking_fetcher.get_court_availabilities(),
+    )
+
+
+def encode(response: CourtAvailabilityResponse, output_format: str) -> str:
+    """Encode `response` as the text the agent SDK sends to the model."""
+    return str(encode_availability_response(response, output_format))
+
+
+async def measure_llm_latency(model: str, text: str, repeat: int) -> tuple[float, int]:
+    """Median latency and prompt tokens of asking `model` about the encoded payload."""
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI()
+    latencies = []
+    prompt_tokens = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completion = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"{text}\n\nWelche Plätze sind um 18 Uhr frei?",
+                }
+            ],
+        )
+        latencies.append(time.perf_counter() - start)
+        prompt_tokens = completion.usage.prompt_tokens
+    await client.close()
+    return sorted(latencies)[len(latencies) // 2], prompt_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--llm", help="Also measure end-to-end latency with this model")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Token counts: {TOKEN_COUNT_METHOD}")
+    header = (
+        f"{'payload':<28} {'format':<8} {'chars':>6} {'tokens':>7} {'encode [µs]':>12}"
+    )
+    if args.llm:
+        header += f" {'api tokens':>11} {'llm p50 [s]':>12}"
+    print(header)
+
+    for path in sorted(PAYLOAD_DIR.glob("*.json")):
+        response = load_payload_response(path)
+        for output_format in OUTPUT_FORMATS:
+            text = encode(response, output_format)
+            encode_seconds = min(
+                timeit.repeat(lambda: encode(response, output_format), number=100)
+            )
+            line = (
+                f"{path.stem:<28} {output_format:<8} {len(text):>6} "
+                f"{count_tokens(text):>7} {encode_seconds * 1e4:>12.1f}"
+            )
+            if args.llm:
+                latency, prompt_tokens = asyncio.run(
+                    measure_llm_latency(args.llm, text, args.repeat)
+                )
+                line += f" {prompt_tokens:>11} {latency:>12.2f}"
+            print(line)
+
+    print()
+    print(
+        f"{'court attributes':<28} {'format':<8} {'chars':>6} {'tokens':>7} {'encode [µs]':>12}"
+    )
+    _print_court_attributes_line("all", "model", lambda: str(COURT_ATTRIBUTES))
+    for label, filters in COURT_ATTRIBUTE_FILTERS.items():
+        _print_court_attributes_line(
+            label,
+            "compact",
+            lambda: encode_court_attributes(
+                COURT_REGISTRY, COURT_REGISTRY.mask(**filters)
+            ),
+        )
+
+
+def _print_court_attributes_line(label: str, output_format: str, encode_fn) -> None:
+    text = encode_fn()
+    encode_seconds = min(timeit.repeat(encode_fn, number=100))
+    print(
+        f"{label:<28} {output_format:<8} {len(text):>6} "
+        f"{count_tokens(text):>7} {encode_seconds * 1e4:>12.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Local stand-in for the eBuSy booking system.
+
+Serves synthetic `reservations` payloads on the indoor and outdoor module paths of the
+club (`/court-module/1736`, `/lite-module/891`) with configurable latency, error rate
+and payload size, so the assistant can be load-tested without hitting the live system.
+The payload of a date is deterministic, only the latency and the errors are random, and
+it carries an ETag, so repeated requests are answered with 304 Not Modified.
+
+Point the assistant to it with EBUSY_BASE_URL, e.g. run from the project root:
+    python -m benchmarks.ebusy_stub --port 8765 --latency-ms 150 --error-rate 0.02
+    EBUSY_BASE_URL=http://127.0.0.1:8765 chainlit run run.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from benchmarks.suite import generate_payload
+from src.booking.booking_fetcher import CourtBookingFetcher
+
+DEFAULT_STUB_HOST: str = "127.0.0.1"
+DEFAULT_STUB_PORT: int = 8765
+
+
+class StubConfig(NamedTuple):
+    """Behaviour of the stand-in server."""
+
+    latency_seconds: float = 0.15
+    # Latency is drawn uniformly from latency_seconds +- latency_jitter_seconds
+    latency_jitter_seconds: float = 0.05
+    # Share of requests answered with a 503
+    error_rate: float = 0.0
+    reservations_per_court: int = 6
+    # Send an ETag and answer 304 to requests carrying the current one
+    supports_etag: bool = True
+
+
+class EbusyStub:
+    """FastAPI app answering eBuSy reservation requests, counting what it served."""
+
+    def __init__(self, config: StubConfig = StubConfig(), seed: int = 42):
+        self.config = config
+        self.requests: int = 0
+        self.errors: int = 0
+        self.not_modified: int = 0
+        self._rng = random.Random(seed)
+        self._payloads: dict[tuple[str, bool], bytes] = {}
+        self.app = FastAPI()
+        self.app.add_api_route(
+            CourtBookingFetcher.get_module_path(for_indoors=True),
+            self._indoor_reservations,
+        )
+        self.app.add_api_route(
+            CourtBookingFetcher.get_module_path(for_indoors=False),
+            self._outdoor_reservations,
+        )
+
+    def _payload(self, current_date: str, for_indoors: bool) -> bytes:
+        key = (current_date, for_indoors)
+        if key not in self._payloads:
+            start_date = datetime.strptime(current_date, "%m/%d/%Y").date()
+            payload = generate_payload(
+                for_indoors,
+                reservations_per_court=self.config.reservations_per_court,
+                start_date=start_date,
+                seed=start_date.toordinal(),
+            )
+            self._payloads[key] = json.dumps(payload).encode()
+        return self._payloads[key]
+
+    async def _reservations(
+        self, request: Request, current_date: str, for_indoors: bool
+    ) -> Response:
+        self.requests += 1
+        latency = self.config.latency_seconds + self._rng.uniform(
+            -self.config.latency_jitter_seconds, self.config.latency_jitter_seconds
+        )
+        await asyncio.sleep(max(latency, 0.0))
+        if self._rng.random() < self.config.error_rate:
+            self.errors += 1
+            return Response(status_code=503)
+        payload = self._payload(current_date, for_indoors)
+        if not self.config.supports_etag:
+            return Response(content=payload, media_type="application/json")
+        etag = f'"{hashlib.md5(payload).hexdigest()}"'
+        if request.headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(
+            content=payload, media_type="application/json", headers={"ETag": etag}
+        )
+
+    async def _indoor_reservations(
+        self, request: Request, currentDate: str, timestamp: str = ""
+    ) -> Response:
+        return await self._reservations(request, currentDate, for_indoors=True)
+
+    async def _outdoor_reservations(
+        self, request: Request, currentDate: str, timestamp: str = ""
+    ) -> Response:
+        return await self._reservations(request, currentDate, for_indoors=False)
+
+
+class StubServer:
+    """Runs an `EbusyStub` with uvicorn in a background thread with its own event loop."""
+
+    def __init__(
+        self,
+        stub: EbusyStub,
+        host: str = DEFAULT_STUB_HOST,
+        port: int = DEFAULT_STUB_PORT,
+    ):
+        self.stub = stub
+        self.base_url = f"http://{host}:{port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(stub.app, host=host, port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def start(self, timeout: float = 10.0) -> str:
+        """Start serving and return the base URL once the server accepts requests."""
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"eBuSy stub did not start on {self.base_url}")
+            time.sleep(0.01)
+        return self.base_url
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=DEFAULT_STUB_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_STUB_PORT)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reservations-per-court", type=int, default=6)
+    parser.add_argument("--no-etag", action="store_true")
+    args = parser.parse_args()
+
+    stub = EbusyStub(
+        StubConfig(
+            latency_seconds=args.latency_ms / 1000,
+            latency_jitter_seconds=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            reservations_per_court=args.reservations_per_court,
+            supports_etag=not args.no_etag,
+        )
+    )
+    uvicorn.run(stub.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Scripted stand-in for the LLM of the booking agent.
+
+`ScriptedModel` implements the model interface of the agents SDK without calling an LLM:
+for every user message it requests the real tools in a fixed order, then answers with a
+short summary. The tool arguments are taken from the fast path parser, so the tools hit
+the availability cache and eBuSy (or its stand-in) just like with a real model. Each
+turn sleeps for a configurable time to simulate the latency of the LLM.
+"""
+
+import asyncio
+import json
+from datetime import date, timedelta
+from typing import AsyncIterator
+
+from agents import Agent, Model, ModelResponse, Usage
+from openai.types.responses import (
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+)
+
+from src.agent.fast_path import ParsedQuery, parse_query
+from src.booking.combined_availability import is_indoor_season
+from src.booking.interval_index import format_minutes
+
+# Tools requested for every user message, in this order
+DEFAULT_TOOL_SCRIPT: tuple[str, ...] = (
+    "find_free_slots_tool",
+    "get_court_availability_tool",
+)
+
+
+def _item_type(item) -> str | None:
+    if isinstance(item, dict):
+        return item.get("type") or ("message" if "role" in item else None)
+    return getattr(item, "type", None)
+
+
+def _user_text(item) -> str | None:
+    if not isinstance(item, dict) or item.get("role") != "user":
+        return None
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content or [])
+
+
+class ScriptedModel(Model):
+    """Model calling the tools of `tool_script` once per user message, then answering."""
+
+    def __init__(
+        self,
+        turn_seconds: float = 0.0,
+        tool_script: tuple[str, ...] = DEFAULT_TOOL_SCRIPT,
+        today: date | None = None,
+    ):
+        """
+        Args:
+            turn_seconds: Simulated latency of every model call
+            tool_script: Names of the tools called for every user message
+            today: Date relative dates of the user messages refer to, defaults to today
+        """
+        self.turn_seconds = turn_seconds
+        self.tool_script = tool_script
+        self.today = today
+        self.calls: int = 0
+
+    def _parse(self, message: str) -> ParsedQuery:
+        today = self.today or date.today()
+        query = parse_query(message, today=today)
+        if query is None:
+            # Anything the parser does not understand asks for tomorrow evening outside
+            query = ParsedQuery(
+                target_date=today + timedelta(days=1),
+                for_indoors=False,
+                earliest_start=18 * 60,
+                latest_start=20 * 60,
+                duration_minutes=60,
+            )
+        return query
+
+    def _tool_arguments(self, tool_name: str, query: ParsedQuery) -> dict:
+        date_str = query.target_date.strftime("%d.%m.%Y")
+        # Queries for both modules ask the module the free slots are booked in
+        for_indoors = (
+            is_indoor_season(query.target_date)
+            if query.for_indoors is None
+            else query.for_indoors
+        )
+        if tool_name == "find_free_slots_tool":
+            return {
+                "date": date_str,
+                "duration_minutes": query.duration_minutes,
+                "earliest_start": format_minutes(query.earliest_start),
+                "latest_start": format_minutes(query.latest_start),
+                "for_indoors": for_indoors,
+            }
+        if tool_name == "get_court_availability_range_tool":
+            return {"start_date": date_str, "num_days": 3, "for_indoors": False}
+        if tool_name == "get_court_attributes_tool":
+            return {}
+        if tool_name == "get_combined_court_availability_tool":
+            return {"date": date_str}
+        return {"date": date_str, "for_indoors": for_indoors}
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        conversation_id=None,
+        prompt=None,
+    ) -> ModelResponse:
+        self.calls += 1
+        if self.turn_seconds:
+            await asyncio.sleep(self.turn_seconds)
+        if isinstance(input, str):
+            input = [{"role": "user", "content": input}]
+
+        # Tool outputs received since the latest user message
+        message, num_outputs, last_output = "", 0, ""
+        for item in input:
+            text = _user_text(item)
+            if text is not None:
+                message, num_outputs, last_output = text, 0, ""
+            elif _item_type(item) == "function_call_output":
+                num_outputs += 1
+                last_output = str(
+                    item["output"] if isinstance(item, dict) else item.output
+                )
+
+        if num_outputs < len(self.tool_script):
+            tool_name = self.tool_script[num_outputs]
+            output = ResponseFunctionToolCall(
+                type="function_call",
+                id=f"fc_{self.calls}",
+                call_id=f"call_{self.calls}",
+                name=tool_name,
+                arguments=json.dumps(
+                    self._tool_arguments(tool_name, self._parse(message))
+                ),
+                status="completed",
+            )
+        else:
+            output = ResponseOutputMessage(
+                type="message",
+                id=f"msg_{self.calls}",
+                role="assistant",
+                status="completed",
+                content=[
+                    ResponseOutputText(
+                        type="output_text",
+                        annotations=[],
+                        text=(
+                            f"Ich habe {num_outputs} Tools aufgerufen, die letzte "
+                            f"Antwort hatte {len(last_output)} Zeichen."
+                        ),
+                    )
+                ],
+            )
+        return ModelResponse(output=[output], usage=Usage(requests=1), response_id=None)
+
+    def stream_response(self, *args, **kwargs) -> AsyncIterator:
+        raise NotImplementedError("ScriptedModel only supports non-streamed runs")
+
+
+def build_scripted_agent(agent: Agent, model: ScriptedModel) -> Agent:
+    """Copy of the booking `agent` with the same tools, driven by `model`."""
+    return agent.clone(model=model)
@@ -0,0 +1,203 @@
+"""
+Load test of concurrent chat sessions against local stand-ins of eBuSy and the LLM.
+
+Starts the eBuSy stand-in server (`benchmarks.ebusy_stub`) and points the eBuSy client to
+it, then simulates concurrent chat sessions, each sending a sequence of messages to its
+own `BookingManager`. The agent is driven by the scripted model of `benchmarks.fake_model`,
+so every message runs the real tools, the availability cache and the eBuSy client. While
+the sessions run, a monitor task measures the lag of the event loop.
+
+Reports throughput, p50/p95/p99 message latency, event loop lag and how many eBuSy
+requests were issued and coalesced.
+
+Run from the project root with:
+    python -m benchmarks.load_test [--sessions 50] [--messages 5] [--llm-turn-ms 300]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from agents import set_tracing_disabled
+
+from benchmarks.ebusy_stub import DEFAULT_STUB_PORT, EbusyStub, StubConfig, StubServer
+from benchmarks.fake_model import ScriptedModel, build_scripted_agent
+from src.agent.openai_agent.agent import ERROR_RESPONSE, BookingManager, OpenAIAgent
+from src.booking.availability_cache import get_fetch_counters
+from src.booking.ebusy_client import get_ebusy_client
+from src.constants import (
+    ENV_VAR_NAME_AVAILABILITY_CACHE_TTL,
+    ENV_VAR_NAME_EBUSY_BASE_URL,
+)
+
+MESSAGES: list[str] = [
+    "Ist morgen Abend ab 19 Uhr ein Platz frei?",
+    "Ich möchte heute um 18 Uhr am T-Platz spielen.",
+    "Freie Plätze übermorgen zwischen 10 und 13 Uhr für 90 Minuten",
+    "Hallenplatz morgen um 20 Uhr",
+    "Kann ich morgen um 17:30 für 2 Stunden spielen?",
+    "Welche Plätze haben Wingfield?",
+    "Heute nachmittag noch ein Platz frei?",
+]
+
+LAG_INTERVAL_SECONDS: float = 0.01
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Nearest-rank percentile of `values`, `share` between 0 and 1."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(share * len(ordered)) - 1))]
+
+
+async def monitor_loop_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how much later than requested a short sleep wakes up, until `stop`."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL_SECONDS)
+        lags.append(time.perf_counter() - start - LAG_INTERVAL_SECONDS)
+
+
+async def run_session(
+    manager: BookingManager,
+    num_messages: int,
+    think_seconds: float,
+    rng: random.Random,
+    latencies: list[float],
+) -> int:
+    """Send `num_messages` messages in a row, returning the number of error responses."""
+    errors = 0
+    history = []
+    for _ in range(num_messages):
+        start = time.perf_counter()
+        response, history = await manager.run(rng.choice(MESSAGES), history)
+        latencies.append(time.perf_counter() - start)
+        if response == ERROR_RESPONSE:
+            errors += 1
+        if think_seconds:
+            await asyncio.sleep(rng.uniform(0, 2 * think_seconds))
+    return errors
+
+
+async def run_load_test(args: argparse.Namespace, model: ScriptedModel) -> dict:
+    agent = build_scripted_agent(
+        OpenAIAgent.build_agent("dummy-key", "gpt-4o-mini"), model
+    )
+    # BookingManager prints the trace URL of every session
+    with redirect_stdout(StringIO()):
+        managers = [
+            BookingManager(agent=agent, session_id=f"load-{i}")
+            for i in range(args.sessions)
+        ]
+
+    latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(lags, stop))
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(
+            run_session(
+                manager,
+                args.messages,
+                think_seconds=args.think_ms / 1000,
+                rng=random.Random(i),
+                latencies=latencies,
+            )
+            for i, manager in enumerate(managers)
+        )
+    )
+    wall_seconds = time.perf_counter() - start
+    stop.set()
+    await monitor
+    for manager in managers:
+        manager.close()
+    await get_ebusy_client().aclose()
+    return {
+        "wall_seconds": wall_seconds,
+        "latencies": latencies,
+        "errors": sum(errors),
+        "lags": lags,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=5, help="Messages per session")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean user pause")
+    parser.add_argument("--llm-turn-ms", type=float, default=300.0)
+    parser.add_argument("--ebusy-latency-ms", type=float, default=150.0)
+    parser.add_argument("--ebusy-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--ebusy-error-rate", type=float, default=0.0)
+    parser.add_argument("--reservations-per-court", type=int, default=6)
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Availability cache TTL in seconds, 0 fetches on every tool call",
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_STUB_PORT)
+    args = parser.parse_args()
+
+    stub = EbusyStub(
+        StubConfig(
+            latency_seconds=args.ebusy_latency_ms / 1000,
+            latency_jitter_seconds=args.ebusy_jitter_ms / 1000,
+            error_rate=args.ebusy_error_rate,
+            reservations_per_court=args.reservations_per_court,
+        )
+    )
+    server = StubServer(stub, port=args.port)
+    os.environ[ENV_VAR_NAME_EBUSY_BASE_URL] = server.start()
+    if args.cache_ttl is not None:
+        os.environ[ENV_VAR_NAME_AVAILABILITY_CACHE_TTL] = str(args.cache_ttl)
+    set_tracing_disabled(True)
+
+    model = ScriptedModel(turn_seconds=args.llm_turn_ms / 1000)
+    try:
+        result = asyncio.run(run_load_test(args, model))
+    finally:
+        server.stop()
+
+    latencies, lags = result["latencies"], result["lags"]
+    fetch_counters = get_fetch_counters()
+    print(
+        f"Sessions: {args.sessions}, messages: {len(latencies)} "
+        f"({result['errors']} errors), model calls: {model.calls}"
+    )
+    print(
+        f"Wall time: {result['wall_seconds']:.2f} s, "
+        f"throughput: {len(latencies) / result['wall_seconds']:.1f} messages/s"
+    )
+    print(
+        "Message latency [ms]: "
+        + ", ".join(
+            f"{label} {percentile(latencies, share) * 1e3:.0f}"
+            for label, share in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        )
+        + f", max {max(latencies) * 1e3:.0f}"
+    )
+    print(
+        "Event loop lag [ms]: "
+        + ", ".join(
+            f"{label} {percentile(lags, share) * 1e3:.1f}"
+            for label, share in (("p50", 0.5), ("p99", 0.99))
+        )
+        + f", max {max(lags) * 1e3:.1f}"
+    )
+    print(
+        f"eBuSy stub: {stub.requests} requests ({stub.errors} errors, "
+        f"{stub.not_modified} not modified), "
+        f"fetches issued: {fetch_counters['issued']}, "
+        f"coalesced: {fetch_counters['coalesced']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
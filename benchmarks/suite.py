@@ -0,0 +1,417 @@
+"""
+Offline benchmark suite with regression check.
+
+Times reservation parsing and availability conversion of `CourtBookingFetcher`, the
+court attribute helpers and the tool output serialization on the recorded eBuSy payloads
+in `benchmarks/payloads` and on synthetic payloads scaled by number of courts,
+reservations per court and days. The results are written to a JSON file and compared to
+a stored baseline, every case slower than the baseline by more than the threshold is
+flagged and makes the run fail.
+
+Timings depend on the machine and on its load, so the comparison is guarded in two ways:
+
+- Every run of a case is followed by a run of a fixed calibration workload, and cases
+  are compared by their time relative to it. This ratio hardly changes with the speed
+  or the current load of the machine, so the baseline is comparable across machines.
+- The baseline stores the median of `--confirm` measurements of every case. A case
+  slower than its baseline is measured again `--confirm` times and only flagged if its
+  fastest relative time over all measurements is still too slow, so a single noisy
+  measurement does not fail the run.
+
+Run from the project root with:
+    python -m benchmarks.suite [--filter parse] [--update-baseline]
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from benchmarks.bench_availability import generate_bookings
+from benchmarks.bench_parser import generate_reservations
+from benchmarks.bench_tool_output import PAYLOAD_DIR
+from src.booking.availability_engine import AvailabilityGrid
+from src.booking.booking_fetcher import CourtBookingFetcher
+from src.booking.constants import (
+    AVAILABILITY_OUTPUT_FORMAT_COMPACT,
+    AVAILABILITY_OUTPUT_FORMAT_MODEL,
+    CourtAvailabilityResponse,
+    CourtBooking,
+)
+from src.booking.encoding import encode_availability_response
+from src.booking.reservation_parser import parse_reservations
+from src.data.courts import (
+    COURT_REGISTRY,
+    get_all_court_names,
+    get_court_by_id,
+    get_courts_by_type,
+    get_middle_courts,
+    get_singles_courts,
+    get_wingfield_courts,
+)
+
+BENCHMARK_DIR = Path(__file__).parent
+DEFAULT_RESULTS_PATH = BENCHMARK_DIR / "results" / "latest.json"
+DEFAULT_BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+DEFAULT_CONFIRM = 3
+# Minimum duration of one timed run, longer runs average out scheduler noise
+MIN_RUN_SECONDS = 0.1
+
+# (reservations per court, days) of the synthetic payloads on the real courts
+SYNTHETIC_PAYLOAD_SIZES: tuple[tuple[int, int], ...] = ((4, 1), (10, 1), (10, 7))
+# (courts, reservations per court, days) of the synthetic payloads on made up courts
+SCALED_PAYLOAD_SIZES: tuple[tuple[int, int, int], ...] = (
+    (23, 10, 1),
+    (200, 10, 1),
+    (200, 10, 7),
+)
+
+
+class BenchmarkCase(NamedTuple):
+    name: str
+    func: Callable[[], object]
+
+
+def generate_payload(
+    for_indoors: bool,
+    reservations_per_court: int,
+    num_days: int = 1,
+    start_date: date = date(2025, 6, 2),
+    seed: int = 42,
+) -> dict:
+    """Synthetic eBuSy response for the real courts of the indoor or outdoor module."""
+    rng = random.Random(seed)
+    reservations = []
+    for day_offset in range(num_days):
+        date_str = (start_date + timedelta(days=day_offset)).strftime("%m/%d/%Y")
+        for stc_id in COURT_REGISTRY.stc_id_to_name(for_indoors):
+            for _ in range(reservations_per_court):
+                start = rng.randrange(7 * 60, 21 * 60, 30)
+                end = start + rng.choice((30, 60, 90))
+                reservations.append(
+                    {
+                        "court": stc_id,
+                        "date": date_str,
+                        "fromTime": f"{start // 60:02d}:{start % 60:02d}",
+                        "toTime": f"{end // 60:02d}:{end % 60:02d}",
+                    }
+                )
+    return {"reservations": reservations}
+
+
+def _payload_date(raw_bookings: dict) -> date:
+    return datetime.strptime(raw_bookings["reservations"][0]["date"], "%m/%d/%Y").date()
+
+
+def _parse_case(
+    name: str, reservations: list[dict], stc_id_to_name: dict[int, str]
+) -> BenchmarkCase:
+    return BenchmarkCase(
+        name, lambda: parse_reservations(reservations, stc_id_to_name=stc_id_to_name)
+    )
+
+
+def _convert_case(
+    name: str, court_names: list[str], bookings: list[CourtBooking]
+) -> BenchmarkCase:
+    return BenchmarkCase(
+        name,
+        lambda: AvailabilityGrid(
+            court_names=court_names, bookings=bookings
+        ).to_court_availabilities(),
+    )
+
+
+def _fetcher_cases(label: str, raw_bookings: dict, for_indoors: bool):
+    """Parsing, conversion and serialization cases of one eBuSy payload."""
+    target_date = _payload_date(raw_bookings)
+    stc_id_to_name = COURT_REGISTRY.stc_id_to_name(for_indoors)
+    reservations = raw_bookings["reservations"]
+    bookings = parse_reservations(reservations, stc_id_to_name=stc_id_to_name)
+    court_names = get_all_court_names(for_indoors=for_indoors)
+    response = CourtAvailabilityResponse(
+        snapshot_age_seconds=0,
+        court_availabilities=AvailabilityGrid(
+            court_names=court_names, bookings=bookings
+        ).to_court_availabilities(),
+    )
+    yield BenchmarkCase(
+        f"fetcher/{label}",
+        lambda: CourtBookingFetcher(
+            target_date=target_date, for_indoors=for_indoors, raw_bookings=raw_bookings
+        ),
+    )
+    yield _parse_case(f"parse/{label}", reservations, stc_id_to_name)
+    yield _convert_case(f"convert/{label}", court_names, bookings)
+    for output_format in (
+        AVAILABILITY_OUTPUT_FORMAT_MODEL,
+        AVAILABILITY_OUTPUT_FORMAT_COMPACT,
+    ):
+        yield BenchmarkCase(
+            f"serialize_{output_format}/{label}",
+            lambda output_format=output_format: str(
+                encode_availability_response(response, output_format)
+            ),
+        )
+
+
+def build_cases() -> list[BenchmarkCase]:
+    cases = []
+    for path in sorted(PAYLOAD_DIR.glob("*.json")):
+        cases.extend(
+            _fetcher_cases(
+                f"recorded/{path.stem}",
+                json.loads(path.read_text()),
+                for_indoors=path.name.startswith("indoor"),
+            )
+        )
+
+    for per_court, num_days in SYNTHETIC_PAYLOAD_SIZES:
+        for for_indoors in (False, True):
+            module = "indoor" if for_indoors else "outdoor"
+            raw_bookings = generate_payload(
+                for_indoors, reservations_per_court=per_court, num_days=num_days
+            )
+            label = f"synthetic/{module}_{per_court}x{num_days}d"
+            if num_days == 1:
+                cases.extend(
+                    _fetcher_cases(label, raw_bookings, for_indoors=for_indoors)
+                )
+                continue
+            # The availability of a fetcher covers a single day, so only parse longer
+            # payloads
+            cases.append(
+                _parse_case(
+                    f"parse/{label}",
+                    raw_bookings["reservations"],
+                    COURT_REGISTRY.stc_id_to_name(for_indoors),
+                )
+            )
+
+    for num_courts, per_court, num_days in SCALED_PAYLOAD_SIZES:
+        label = f"scaled/{num_courts}c_{per_court}x{num_days}d"
+        reservations, stc_id_to_name = generate_reservations(
+            num_courts, per_court, num_days
+        )
+        court_names, bookings = generate_bookings(num_courts, per_court * num_days)
+        cases.append(_parse_case(f"parse/{label}", reservations, stc_id_to_name))
+        cases.append(_convert_case(f"convert/{label}", court_names, bookings))
+
+    cases.extend(
+        [
+            BenchmarkCase(
+                "courts/get_all_court_names", lambda: get_all_court_names(False)
+            ),
+            BenchmarkCase(
+                "courts/get_all_court_names_indoors",
+                lambda: get_all_court_names(True),
+            ),
+            BenchmarkCase("courts/get_court_by_id", lambda: get_court_by_id(14)),
+            BenchmarkCase(
+                "courts/get_courts_by_type", lambda: get_courts_by_type("sand")
+            ),
+            BenchmarkCase("courts/get_middle_courts", get_middle_courts),
+            BenchmarkCase("courts/get_singles_courts", get_singles_courts),
+            BenchmarkCase("courts/get_wingfield_courts", get_wingfield_courts),
+            BenchmarkCase(
+                "courts/filter_combined",
+                lambda: COURT_REGISTRY.filter(
+                    for_indoors=False, court_type="sand", is_middle_court=True
+                ),
+            ),
+        ]
+    )
+    return cases
+
+
+def calibration_workload() -> object:
+    """Fixed mix of JSON decoding, date parsing and dict building used as speed reference."""
+    reservations = json.loads(_CALIBRATION_PAYLOAD)["reservations"]
+    return {
+        (reservation["court"], reservation["fromTime"]): datetime.strptime(
+            f"{reservation['date']} {reservation['fromTime']}", "%m/%d/%Y %H:%M"
+        )
+        for reservation in reservations
+    }
+
+
+_CALIBRATION_PAYLOAD: str = json.dumps(
+    generate_payload(for_indoors=False, reservations_per_court=4)
+)
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    """Fastest time per call"""
+    relative: float
+    """Fastest time per call divided by the fastest calibration time measured alongside"""
+
+
+def _timer(func: Callable[[], object]) -> tuple[timeit.Timer, int]:
+    """Timer of `func` and the number of calls taking about MIN_RUN_SECONDS."""
+    timer = timeit.Timer(func)
+    number, seconds = timer.autorange()
+    return timer, max(number, round(number * MIN_RUN_SECONDS / seconds))
+
+
+def measure(func: Callable[[], object], repeat: int) -> Measurement:
+    """
+    Time `func` in `repeat` runs, each followed by a run of the calibration workload.
+
+    Interleaving both keeps them in the same load conditions, so their ratio is far more
+    stable than either timing alone.
+    """
+    timer, number = _timer(func)
+    calibration_timer, calibration_number = _timer(calibration_workload)
+    seconds, calibration_seconds = [], []
+    for _ in range(repeat):
+        seconds.append(timer.timeit(number) / number)
+        calibration_seconds.append(
+            calibration_timer.timeit(calibration_number) / calibration_number
+        )
+    return Measurement(
+        seconds=min(seconds), relative=min(seconds) / min(calibration_seconds)
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=BENCHMARK_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    results: dict[str, Measurement],
+    baseline: dict[str, float],
+    threshold: float,
+) -> list[str]:
+    """Names of all cases slower than their relative baseline by more than `threshold`."""
+    return [
+        name
+        for name, measurement in results.items()
+        if name in baseline and measurement.relative > baseline[name] * (1 + threshold)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", default="", help="Only run cases containing this")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=DEFAULT_CONFIRM,
+        help="Measurements of a slow case before it is flagged as regression",
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown against the baseline flagged as regression",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as new baseline instead of comparing",
+    )
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()).get("relative", {})
+
+    cases = {case.name: case for case in build_cases() if args.filter in case.name}
+    results: dict[str, Measurement] = {}
+    print(f"{'case':<56} {'time [us]':>12} {'relative':>10} {'change':>8}")
+    for case in cases.values():
+        if args.update_baseline:
+            results[case.name] = _median(
+                [measure(case.func, repeat=args.repeat) for _ in range(args.confirm)]
+            )
+        else:
+            results[case.name] = measure(case.func, repeat=args.repeat)
+        _print_result(case.name, results[case.name], baseline, args.threshold, "SLOW")
+
+    suspects = compare(results, baseline, threshold=args.threshold)
+    if suspects:
+        print(f"\nMeasuring {len(suspects)} slow cases {args.confirm} more times")
+        for name in suspects:
+            for _ in range(args.confirm):
+                measurement = measure(cases[name].func, repeat=args.repeat)
+                results[name] = Measurement(
+                    seconds=min(results[name].seconds, measurement.seconds),
+                    relative=min(results[name].relative, measurement.relative),
+                )
+            _print_result(name, results[name], baseline, args.threshold)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {name: result.seconds for name, result in results.items()},
+        "relative": {name: result.relative for name, result in results.items()},
+    }
+    output = args.baseline if args.update_baseline else args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    regressions = compare(results, baseline, threshold=args.threshold)
+    if regressions:
+        print(
+            f"{len(regressions)} regressions of more than {args.threshold:.0%}: "
+            + ", ".join(regressions)
+        )
+        return 1
+    return 0
+
+
+def _median(measurements: list[Measurement]) -> Measurement:
+    return Measurement(
+        seconds=statistics.median(m.seconds for m in measurements),
+        relative=statistics.median(m.relative for m in measurements),
+    )
+
+
+def _print_result(
+    name: str,
+    measurement: Measurement,
+    baseline: dict[str, float],
+    threshold: float,
+    flag: str = "REGRESSION",
+) -> None:
+    line = (
+        f"{name:<56} {measurement.seconds * 1e6:>12.2f} {measurement.relative:>10.4g}"
+    )
+    if name in baseline:
+        change = measurement.relative / baseline[name] - 1
+        line += f" {change:>+8.0%}"
+        if change > threshold:
+            line += f" {flag}"
+    print(line)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
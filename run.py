@@ -3,13 +3,20 @@
 CLI script to run the Tennis Booking Assistant.
 """
 
+import hmac
 import os
 import sys
+from datetime import date
 from pathlib import Path
 from dotenv import load_dotenv
 
 import chainlit as cl
+from chainlit.server import app
+from chainlit.types import ThreadDict
 from chainlit.user import User
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+from chainlit.utils import utc_now
 
 
 def load_environment():
@@ -35,9 +42,26 @@ from src.constants import (
     ENV_VAR_NAME_MODEL_NAME,
     ENV_VAR_NAME_OPENAI_API_KEY,
     ENV_VAR_NAME_GOOGLE_API_KEY,
+    ENV_VAR_NAME_STREAMING_ENABLED,
+    ENV_VAR_NAME_METRICS_TOKEN,
 )
 from src.utils.validation import check_requirements
-from src.agent.openai_agent.agent import BookingManager
+from src.agent.openai_agent.agent import OpenAIAgent
+from src.agent.openai_agent.llm_client import aclose_llm_clients
+from src.agent.fast_path import create_fast_path_router_from_env
+from src.agent.openai_agent.streaming import (
+    STREAM_EVENT_TOKEN,
+    STREAM_EVENT_TOOL_FINISHED,
+    STREAM_EVENT_TOOL_STARTED,
+)
+from src.agent.session_registry import create_session_registry_from_env
+from src.booking.availability_cache import get_availability_cache
+from src.booking.clubs import get_club_registry
+from src.booking.ebusy_client import get_ebusy_client
+from src.booking.prefetcher import create_prefetcher_from_env
+from src.booking.snapshot_store import create_snapshot_store_from_env
+from src.utils.metrics import gauge, render_metrics
+from src.utils.notifications import get_push_dispatcher
 
 WELCOME_TEXT: str = (
     "**Willkommen zum Tennis Buchungsassistenten!**\n\n"
@@ -76,6 +100,111 @@ elif LLM_MODEL_NAME.startswith("gemini"):
     BASE_URL = GEMINI_API_BASE_URL
 
 
+AGENT = OpenAIAgent.get_agent(API_KEY, LLM_MODEL_NAME, llm_api_base_url=BASE_URL)
+SESSION_REGISTRY = create_session_registry_from_env(AGENT)
+FAST_PATH = create_fast_path_router_from_env()
+STREAMING_ENABLED = os.getenv(ENV_VAR_NAME_STREAMING_ENABLED, "true").lower() not in (
+    "0",
+    "false",
+    "no",
+)
+PREFETCHER = create_prefetcher_from_env()
+SNAPSHOT_STORE = create_snapshot_store_from_env()
+
+gauge(
+    "chat_sessions_active",
+    "Chat threads with an active session",
+    lambda: len(SESSION_REGISTRY),
+)
+gauge(
+    "fast_path_hits_total",
+    "Messages answered by the fast path",
+    lambda: FAST_PATH.hits,
+    kind="counter",
+)
+gauge(
+    "fast_path_misses_total",
+    "Messages answered by the agent",
+    lambda: FAST_PATH.misses,
+    kind="counter",
+)
+gauge(
+    "push_notifications_sent_total",
+    "Push notifications delivered",
+    lambda: get_push_dispatcher().sent,
+    kind="counter",
+)
+gauge(
+    "push_notifications_failed_total",
+    "Push notifications given up on",
+    lambda: get_push_dispatcher().failed,
+    kind="counter",
+)
+gauge(
+    "push_notifications_dropped_total",
+    "Push notifications dropped as duplicate or because the queue was full",
+    lambda: get_push_dispatcher().dropped,
+    kind="counter",
+)
+
+
+METRICS_PATH: str = "/metrics"
+METRICS_TOKEN: str | None = os.getenv(ENV_VAR_NAME_METRICS_TOKEN) or None
+
+
+def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus metrics of this process, for requests with the metrics bearer token."""
+    authorization = request.headers.get("authorization", "")
+    if not hmac.compare_digest(authorization, f"Bearer {METRICS_TOKEN}"):
+        return PlainTextResponse("Unauthorized", status_code=401)
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def register_metrics_route() -> None:
+    """Serve /metrics ahead of the catch-all route of the Chainlit frontend."""
+    app.add_api_route(METRICS_PATH, metrics, methods=["GET"], include_in_schema=False)
+    routes = app.router.routes
+    metrics_route = next(
+        route for route in routes if getattr(route, "path", None) == METRICS_PATH
+    )
+    routes.remove(metrics_route)
+    routes.insert(0, metrics_route)
+
+
+if METRICS_TOKEN is not None:
+    register_metrics_route()
+
+
+@cl.on_app_startup
+async def on_app_startup():
+    if SNAPSHOT_STORE is not None:
+        availability_cache = get_availability_cache()
+        num_snapshots = SNAPSHOT_STORE.warm_start(
+            availability_cache, since=date.today()
+        )
+        availability_cache.add_listener(SNAPSHOT_STORE.on_snapshot)
+        print(f"✅ Loaded {num_snapshots} availability snapshots from disk!")
+    if PREFETCHER is not None:
+        PREFETCHER.start()
+        print("✅ Availability prefetcher started!")
+
+
+@cl.on_app_shutdown
+async def on_app_shutdown():
+    if PREFETCHER is not None:
+        await PREFETCHER.stop()
+    await get_ebusy_client().aclose()
+    await get_club_registry().aclose()
+    await get_push_dispatcher().stop()
+    if SNAPSHOT_STORE is not None:
+        SNAPSHOT_STORE.close()
+    SESSION_REGISTRY.close()
+    print(f"Fast path: {FAST_PATH.stats()}")
+    await aclose_llm_clients()
+
+
 @cl.oauth_callback
 async def oauth_callback(
     provider_id: str,
@@ -98,19 +227,50 @@ async def oauth_callback(
 
 @cl.on_chat_start
 async def on_chat_start():
-    agent = BookingManager(API_KEY, LLM_MODEL_NAME, llm_api_base_url=BASE_URL)
-    cl.user_session.set("agent", agent)
-    print("✅ Tennis Booking Assistant is ready!")
-
+    # Every chat thread has its own conversation, also when one user opens several tabs,
+    # and a new thread continues from the user's previous one
     user = cl.user_session.get("user")
-    print(f"A new chat session has started for user {user.identifier}!")
+    session_key = cl.context.session.thread_id
+    cl.user_session.set("session_key", session_key)
+    await SESSION_REGISTRY.start(
+        session_key, user_id=user.identifier if user is not None else None
+    )
+    print("✅ Tennis Booking Assistant is ready!")
+    print(f"A new chat session has started for thread {session_key}!")
     await cl.Message(content=WELCOME_TEXT).send()
 
 
+@cl.on_chat_resume
+async def on_chat_resume(thread: ThreadDict):
+    # Reload the stored conversation of the resumed thread
+    cl.user_session.set("session_key", thread["id"])
+    SESSION_REGISTRY.get(thread["id"])
+
+
 @cl.on_message
 async def on_message(message: cl.Message):
-    agent = cl.user_session.get("agent")
+    agent = SESSION_REGISTRY.get(cl.user_session.get("session_key"))
 
     user_message = message.content
-    response, _ = await agent.run(user_message)
-    await cl.Message(content=response).send()
+    if not STREAMING_ENABLED:
+        response = await FAST_PATH.answer(user_message, agent)
+        await cl.Message(content=response).send()
+        return
+
+    response_message = cl.Message(content="")
+    tool_steps: dict[str, cl.Step] = {}
+    async for event in FAST_PATH.stream(user_message, agent):
+        if event.kind == STREAM_EVENT_TOKEN:
+            await response_message.stream_token(event.text)
+        elif event.kind == STREAM_EVENT_TOOL_STARTED:
+            step = cl.Step(name=event.text, type="tool", show_input=False)
+            step.start = utc_now()
+            await step.send()
+            tool_steps[event.call_id] = step
+        elif event.kind == STREAM_EVENT_TOOL_FINISHED:
+            step = tool_steps.pop(event.call_id, None)
+            if step is not None:
+                step.output = event.text
+                step.end = utc_now()
+                await step.update()
+    await response_message.send()
@@ -0,0 +1,594 @@
+"""
+Rule-based fast path for common availability queries.
+
+Queries like "Ich möchte heute um 18 Uhr am T-Platz spielen" or "Ich suche freie
+Hallenplätze für morgen Abend ab 19 Uhr" are parsed into date, start time window,
+duration, court and module with regular expressions and answered directly from the slot
+search. Whenever a query contains a word outside a small vocabulary or anything the parser
+does not understand unambiguously, it is handed to the agent instead.
+"""
+
+import os
+import re
+import time
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, NamedTuple
+
+from src.agent.openai_agent.agent import BookingManager
+from src.agent.openai_agent.streaming import STREAM_EVENT_TOKEN, AgentStreamEvent
+from src.booking.availability_cache import get_availability_snapshot
+from src.booking.combined_availability import (
+    get_combined_snapshot,
+    is_indoor_season,
+    is_season_overlap,
+)
+from src.booking.constants import (
+    DEFAULT_CLOSING_TIME,
+    DEFAULT_MAX_SLOT_RESULTS,
+    DEFAULT_OPENING_TIME,
+    AvailabilitySnapshot,
+    SlotCandidate,
+)
+from src.booking.interval_index import format_minutes, to_minutes
+from src.booking.slot_search import search_free_slots
+from src.constants import ENV_VAR_NAME_FAST_PATH_ENABLED
+from src.data.courts import COURT_REGISTRY, Court
+from src.utils.metrics import MESSAGE_SECONDS
+
+DEFAULT_DURATION_MINUTES: int = 60
+ALTERNATIVE_WINDOW_MINUTES: int = 120
+
+WEEKDAYS: tuple[str, ...] = (
+    "montag",
+    "dienstag",
+    "mittwoch",
+    "donnerstag",
+    "freitag",
+    "samstag",
+    "sonntag",
+)
+WEEKDAY_ABBREVIATIONS: tuple[str, ...] = ("Mo", "Di", "Mi", "Do", "Fr", "Sa", "So")
+
+# Start hours (first, last) covered by a part of the day
+DAY_PARTS: dict[str, tuple[int, int]] = {
+    "früh": (7, 11),
+    "morgen": (7, 11),
+    "vormittag": (7, 11),
+    "mittag": (11, 14),
+    "nachmittag": (13, 17),
+    "abend": (17, 21),
+}
+
+# A query must contain at least one of these to be taken as an availability query
+INTENT_KEYWORDS: tuple[str, ...] = ("platz", "plätze", "spiel", "frei", "tennis")
+INDOOR_KEYWORDS: tuple[str, ...] = ("halle", "indoor", "drinnen")
+OUTDOOR_KEYWORDS: tuple[str, ...] = (
+    "draußen",
+    "draussen",
+    "freiplatz",
+    "freiplätze",
+    "outdoor",
+    "im freien",
+)
+# Every word left over once date, time, duration and court are parsed must be one of
+# these. Anything else, e.g. notifications, court attributes, "Doppel" or negations, may
+# change the meaning of the query and goes to the agent
+KNOWN_WORDS: frozenset[str] = frozenset(
+    (
+        "ich",
+        "wir",
+        "mir",
+        "uns",
+        "es",
+        "möchte",
+        "möchten",
+        "würde",
+        "würden",
+        "will",
+        "wollen",
+        "kann",
+        "können",
+        "könnte",
+        "gerne",
+        "gern",
+        "bitte",
+        "mal",
+        "suche",
+        "suchen",
+        "brauche",
+        "brauchen",
+        "spielen",
+        "buchen",
+        "reservieren",
+        "gibt",
+        "ist",
+        "sind",
+        "noch",
+        "der",
+        "die",
+        "das",
+        "den",
+        "dem",
+        "ein",
+        "eine",
+        "einen",
+        "einer",
+        "am",
+        "im",
+        "in",
+        "auf",
+        "für",
+        "frei",
+        "freie",
+        "freien",
+        "freier",
+        "platz",
+        "plätze",
+        "tennis",
+        "tennisplatz",
+        "tennisplätze",
+        "halle",
+        "hallenplatz",
+        "hallenplätze",
+        "indoor",
+        "drinnen",
+        "draußen",
+        "draussen",
+        "freiplatz",
+        "freiplätze",
+        "outdoor",
+    )
+)
+
+_TIME = r"(\d{1,2})(?::(\d{2}))?"
+_DATE_RE = re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4}|\d{2})?")
+_COURT_RE = re.compile(r"\bplatz\s+([a-z]|\d{1,2})\b|\b([a-z])-platz\b")
+_DURATION_RE = re.compile(
+    r"\b(\d+(?:[.,]5)?|eine[rn]?|zwei|drei|anderthalb|eineinhalb|halbe)\s*"
+    r"(stunden?|std\.?|minuten|min\.?)(?!\w)"
+)
+_RANGE_RE = re.compile(
+    rf"\b(?:zwischen|von)\s+{_TIME}\s*(?:uhr\s*)?(?:und|bis|-)\s*{_TIME}(?:\s*uhr)?\b"
+)
+_FROM_RE = re.compile(rf"\bab\s+{_TIME}(?:\s*uhr)?\b")
+_UNTIL_RE = re.compile(rf"\bbis\s+{_TIME}(?:\s*uhr)?\b")
+_AT_RE = re.compile(rf"\b(?:um\s+)?{_TIME}\s*uhr\b|\bum\s+{_TIME}\b")
+_DAY_PART_RE = re.compile(
+    r"\b(vormittags?|nachmittags?|mittags?|abends?|morgens|früh)\b"
+)
+_WORD_RE = re.compile(r"\w+")
+_NUMBER_WORDS: dict[str, float] = {
+    "ein": 1,
+    "eine": 1,
+    "einer": 1,
+    "einen": 1,
+    "zwei": 2,
+    "drei": 3,
+    "anderthalb": 1.5,
+    "eineinhalb": 1.5,
+    "halbe": 0.5,
+}
+
+
+class ParsedQuery(NamedTuple):
+    """An availability query understood by the fast path."""
+
+    target_date: date
+    # Module of the courts asked for, None for the courts of both modules
+    for_indoors: bool | None
+    earliest_start: int
+    latest_start: int
+    duration_minutes: int
+    court_name: str | None = None
+    # No slot, alternatives included, may start before this, e.g. the current time today
+    not_before: int = 0
+
+    @property
+    def is_exact_time(self) -> bool:
+        return self.earliest_start == self.latest_start
+
+
+def _consume(pattern: re.Pattern, text: str) -> tuple[list[re.Match], str]:
+    """All matches of `pattern` in `text` and `text` with the matches blanked out."""
+    matches = list(pattern.finditer(text))
+    return matches, pattern.sub(" ", text)
+
+
+def _to_minutes(hour: str, minute: str | None) -> int:
+    return int(hour) * 60 + int(minute or 0)
+
+
+def _parse_date(text: str, today: date) -> tuple[date | None, str] | None:
+    """The single date mentioned in `text`, None for the date if there is none."""
+    dates = []
+    matches, text = _consume(_DATE_RE, text)
+    for match in matches:
+        day, month, year = match.groups()
+        year = int(year) if year else today.year
+        if year < 100:
+            year += 2000
+        try:
+            dates.append(date(year, int(month), int(day)))
+        except ValueError:
+            return None
+    for word, offset in (("übermorgen", 2), ("heute", 0), ("morgen", 1)):
+        pattern = re.compile(rf"\b{word}\b")
+        if pattern.search(text):
+            dates.append(today + timedelta(days=offset))
+            text = pattern.sub(" ", text)
+    for weekday, name in enumerate(WEEKDAYS):
+        if re.search(rf"\b{name}s?\b", text):
+            offset = (weekday - today.weekday()) % 7
+            if offset == 0:
+                # Today or in a week
+                return None
+            dates.append(today + timedelta(days=offset))
+            text = re.sub(rf"\b{name}s?\b", " ", text)
+    if len(set(dates)) > 1:
+        return None
+    return (dates[0] if dates else None), text
+
+
+def _parse_duration(text: str) -> tuple[int, str] | None:
+    matches, text = _consume(_DURATION_RE, text)
+    if not matches:
+        return DEFAULT_DURATION_MINUTES, text
+    if len(matches) > 1:
+        return None
+    amount, unit = matches[0].groups()
+    value = _NUMBER_WORDS.get(amount)
+    if value is None:
+        value = float(amount.replace(",", "."))
+    minutes = value if unit.startswith("min") else value * 60
+    if minutes <= 0 or minutes % 30:
+        return None
+    return int(minutes), text
+
+
+def _parse_court(text: str) -> tuple[str | None, str] | None:
+    matches, text = _consume(_COURT_RE, text)
+    names = {f"Platz {(m.group(1) or m.group(2)).upper()}" for m in matches}
+    if len(names) > 1:
+        return None
+    return (names.pop() if names else None), text
+
+
+def _parse_time_window(text: str, duration_minutes: int) -> tuple[int, int, str] | None:
+    """Earliest and latest start in minutes after midnight, None if not unambiguous."""
+    opening = to_minutes(DEFAULT_OPENING_TIME)
+    last_start = to_minutes(DEFAULT_CLOSING_TIME) - duration_minutes
+
+    day_parts = {m.group(1).rstrip("s") for m in _DAY_PART_RE.finditer(text)}
+    text = _DAY_PART_RE.sub(" ", text)
+    if len(day_parts) > 1:
+        return None
+    day_part = DAY_PARTS[day_parts.pop()] if day_parts else None
+    is_afternoon = day_part is not None and day_part[0] >= 12
+
+    def hour_of_day(hour: str, minute: str | None) -> int:
+        minutes = _to_minutes(hour, minute)
+        # "um 7 Uhr abends"
+        if is_afternoon and minutes < 12 * 60:
+            minutes += 12 * 60
+        return minutes
+
+    ranges, text = _consume(_RANGE_RE, text)
+    starts, text = _consume(_FROM_RE, text)
+    ends, text = _consume(_UNTIL_RE, text)
+    exact, text = _consume(_AT_RE, text)
+    if len(ranges) + len(starts) + len(ends) + len(exact) > 1 and not (
+        len(starts) == 1 and len(ends) == 1 and not ranges and not exact
+    ):
+        return None
+
+    earliest, latest = opening, last_start
+    if day_part is not None:
+        earliest, latest = day_part[0] * 60, day_part[1] * 60
+    if ranges:
+        from_hour, from_minute, to_hour, to_minute = ranges[0].groups()
+        earliest = hour_of_day(from_hour, from_minute)
+        latest = hour_of_day(to_hour, to_minute) - duration_minutes
+    if starts:
+        earliest = hour_of_day(*starts[0].groups())
+        latest = max(latest, earliest) if day_part is None else latest
+    if ends:
+        latest = hour_of_day(*ends[0].groups()) - duration_minutes
+        earliest = min(earliest, latest) if not starts else earliest
+    if exact:
+        hour, minute, um_hour, um_minute = exact[0].groups()
+        earliest = latest = hour_of_day(hour or um_hour, minute or um_minute)
+    if not (ranges or starts or ends or exact or day_part):
+        return None
+
+    latest = min(latest, last_start)
+    if not opening <= earliest <= latest:
+        return None
+    return earliest, latest, text
+
+
+def parse_query(
+    message: str, today: date, now: datetime | None = None
+) -> ParsedQuery | None:
+    """
+    Parse an availability query, None if it is not unambiguously understood.
+
+    Args:
+        message: User message in German
+        today: Date that relative dates like "morgen" refer to
+        now: Current time, start times that have already passed are dropped
+
+    Returns:
+        ParsedQuery or None if the query should be handled by the agent
+    """
+    text = " ".join(message.lower().split())
+    if not any(keyword in text for keyword in INTENT_KEYWORDS):
+        return None
+    # "heute Morgen" and "am Morgen" are parts of the day, not tomorrow
+    text = re.sub(r"\b(heute|am) morgen\b", r"\1 morgens", text)
+
+    parsed_date = _parse_date(text, today=today)
+    if parsed_date is None or parsed_date[0] is None:
+        return None
+    target_date, text = parsed_date
+    if target_date < today:
+        return None
+
+    asks_indoors = any(keyword in text for keyword in INDOOR_KEYWORDS)
+    asks_outdoors = any(keyword in text for keyword in OUTDOOR_KEYWORDS)
+    if asks_indoors and asks_outdoors:
+        return None
+    if is_season_overlap(target_date):
+        # Outdoor courts and halls are both played, search both unless one is asked for
+        for_indoors = True if asks_indoors else False if asks_outdoors else None
+    else:
+        for_indoors = is_indoor_season(target_date)
+        if (asks_indoors and not for_indoors) or (asks_outdoors and for_indoors):
+            return None
+
+    parsed_court = _parse_court(text)
+    if parsed_court is None:
+        return None
+    court_name, text = parsed_court
+    if court_name is not None and court_name not in {
+        court.name for court in query_courts(target_date, for_indoors)
+    }:
+        return None
+
+    parsed_duration = _parse_duration(text)
+    if parsed_duration is None:
+        return None
+    duration_minutes, text = parsed_duration
+
+    parsed_window = _parse_time_window(text, duration_minutes=duration_minutes)
+    if parsed_window is None:
+        return None
+    earliest_start, latest_start, text = parsed_window
+
+    # Any word or number left over is something the parser did not understand
+    if any(word not in KNOWN_WORDS for word in _WORD_RE.findall(text)):
+        return None
+
+    not_before = 0
+    if target_date == today and now is not None:
+        # Round up to the next start time on the half hour
+        not_before = -(-(now.hour * 60 + now.minute) // 30) * 30
+        earliest_start = max(earliest_start, not_before)
+        if earliest_start > latest_start:
+            return None
+
+    return ParsedQuery(
+        target_date=target_date,
+        for_indoors=for_indoors,
+        earliest_start=earliest_start,
+        latest_start=latest_start,
+        duration_minutes=duration_minutes,
+        court_name=court_name,
+        not_before=not_before,
+    )
+
+
+def query_courts(target_date: date, for_indoors: bool | None) -> tuple[Court, ...]:
+    """Courts a query on `target_date` for the given module is answered with."""
+    indoor_mask = COURT_REGISTRY.module_mask(True)
+    outdoor_mask = COURT_REGISTRY.module_mask(False)
+    if for_indoors is None:
+        return COURT_REGISTRY.courts_from_mask(indoor_mask | outdoor_mask)
+    if not for_indoors and is_season_overlap(target_date):
+        # The halls are listed in the outdoor module, but have their roof on
+        return COURT_REGISTRY.courts_from_mask(outdoor_mask & ~indoor_mask)
+    return COURT_REGISTRY.courts_from_mask(indoor_mask if for_indoors else outdoor_mask)
+
+
+def search_query(
+    snapshot: AvailabilitySnapshot,
+    query: ParsedQuery,
+    max_results: int = DEFAULT_MAX_SLOT_RESULTS,
+) -> tuple[list[SlotCandidate], list[SlotCandidate]]:
+    """
+    Free slots matching `query` and, if there are none, alternatives around the time.
+
+    Returns:
+        Tuple of (matching slots, alternative slots)
+    """
+    if query.court_name is not None:
+        courts = [COURT_REGISTRY.by_name[query.court_name]]
+    else:
+        courts = list(query_courts(query.target_date, query.for_indoors))
+
+    def search(earliest: int, latest: int) -> list[SlotCandidate]:
+        return search_free_slots(
+            snapshot=snapshot,
+            courts=courts,
+            duration_minutes=query.duration_minutes,
+            earliest_start=format_minutes(max(earliest, query.not_before)),
+            latest_start=format_minutes(min(latest, 24 * 60 - 1)),
+            max_results=max_results,
+        )
+
+    slots = search(query.earliest_start, query.latest_start)
+    if slots:
+        return slots, []
+    return [], search(
+        query.earliest_start - ALTERNATIVE_WINDOW_MINUTES,
+        query.latest_start + ALTERNATIVE_WINDOW_MINUTES,
+    )
+
+
+def format_answer(
+    query: ParsedQuery,
+    slots: list[SlotCandidate],
+    alternatives: list[SlotCandidate],
+) -> str:
+    """German answer listing the found slots."""
+    day = (
+        f"{WEEKDAY_ABBREVIATIONS[query.target_date.weekday()]}, "
+        f"{query.target_date.strftime('%d.%m.%Y')}"
+    )
+    if query.is_exact_time:
+        window = f"um {format_minutes(query.earliest_start)}"
+    else:
+        window = (
+            f"mit Beginn zwischen {format_minutes(query.earliest_start)} "
+            f"und {format_minutes(query.latest_start)}"
+        )
+    places = {
+        True: "in der Halle",
+        False: "im Freien",
+        None: "in der Halle oder im Freien",
+    }
+    place = query.court_name or places[query.for_indoors]
+    request = f"am {day} {window} ({query.duration_minutes} Minuten, {place})"
+
+    def format_slots(candidates: list[SlotCandidate]) -> str:
+        return "\n".join(
+            f"- {slot.court_name}: {slot.start_time}–{slot.end_time}"
+            for slot in candidates
+        )
+
+    if slots:
+        return f"Freie Plätze {request}:\n{format_slots(slots)}"
+    if alternatives:
+        return (
+            f"Leider ist {request} nichts frei. Alternativen:\n"
+            f"{format_slots(alternatives)}"
+        )
+    return (
+        f"Leider ist {request} nichts frei, auch nicht bis zu "
+        f"{ALTERNATIVE_WINDOW_MINUTES // 60} Stunden früher oder später."
+    )
+
+
+async def answer_query(query: ParsedQuery) -> str:
+    """Answer `query` from the availability of its day."""
+    if is_season_overlap(query.target_date):
+        # The halls may be booked in either module
+        snapshot = await get_combined_snapshot(target_date=query.target_date)
+    else:
+        snapshot = await get_availability_snapshot(
+            target_date=query.target_date, for_indoors=query.for_indoors
+        )
+    slots, alternatives = search_query(snapshot, query)
+    answer = format_answer(query, slots, alternatives)
+    if snapshot.is_stale:
+        minutes = int(snapshot.age_seconds() // 60)
+        answer = (
+            f"Achtung: Das Buchungssystem ist gerade nicht erreichbar, "
+            f"Stand vor {minutes} Minuten.\n{answer}"
+        )
+    return answer
+
+
+class FastPathRouter:
+    """Answers parsable queries directly and hands all others to the agent."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.hits: int = 0
+        self.misses: int = 0
+        self.fast_path_seconds: float = 0.0
+        self.agent_seconds: float = 0.0
+
+    async def _answer_fast(self, message: str, manager: BookingManager) -> str | None:
+        """Answer `message` via the fast path, None if it has to go to the agent."""
+        start = time.perf_counter()
+        now = datetime.now()
+        query = (
+            parse_query(message, today=now.date(), now=now) if self.enabled else None
+        )
+        if query is None:
+            return None
+        try:
+            response = await answer_query(query)
+        except Exception as e:
+            print(f"Error answering query on the fast path: {e}")
+            return None
+        # Keep the conversation complete for follow-up questions to the agent
+        await manager.remember(message, response)
+        self.hits += 1
+        elapsed = time.perf_counter() - start
+        self.fast_path_seconds += elapsed
+        MESSAGE_SECONDS.observe(elapsed, path="fast_path")
+        return response
+
+    async def answer(self, message: str, manager: BookingManager) -> str:
+        """Answer `message` via the fast path if possible, else via `manager`."""
+        response = await self._answer_fast(message, manager)
+        if response is not None:
+            return response
+
+        start = time.perf_counter()
+        response, _ = await manager.run(message)
+        self.misses += 1
+        elapsed = time.perf_counter() - start
+        self.agent_seconds += elapsed
+        MESSAGE_SECONDS.observe(elapsed, path="agent")
+        return response
+
+    async def stream(
+        self, message: str, manager: BookingManager
+    ) -> AsyncIterator[AgentStreamEvent]:
+        """Like `answer`, but streams the response of the agent as it is generated."""
+        response = await self._answer_fast(message, manager)
+        if response is not None:
+            yield AgentStreamEvent(kind=STREAM_EVENT_TOKEN, text=response)
+            return
+
+        start = time.perf_counter()
+        async for event in manager.stream(message):
+            yield event
+        self.misses += 1
+        elapsed = time.perf_counter() - start
+        self.agent_seconds += elapsed
+        MESSAGE_SECONDS.observe(elapsed, path="agent")
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def latency_saved_seconds(self) -> float:
+        """Estimated latency saved, mean agent latency minus mean fast path latency per hit."""
+        if not self.hits or not self.misses:
+            return 0.0
+        mean_fast_path = self.fast_path_seconds / self.hits
+        mean_agent = self.agent_seconds / self.misses
+        return self.hits * max(mean_agent - mean_fast_path, 0.0)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "latency_saved_seconds": self.latency_saved_seconds,
+        }
+
+
+def create_fast_path_router_from_env() -> FastPathRouter:
+    """Create the fast path router, disabled if FAST_PATH_ENABLED is false."""
+    enabled = os.getenv(ENV_VAR_NAME_FAST_PATH_ENABLED, "true").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+    return FastPathRouter(enabled=enabled)
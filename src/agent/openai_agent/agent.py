@@ -2,54 +2,143 @@
 Tennis booking AI agent that processes user requests and suggests available courts.
 """
 
-from openai import AsyncOpenAI
+from typing import AsyncIterator
+
 from agents import (
     Agent,
+    RunConfig,
     Runner,
+    RunResultStreaming,
     SQLiteSession,
     trace,
     gen_trace_id,
     OpenAIChatCompletionsModel,
+    OpenAIResponsesModel,
+)
+
+from src.agent.openai_agent.llm_client import (
+    LLM_PROVIDER_OPENAI,
+    get_llm_client,
+    get_llm_provider,
 )
 
+from src.agent.openai_agent.hooks import METRICS_HOOKS
 from src.agent.openai_agent.prompts import SYSTEM_PROMPT
+from src.agent.openai_agent.streaming import (
+    STREAM_EVENT_TOKEN,
+    AgentStreamEvent,
+    to_agent_stream_event,
+)
 from src.agent.openai_agent.tools import (
     get_court_availability_tool,
+    get_combined_court_availability_tool,
+    get_court_availability_range_tool,
+    find_free_slots_tool,
+    watch_slot_tool,
     get_court_attributes_tool,
+    list_clubs_tool,
     push_notification_tool,
 )
 
+ERROR_RESPONSE: str = (
+    "I'm sorry, I encountered an error processing your request. Please try again."
+)
+
+# Number of previous user turns sent to the model along with a new message
+DEFAULT_MAX_TURNS: int = 10
+
+_agents: dict[str, Agent] = {}
+
+
+def keep_last_turns(history: list[dict], max_turns: int) -> list[dict]:
+    """
+    The items of the last `max_turns` turns of `history`.
+
+    A turn starts with a user message and includes the tool calls and answers after it,
+    so a tool call is never separated from its output.
+    """
+    user_messages = [
+        index for index, item in enumerate(history) if item.get("role") == "user"
+    ]
+    if len(user_messages) <= max_turns:
+        return history
+    return history[user_messages[-max_turns] :]
+
 
 class OpenAIAgent:
     def __init__(
         self,
-        trace_id: str,
-        llm_api_key: str,
-        llm_name: str,
-        llm_api_base_url: str = None,
+        agent: Agent,
+        session: SQLiteSession,
+        max_turns: int | None = DEFAULT_MAX_TURNS,
     ):
-        if llm_name.startswith("gpt"):
-            model = llm_name
-        elif llm_name.startswith("gemini"):
-            gemini_client = AsyncOpenAI(base_url=llm_api_base_url, api_key=llm_api_key)
-            model = OpenAIChatCompletionsModel(
-                model=llm_name, openai_client=gemini_client
-            )
+        """
+        Args:
+            agent: Shared agent, see `build_agent`
+            session: Session storing the conversation
+            max_turns: Number of previous turns sent to the model, None for all
+        """
+        self.agent = agent
+        self.session = session
+        self.max_turns = max_turns
+        self.run_config = (
+            RunConfig(session_input_callback=self._session_input)
+            if max_turns is not None
+            else None
+        )
+
+    def _session_input(self, history: list[dict], new_input: list[dict]) -> list[dict]:
+        """Input of a run, the new items after the last turns of the conversation."""
+        return keep_last_turns(history, self.max_turns) + new_input
+
+    @classmethod
+    def build_agent(
+        cls, llm_api_key: str, llm_name: str, llm_api_base_url: str = None
+    ) -> Agent:
+        """
+        Build the booking agent for `llm_name`.
+
+        The agent holds no conversation state, so a single instance is shared by all
+        sessions.
+        """
+        provider = get_llm_provider(llm_name)
+        llm_client = get_llm_client(
+            provider, llm_api_key=llm_api_key, llm_api_base_url=llm_api_base_url
+        )
+        if provider == LLM_PROVIDER_OPENAI:
+            model = OpenAIResponsesModel(model=llm_name, openai_client=llm_client)
         else:
-            raise RuntimeError(
-                f"Model not known, make sure it is either an OpenAI or a Gemini model, got: {llm_name}"
-            )
-        self.agent = Agent(
+            model = OpenAIChatCompletionsModel(model=llm_name, openai_client=llm_client)
+        return Agent(
             name="BookingRecommender",
             model=model,
-            instructions=self._get_system_message(),
+            instructions=cls._get_system_message(),
             tools=[
                 get_court_availability_tool,
+                get_combined_court_availability_tool,
+                get_court_availability_range_tool,
+                find_free_slots_tool,
+                watch_slot_tool,
                 get_court_attributes_tool,
+                list_clubs_tool,
                 push_notification_tool,
             ],
         )
-        self.session = SQLiteSession(trace_id)
+
+    @classmethod
+    def get_agent(
+        cls, llm_api_key: str, llm_name: str, llm_api_base_url: str = None
+    ) -> Agent:
+        """Return the process-wide agent of `llm_name`, building it on first use."""
+        agent = _agents.get(llm_name)
+        if agent is None:
+            agent = cls.build_agent(
+                llm_api_key=llm_api_key,
+                llm_name=llm_name,
+                llm_api_base_url=llm_api_base_url,
+            )
+            _agents[llm_name] = agent
+        return agent
 
     @staticmethod
     def _get_system_message() -> str:
@@ -58,28 +147,71 @@ class OpenAIAgent:
 
     async def run_agent(self, user_message: str) -> str:
         """Run the agent with the given user message."""
-        print("Starting booking manager...")
         response = await Runner.run(
             self.agent,
             user_message,
             session=self.session,
+            hooks=METRICS_HOOKS,
+            run_config=self.run_config,
             # context=self.context
         )
         return response.final_output
 
+    def run_agent_streamed(self, user_message: str) -> RunResultStreaming:
+        """Run the agent with the given user message, streaming its events."""
+        return Runner.run_streamed(
+            self.agent,
+            user_message,
+            session=self.session,
+            hooks=METRICS_HOOKS,
+            run_config=self.run_config,
+        )
+
 
 class BookingManager:
     """AI agent for tennis court booking assistance."""
 
-    def __init__(self, llm_api_key: str, llm_name: str, llm_api_base_url: str = None):
+    def __init__(
+        self,
+        agent: Agent,
+        session_id: str | None = None,
+        session_db_path: str = ":memory:",
+        max_turns: int | None = DEFAULT_MAX_TURNS,
+    ):
+        """
+        Args:
+            agent: Shared agent, see `OpenAIAgent.build_agent`
+            session_id: Key of the conversation in the session database, defaults to the
+                trace ID
+            session_db_path: SQLite file holding the conversation, so it can be resumed
+                by a new `BookingManager` with the same `session_id`
+            max_turns: Number of previous turns sent to the model, None for all
+        """
         self.trace_id = gen_trace_id()
+        self.session_id = session_id or self.trace_id
         self.openai_agent = OpenAIAgent(
-            trace_id=self.trace_id,
-            llm_api_key=llm_api_key,
-            llm_name=llm_name,
-            llm_api_base_url=llm_api_base_url,
+            agent=agent,
+            session=SQLiteSession(self.session_id, db_path=session_db_path),
+            max_turns=max_turns,
+        )
+        self.active_runs: int = 0
+        print(
+            f"View trace: https://platform.openai.com/traces/trace?trace_id={self.trace_id}"
         )
 
+    async def remember(self, message: str, response: str) -> None:
+        """Add an exchange answered without the agent to the conversation."""
+        await self.openai_agent.session.add_items(
+            [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": response},
+            ]
+        )
+
+    def close(self) -> None:
+        """Release the database connections of the conversation session."""
+        self.openai_agent.session.close()
+
     async def run(
         self, message: str, history: list[dict] = None
     ) -> tuple[str, list[dict]]:
@@ -99,19 +231,46 @@ class BookingManager:
         if not message.strip():
             return "", history
 
+        self.active_runs += 1
         try:
             with trace("Tennis Agent", trace_id=self.trace_id):
-                print(
-                    f"View trace: https://platform.openai.com/traces/trace?trace_id={self.trace_id}"
-                )
-                # yield f"View trace: https://platform.openai.com/traces/trace?trace_id={trace_id}"
                 response = await self.openai_agent.run_agent(message)
         except Exception as e:
             print(f"Error processing request: {e}")
-            response = "I'm sorry, I encountered an error processing your request. Please try again."
+            response = ERROR_RESPONSE
+        finally:
+            self.active_runs -= 1
 
         # Update history with messages format
         history.append({"role": "user", "content": message})
         history.append({"role": "assistant", "content": response})
 
         return response, history
+
+    async def stream(self, message: str) -> AsyncIterator[AgentStreamEvent]:
+        """
+        Process a chat message, yielding the tokens of the response and the tool calls
+        as they happen.
+
+        Args:
+            message: User's message
+
+        Yields:
+            AgentStreamEvent objects
+        """
+        if not message.strip():
+            return
+
+        self.active_runs += 1
+        try:
+            with trace("Tennis Agent", trace_id=self.trace_id):
+                result = self.openai_agent.run_agent_streamed(message)
+                async for event in result.stream_events():
+                    agent_stream_event = to_agent_stream_event(event)
+                    if agent_stream_event is not None:
+                        yield agent_stream_event
+        except Exception as e:
+            print(f"Error processing request: {e}")
+            yield AgentStreamEvent(kind=STREAM_EVENT_TOKEN, text=ERROR_RESPONSE)
+        finally:
+            self.active_runs -= 1
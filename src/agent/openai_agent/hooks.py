@@ -0,0 +1,51 @@
+"""
+Run hooks recording the latency of every LLM turn and tool call of the agent.
+"""
+
+import time
+
+from agents import Agent, RunContextWrapper, RunHooks, Tool
+
+from src.utils.metrics import LLM_TURN_SECONDS, TOOL_CALL_SECONDS
+
+
+def _model_name(agent: Agent) -> str:
+    return str(getattr(agent.model, "model", agent.model))
+
+
+class MetricsHooks(RunHooks):
+    """Observes LLM turns and tool calls in the agent histograms."""
+
+    def __init__(self):
+        # Start times by the ID of the run context (LLM) or tool context (tools)
+        self._llm_starts: dict[int, float] = {}
+        self._tool_starts: dict[int, float] = {}
+
+    async def on_llm_start(
+        self, context: RunContextWrapper, agent: Agent, system_prompt, input_items
+    ) -> None:
+        self._llm_starts[id(context)] = time.perf_counter()
+
+    async def on_llm_end(
+        self, context: RunContextWrapper, agent: Agent, response
+    ) -> None:
+        start = self._llm_starts.pop(id(context), None)
+        if start is not None:
+            LLM_TURN_SECONDS.observe(
+                time.perf_counter() - start, model=_model_name(agent)
+            )
+
+    async def on_tool_start(
+        self, context: RunContextWrapper, agent: Agent, tool: Tool
+    ) -> None:
+        self._tool_starts[id(context)] = time.perf_counter()
+
+    async def on_tool_end(
+        self, context: RunContextWrapper, agent: Agent, tool: Tool, result
+    ) -> None:
+        start = self._tool_starts.pop(id(context), None)
+        if start is not None:
+            TOOL_CALL_SECONDS.observe(time.perf_counter() - start, tool=tool.name)
+
+
+METRICS_HOOKS = MetricsHooks()
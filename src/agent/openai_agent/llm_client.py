@@ -0,0 +1,63 @@
+"""
+Process-wide LLM clients.
+
+Every (provider, base URL) gets a single `AsyncOpenAI` client, so all chat sessions share
+its connection pool and keep-alive connections instead of opening their own.
+"""
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+LLM_PROVIDER_OPENAI: str = "openai"
+LLM_PROVIDER_GEMINI: str = "gemini"
+
+LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+LLM_READ_TIMEOUT_SECONDS: float = 60.0
+LLM_MAX_CONNECTIONS: int = 50
+LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+LLM_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+
+_llm_clients: dict[tuple[str, str | None], AsyncOpenAI] = {}
+
+
+def get_llm_provider(llm_name: str) -> str:
+    """Provider serving the model `llm_name`."""
+    if llm_name.startswith("gpt"):
+        return LLM_PROVIDER_OPENAI
+    if llm_name.startswith("gemini"):
+        return LLM_PROVIDER_GEMINI
+    raise RuntimeError(
+        f"Model not known, make sure it is either an OpenAI or a Gemini model, got: {llm_name}"
+    )
+
+
+def get_llm_client(
+    provider: str, llm_api_key: str, llm_api_base_url: str | None = None
+) -> AsyncOpenAI:
+    """Return the shared client of `provider` at `llm_api_base_url`, creating it on first use."""
+    key = (provider, llm_api_base_url)
+    client = _llm_clients.get(key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=llm_api_key,
+            base_url=llm_api_base_url,
+            http_client=DefaultAsyncHttpxClient(
+                timeout=httpx.Timeout(
+                    LLM_READ_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS
+                ),
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            ),
+        )
+        _llm_clients[key] = client
+    return client
+
+
+async def aclose_llm_clients() -> None:
+    """Close all shared clients, e.g. on app shutdown."""
+    for client in _llm_clients.values():
+        await client.close()
+    _llm_clients.clear()
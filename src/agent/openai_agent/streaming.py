@@ -0,0 +1,98 @@
+"""
+Streaming of agent runs.
+
+Translates the stream events of the agents SDK into the few events the UI shows: text
+tokens of the answer and the start and end of tool calls with a readable description.
+"""
+
+import json
+from typing import NamedTuple
+
+from agents import RawResponsesStreamEvent, RunItemStreamEvent, StreamEvent
+
+STREAM_EVENT_TOKEN: str = "token"
+STREAM_EVENT_TOOL_STARTED: str = "tool_started"
+STREAM_EVENT_TOOL_FINISHED: str = "tool_finished"
+
+_TEXT_DELTA_EVENT_TYPE: str = "response.output_text.delta"
+
+
+class AgentStreamEvent(NamedTuple):
+    """A token of the answer or the start or end of a tool call."""
+
+    kind: str
+    text: str
+    call_id: str | None = None
+
+
+def _module_label(arguments: dict) -> str:
+    return "Hallenplätze" if arguments.get("for_indoors") else "Außenplätze"
+
+
+def describe_tool_call(tool_name: str, arguments: str | None) -> str:
+    """Short German description of a tool call shown while it is running."""
+    try:
+        parsed_arguments = json.loads(arguments or "{}")
+    except json.JSONDecodeError:
+        parsed_arguments = {}
+    if tool_name == "get_court_availability_tool":
+        return (
+            f"Lade {_module_label(parsed_arguments)} für "
+            f"{parsed_arguments.get('date', '?')}"
+        )
+    if tool_name == "get_combined_court_availability_tool":
+        return f"Lade Hallen- und Außenplätze für {parsed_arguments.get('date', '?')}"
+    if tool_name == "get_court_availability_range_tool":
+        return (
+            f"Lade {_module_label(parsed_arguments)} für "
+            f"{parsed_arguments.get('num_days', '?')} Tage ab "
+            f"{parsed_arguments.get('start_date', '?')}"
+        )
+    if tool_name == "find_free_slots_tool":
+        return (
+            f"Suche freie {_module_label(parsed_arguments)} am "
+            f"{parsed_arguments.get('date', '?')} zwischen "
+            f"{parsed_arguments.get('earliest_start', '?')} und "
+            f"{parsed_arguments.get('latest_start', '?')}"
+        )
+    if tool_name == "watch_slot_tool":
+        return f"Lege Beobachtung für {parsed_arguments.get('date', '?')} an"
+    if tool_name == "get_court_attributes_tool":
+        return "Lade Platzeigenschaften"
+    if tool_name == "list_clubs_tool":
+        return "Lade Vereine"
+    if tool_name == "push_notification_tool":
+        return "Sende Push-Notification"
+    return tool_name
+
+
+def _call_id(raw_item) -> str | None:
+    if isinstance(raw_item, dict):
+        return raw_item.get("call_id") or raw_item.get("id")
+    return getattr(raw_item, "call_id", None) or getattr(raw_item, "id", None)
+
+
+def to_agent_stream_event(event: StreamEvent) -> AgentStreamEvent | None:
+    """The UI event of an SDK stream event, None if it is not shown."""
+    if isinstance(event, RawResponsesStreamEvent):
+        if event.data.type == _TEXT_DELTA_EVENT_TYPE:
+            return AgentStreamEvent(kind=STREAM_EVENT_TOKEN, text=event.data.delta)
+        return None
+    if isinstance(event, RunItemStreamEvent):
+        raw_item = event.item.raw_item
+        if event.name == "tool_called":
+            tool_name = event.item.tool_name or "tool"
+            return AgentStreamEvent(
+                kind=STREAM_EVENT_TOOL_STARTED,
+                text=describe_tool_call(
+                    tool_name, getattr(raw_item, "arguments", None)
+                ),
+                call_id=_call_id(raw_item),
+            )
+        if event.name == "tool_output":
+            return AgentStreamEvent(
+                kind=STREAM_EVENT_TOOL_FINISHED,
+                text=str(event.item.output),
+                call_id=_call_id(raw_item),
+            )
+    return None
@@ -1,11 +1,24 @@
-import os
-import requests
-
 from agents import function_tool
 
-from src.data.courts import Court, COURT_ATTRIBUTES
-from src.booking.constants import CourtAvailability
-from src.booking.booking_fetcher import CourtBookingFetcher
+from src.booking.constants import (
+    CombinedAvailabilityResponse,
+    CourtAvailabilityResponse,
+    CourtAvailabilityRangeResponse,
+    SlotCandidate,
+)
+from src.booking.availability_cache import get_availability_snapshot
+from src.booking.availability_range import get_availability_range
+from src.booking.clubs import get_club_registry
+from src.booking.combined_availability import get_combined_availability
+from src.booking.slot_search import find_free_slots, find_free_slots_in_clubs
+from src.booking.watches import get_watch_registry
+from src.utils.notifications import enqueue_push_notification
+from src.booking.encoding import (
+    encode_availability_response,
+    encode_combined_availability_response,
+    encode_court_attributes,
+    get_availability_output_format,
+)
 
 
 @function_tool
@@ -13,7 +26,7 @@ async def get_court_availability_tool(
     # wrapper: RunContextWrapper[BookingContext],
     date: str,
     for_indoors: bool,
-) -> list[CourtAvailability]:
+) -> CourtAvailabilityResponse | str:
     """
     Retrieves court availabilities for `date` for all courts either for indoors only or for outside.
 
@@ -22,30 +35,238 @@ async def get_court_availability_tool(
         for_indoors: bool, whether to fetch court availability for indoor courts or not
 
     Returns:
-        List of CourtAvailability objects for all courts on the specified date
+        CourtAvailabilityResponse with the CourtAvailability objects for all courts on the
+        specified date and the age of this data in seconds. In the compact output format
+        a header line followed by one line of free/booked flags per court
     """
-    booking_fetcher = CourtBookingFetcher(target_date=date, for_indoors=for_indoors)
-    court_availabilities = booking_fetcher.get_court_availabilities()
+    snapshot = await get_availability_snapshot(
+        target_date=date, for_indoors=for_indoors
+    )
 
     # wrapper.context.availability = court_availabilities
-    return court_availabilities
+    response = CourtAvailabilityResponse(
+        snapshot_age_seconds=int(snapshot.age_seconds()),
+        is_stale=snapshot.is_stale,
+        court_availabilities=snapshot.court_availabilities,
+    )
+    return encode_availability_response(response, get_availability_output_format())
+
+
+@function_tool
+async def get_combined_court_availability_tool(
+    date: str,
+) -> CombinedAvailabilityResponse | str:
+    """
+    Retrieves court availabilities for `date` for all indoor and outdoor courts at once.
+
+    Args:
+        date: Date in DD.MM.YYYY format
+
+    Returns:
+        CombinedAvailabilityResponse with one entry per court, mapping each hour to its
+        availability and to its source, 'hall' or 'open-air', the module the slot is
+        booked in or has to be booked in. In the compact output format a header line
+        followed by one line per court with H (free, hall), O (free, open-air) or
+        0 (booked) per hour
+    """
+    response = await get_combined_availability(target_date=date)
+    return encode_combined_availability_response(
+        response, get_availability_output_format()
+    )
+
+
+@function_tool
+async def get_court_availability_range_tool(
+    start_date: str,
+    num_days: int,
+    for_indoors: bool,
+) -> CourtAvailabilityRangeResponse:
+    """
+    Retrieves court availabilities for several consecutive days starting at `start_date`.
+
+    Args:
+        start_date: First date in DD.MM.YYYY format
+        num_days: Number of consecutive days, at most 14
+        for_indoors: bool, whether to fetch court availability for indoor courts or not
+
+    Returns:
+        CourtAvailabilityRangeResponse with one entry per court, mapping each date to its
+        hour -> availability mapping
+    """
+    return await get_availability_range(
+        start_date=start_date, num_days=num_days, for_indoors=for_indoors
+    )
+
+
+@function_tool
+async def find_free_slots_tool(
+    date: str,
+    duration_minutes: int,
+    earliest_start: str,
+    latest_start: str,
+    for_indoors: bool,
+    court_type: str | None = None,
+    singles_only: bool | None = None,
+    middle_court: bool | None = None,
+    wingfield: bool | None = None,
+    max_results: int = 10,
+    clubs: list[str] | None = None,
+) -> list[SlotCandidate]:
+    """
+    Finds free court slots on `date` matching the requested time window and court attributes.
+
+    Args:
+        date: Date in DD.MM.YYYY format
+        duration_minutes: How long the user wants to play in minutes, e.g. 60 or 90
+        earliest_start: Earliest start time in HH:MM format
+        latest_start: Latest start time in HH:MM format
+        for_indoors: bool, whether to search indoor courts or not
+        court_type: Optional surface, either 'sand' or 'granulat'
+        singles_only: Optional, True for singles-only courts, False to exclude them
+        middle_court: Optional, True for middle courts, False to exclude them
+        wingfield: Optional, True for courts with a Wingfield system, False to exclude them
+        max_results: Maximum number of returned slots
+        clubs: Optional IDs of other clubs to search as well, see list_clubs_tool. None
+            searches the home club only
+
+    Returns:
+        List of free SlotCandidate objects (court, start, end) ranked by start time,
+        with the club name if several clubs were searched
+    """
+    if clubs:
+        return await find_free_slots_in_clubs(
+            target_date=date,
+            duration_minutes=duration_minutes,
+            earliest_start=earliest_start,
+            latest_start=latest_start,
+            for_indoors=for_indoors,
+            club_ids=[get_club_registry().default.club_id] + clubs,
+            court_type=court_type,
+            is_singles_only=singles_only,
+            is_middle_court=middle_court,
+            is_wingfield=wingfield,
+            max_results=max_results,
+        )
+    return await find_free_slots(
+        target_date=date,
+        duration_minutes=duration_minutes,
+        earliest_start=earliest_start,
+        latest_start=latest_start,
+        for_indoors=for_indoors,
+        court_type=court_type,
+        is_singles_only=singles_only,
+        is_middle_court=middle_court,
+        is_wingfield=wingfield,
+        max_results=max_results,
+    )
 
 
 @function_tool
-async def get_court_attributes_tool() -> list[Court]:
-    return COURT_ATTRIBUTES
+async def watch_slot_tool(
+    date: str,
+    for_indoors: bool,
+    from_hour: int,
+    to_hour: int,
+    court_name: str | None = None,
+) -> str:
+    """
+    Watches a time range and sends a push notification once a court becomes free there.
+
+    Args:
+        date: Date in DD.MM.YYYY format
+        for_indoors: bool, whether to watch indoor courts or not
+        from_hour: First start hour of interest, e.g. 18
+        to_hour: End hour of the range (exclusive), e.g. 20 for 18:00 - 20:00
+        court_name: Optional name of the watched court, e.g. 'Platz T'. None watches all courts
+
+    Returns:
+        Confirmation of the watch or the courts that are already free in the range
+    """
+    snapshot = await get_availability_snapshot(
+        target_date=date, for_indoors=for_indoors
+    )
+    already_free = [
+        f"{court_availability.court_name} um {hour:02d}:00"
+        for court_availability in snapshot.court_availabilities
+        if court_name is None or court_availability.court_name == court_name
+        for hour in range(from_hour, to_hour)
+        if court_availability.is_available(hour)
+    ]
+    if already_free:
+        return f"Bereits frei, keine Beobachtung nötig: {', '.join(already_free)}"
+
+    watch = get_watch_registry().add(
+        target_date=snapshot.target_date,
+        for_indoors=for_indoors,
+        from_hour=from_hour,
+        to_hour=to_hour,
+        court_name=court_name,
+    )
+    return f"Beobachtung {watch.watch_id} angelegt"
+
+
+@function_tool
+def list_clubs_tool() -> list[dict]:
+    """
+    Lists the clubs whose courts can be searched with find_free_slots_tool.
+
+    Returns:
+        List of clubs with their ID, name and whether they have outdoor and indoor courts
+    """
+    return [
+        {
+            "club_id": club.club_id,
+            "name": club.name,
+            "outdoor": club.has_module(for_indoors=False),
+            "indoor": club.has_module(for_indoors=True),
+        }
+        for club in get_club_registry()
+    ]
+
+
+@function_tool
+def get_court_attributes_tool(
+    court_type: str | None = None,
+    is_indoors: bool | None = None,
+    is_singles_only: bool | None = None,
+    is_middle_court: bool | None = None,
+    is_wingfield: bool | None = None,
+    location: str | None = None,
+    club: str | None = None,
+) -> str:
+    """
+    Lists the attributes of the courts matching all given filters, None means no filter.
+
+    Args:
+        court_type: Optional surface, 'sand' or 'granulat'
+        is_indoors: Optional filter on courts with a roof in winter (hall courts)
+        is_singles_only: Optional filter on singles-only courts
+        is_middle_court: Optional filter on middle courts
+        is_wingfield: Optional filter on courts with a Wingfield system
+        location: Optional part of the location, e.g. 'hinten' or 'Tennisschule'
+        club: Optional ID of another club, see list_clubs_tool. None for the STC
+
+    Returns:
+        A header line with the number of courts and the legend, followed by one line per
+        court: name;surface;flags;location
+    """
+    court_registry = get_club_registry().get(club).court_registry
+    mask = court_registry.mask(
+        is_indoors=is_indoors,
+        court_type=court_type,
+        is_singles_only=is_singles_only,
+        is_middle_court=is_middle_court,
+        is_wingfield=is_wingfield,
+        location=location,
+    )
+    return encode_court_attributes(court_registry, mask)
 
 
 @function_tool
 def push_notification_tool(message: str):
     """Use this tool when you want to send a push notification"""
-    pushover_token = os.getenv("PUSHOVER_TOKEN")
-    pushover_user = os.getenv("PUSHOVER_USER")
-    pushover_url = "https://api.pushover.net/1/messages.json"
-
-    print(f"Push: {message}")
-    payload = {"user": pushover_user, "token": pushover_token, "message": message}
-    requests.post(pushover_url, data=payload)
+    if not enqueue_push_notification(message):
+        return "skipped, the same notification was already sent or too many are pending"
     return "success"
 
 
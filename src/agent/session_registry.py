@@ -0,0 +1,253 @@
+"""
+Bounded registry of the active chat sessions.
+
+Instead of keeping one `BookingManager` per chat for the lifetime of the process, managers
+are kept per chat thread in a registry with a maximum size and an idle timeout. The
+conversation of every thread is stored in a SQLite file, so an evicted thread continues
+its conversation when the user returns, and only its last turns are sent to the model.
+A new thread of a signed-in user starts with the last turns of the user's previous
+thread, and stored conversations idle for longer than the retention period are deleted.
+All managers share a single agent.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from agents import Agent, SQLiteSession
+
+from src.agent.openai_agent.agent import (
+    DEFAULT_MAX_TURNS,
+    BookingManager,
+    keep_last_turns,
+)
+from src.constants import (
+    ENV_VAR_NAME_SESSION_IDLE_TTL,
+    ENV_VAR_NAME_SESSION_MAX_ACTIVE,
+    ENV_VAR_NAME_SESSION_MAX_TURNS,
+    ENV_VAR_NAME_SESSION_RETENTION_DAYS,
+    ENV_VAR_NAME_SESSION_STORE_PATH,
+)
+
+DEFAULT_SESSION_STORE_PATH: str = ".data/sessions.sqlite"
+DEFAULT_SESSION_MAX_ACTIVE: int = 200
+DEFAULT_SESSION_IDLE_TTL_SECONDS: float = 1800.0
+DEFAULT_SESSION_RETENTION_DAYS: float = 30.0
+# Minimum time between two deletions of expired conversations
+PRUNE_INTERVAL_SECONDS: float = 3600.0
+
+# Tables of `SQLiteSession`
+_SESSIONS_TABLE: str = "agent_sessions"
+_MESSAGES_TABLE: str = "agent_messages"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_sessions (
+    user_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL
+);
+"""
+
+
+class SessionRegistry:
+    """`BookingManager` per chat thread, evicting the least recently used and idle ones."""
+
+    def __init__(
+        self,
+        agent: Agent,
+        db_path: str = DEFAULT_SESSION_STORE_PATH,
+        max_sessions: int = DEFAULT_SESSION_MAX_ACTIVE,
+        idle_ttl_seconds: float = DEFAULT_SESSION_IDLE_TTL_SECONDS,
+        max_turns: int | None = DEFAULT_MAX_TURNS,
+        retention_days: float | None = DEFAULT_SESSION_RETENTION_DAYS,
+    ):
+        """
+        Args:
+            agent: Shared agent, see `OpenAIAgent.build_agent`
+            db_path: SQLite file holding the conversations, ':memory:' for none
+            max_sessions: Maximum number of managers kept in memory
+            idle_ttl_seconds: Idle time after which a manager is evicted
+            max_turns: Number of previous turns sent to the model, None for all
+            retention_days: Idle time after which a stored conversation is deleted,
+                None to keep them forever
+        """
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.agent = agent
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_turns = max_turns
+        self.retention_days = retention_days
+        self._managers: OrderedDict[str, BookingManager] = OrderedDict()
+        self._last_used: dict[str, float] = {}
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._pruned_at: float | None = None
+        self.prune_stored_sessions()
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._managers
+
+    def get(self, session_id: str) -> BookingManager:
+        """Return the manager of `session_id`, resuming its stored conversation if evicted."""
+        now = time.monotonic()
+        self.evict_idle(now=now)
+        manager = self._managers.get(session_id)
+        if manager is None:
+            manager = BookingManager(
+                agent=self.agent,
+                session_id=session_id,
+                session_db_path=self.db_path,
+                max_turns=self.max_turns,
+            )
+            self._managers[session_id] = manager
+            self._evict_overflow()
+        else:
+            self._managers.move_to_end(session_id)
+        self._last_used[session_id] = now
+        return manager
+
+    async def start(
+        self, session_id: str, user_id: str | None = None
+    ) -> BookingManager:
+        """
+        Return the manager of a new chat thread `session_id` of `user_id`.
+
+        If the thread has no conversation yet, it starts with the last turns of the
+        previous thread of the user, so a returning user keeps the context.
+        """
+        manager = self.get(session_id)
+        if user_id is None:
+            return manager
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT session_id FROM user_sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO user_sessions VALUES (?, ?)",
+                (user_id, session_id),
+            )
+        previous_id = row[0] if row is not None else None
+        session = manager.openai_agent.session
+        if previous_id in (None, session_id) or await session.get_items(limit=1):
+            return manager
+
+        previous = self._managers.get(previous_id)
+        previous_session = (
+            previous.openai_agent.session
+            if previous is not None
+            else SQLiteSession(previous_id, db_path=self.db_path)
+        )
+        try:
+            items = await previous_session.get_items()
+        finally:
+            if previous is None:
+                previous_session.close()
+        if self.max_turns is not None:
+            items = keep_last_turns(items, self.max_turns)
+        if items:
+            await session.add_items(items)
+        return manager
+
+    def prune_stored_sessions(self) -> int:
+        """
+        Delete stored conversations idle for longer than `retention_days`.
+
+        Returns:
+            Number of deleted conversations
+        """
+        self._pruned_at = time.monotonic()
+        if self.retention_days is None:
+            return 0
+        with self._lock, self._connection:
+            has_sessions = self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (_SESSIONS_TABLE,),
+            ).fetchone()
+            if not has_sessions:
+                return 0
+            expired = [
+                session_id
+                for (session_id,) in self._connection.execute(
+                    f"SELECT session_id FROM {_SESSIONS_TABLE} "
+                    "WHERE updated_at < datetime('now', ?)",
+                    (f"-{self.retention_days} days",),
+                )
+                if session_id not in self._managers
+            ]
+            for table in (_MESSAGES_TABLE, _SESSIONS_TABLE, "user_sessions"):
+                self._connection.executemany(
+                    f"DELETE FROM {table} WHERE session_id = ?",
+                    [(session_id,) for session_id in expired],
+                )
+        return len(expired)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """Evict all managers unused for `idle_ttl_seconds` and return how many were evicted."""
+        now = time.monotonic() if now is None else now
+        idle = [
+            session_id
+            for session_id, last_used in self._last_used.items()
+            if now - last_used >= self.idle_ttl_seconds
+        ]
+        evicted = sum(self._evict(session_id) for session_id in idle)
+        if evicted and now - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+            self.prune_stored_sessions()
+        return evicted
+
+    def _evict_overflow(self) -> None:
+        """Evict the least recently used managers above `max_sessions`."""
+        for session_id in list(self._managers):
+            if len(self._managers) <= self.max_sessions:
+                return
+            self._evict(session_id)
+
+    def _evict(self, session_id: str) -> bool:
+        """Evict the manager of `session_id` unless it is processing a message."""
+        manager = self._managers.get(session_id)
+        if manager is None or manager.active_runs:
+            return False
+        del self._managers[session_id]
+        del self._last_used[session_id]
+        manager.close()
+        return True
+
+    def close(self) -> None:
+        for manager in self._managers.values():
+            manager.close()
+        self._managers.clear()
+        self._last_used.clear()
+        self._connection.close()
+
+
+def create_session_registry_from_env(agent: Agent) -> SessionRegistry:
+    """
+    Create the session registry of `agent` from the environment.
+
+    Conversations are kept in memory only if SESSION_STORE_PATH is set to an empty string,
+    the whole conversation is sent to the model if SESSION_MAX_TURNS is 0 and stored
+    conversations are kept forever if SESSION_RETENTION_DAYS is 0.
+    """
+    max_turns = int(os.getenv(ENV_VAR_NAME_SESSION_MAX_TURNS, DEFAULT_MAX_TURNS))
+    retention_days = float(
+        os.getenv(ENV_VAR_NAME_SESSION_RETENTION_DAYS, DEFAULT_SESSION_RETENTION_DAYS)
+    )
+    return SessionRegistry(
+        agent=agent,
+        db_path=os.getenv(ENV_VAR_NAME_SESSION_STORE_PATH, DEFAULT_SESSION_STORE_PATH)
+        or ":memory:",
+        max_sessions=int(
+            os.getenv(ENV_VAR_NAME_SESSION_MAX_ACTIVE, DEFAULT_SESSION_MAX_ACTIVE)
+        ),
+        idle_ttl_seconds=float(
+            os.getenv(ENV_VAR_NAME_SESSION_IDLE_TTL, DEFAULT_SESSION_IDLE_TTL_SECONDS)
+        ),
+        max_turns=max_turns or None,
+        retention_days=retention_days or None,
+    )
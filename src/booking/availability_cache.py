@@ -0,0 +1,317 @@
+"""
+Process-wide cache for court availability snapshots.
+
+Snapshots are keyed by `(target_date, for_indoors)`. Once a snapshot is older than the
+configured TTL, callers still get it right away while a single background task fetches
+fresh data from eBuSy (stale-while-revalidate). Every club has its own cache, the one of
+the default club is the one the prefetcher, the watches and the snapshot store use.
+The interval indexes of a snapshot are built when it is fetched, so queries for free
+windows only run binary searches.
+
+The last successfully fetched snapshot of every day is kept as well: while eBuSy is
+unavailable it is served marked as stale instead of failing, and if eBuSy returns an
+unchanged payload it is reused without parsing the reservations again.
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Awaitable, Callable
+
+from src.booking.booking_fetcher import CourtBookingFetcher
+from src.booking.clubs import get_club_registry
+from src.booking.constants import (
+    DEFAULT_AVAILABILITY_CACHE_MAX_ENTRIES,
+    DEFAULT_AVAILABILITY_CACHE_TTL_SECONDS,
+    DEFAULT_SLOT_MINUTES,
+    MAX_LAST_GOOD_SNAPSHOTS,
+    AvailabilitySnapshot,
+)
+from src.booking.ebusy_client import EbusyUnavailableError
+from src.booking.interval_index import CourtIntervalIndex, snapshot_interval_indexes
+from src.booking.single_flight import SingleFlight
+from src.utils.metrics import AVAILABILITY_CACHE_REQUESTS, gauge
+from src.constants import (
+    ENV_VAR_NAME_AVAILABILITY_CACHE_MAX_ENTRIES,
+    ENV_VAR_NAME_AVAILABILITY_CACHE_TTL,
+)
+
+CacheKey = tuple[date, bool]
+SnapshotLoader = Callable[[], Awaitable[AvailabilitySnapshot]]
+SnapshotListener = Callable[[AvailabilitySnapshot | None, AvailabilitySnapshot], None]
+
+
+class AvailabilityCache:
+    """Bounded LRU cache of availability snapshots with stale-while-revalidate refreshes."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        if ttl_seconds < 0:
+            raise ValueError(f"`ttl_seconds` must not be negative, got: {ttl_seconds}")
+        if max_entries < 1:
+            raise ValueError(f"`max_entries` must be at least 1, got: {max_entries}")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._snapshots: OrderedDict[CacheKey, AvailabilitySnapshot] = OrderedDict()
+        self._refresh_tasks: dict[CacheKey, asyncio.Task] = {}
+        self._listeners: list[SnapshotListener] = []
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def peek(self, key: CacheKey) -> AvailabilitySnapshot | None:
+        """Return the cached snapshot for `key` without triggering any fetch."""
+        return self._snapshots.get(key)
+
+    def add_listener(self, listener: SnapshotListener) -> None:
+        """Call `listener(previous, current)` whenever a snapshot is stored."""
+        self._listeners.append(listener)
+
+    def put(self, key: CacheKey, snapshot: AvailabilitySnapshot) -> None:
+        """Store `snapshot` and evict the least recently used entries beyond the limit."""
+        previous = self._snapshots.get(key)
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_entries:
+            self._snapshots.popitem(last=False)
+        for listener in self._listeners:
+            try:
+                listener(previous, snapshot)
+            except Exception as e:
+                print(f"Error in availability listener for {key}: {e}")
+
+    def is_stale(self, snapshot: AvailabilitySnapshot) -> bool:
+        return snapshot.age_seconds() > self.ttl_seconds
+
+    async def get(self, key: CacheKey, loader: SnapshotLoader) -> AvailabilitySnapshot:
+        """
+        Return the snapshot for `key`, loading it on a miss.
+
+        Args:
+            key: Tuple of target date and indoor flag
+            loader: Coroutine factory fetching a fresh snapshot
+
+        Returns:
+            The cached snapshot, which may be older than the TTL while a refresh is running
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            AVAILABILITY_CACHE_REQUESTS.inc(result="miss")
+            snapshot = await loader()
+            self.put(key, snapshot)
+            return snapshot
+
+        self._snapshots.move_to_end(key)
+        if self.is_stale(snapshot):
+            AVAILABILITY_CACHE_REQUESTS.inc(result="stale")
+            self._schedule_refresh(key, loader)
+        else:
+            AVAILABILITY_CACHE_REQUESTS.inc(result="hit")
+        return snapshot
+
+    def _schedule_refresh(self, key: CacheKey, loader: SnapshotLoader) -> None:
+        """Start a background refresh for `key` unless one is already running."""
+        if key in self._refresh_tasks:
+            return
+        task = asyncio.create_task(self._refresh(key, loader))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+
+    async def _refresh(self, key: CacheKey, loader: SnapshotLoader) -> None:
+        try:
+            snapshot = await loader()
+        except Exception as e:
+            # Keep serving the old snapshot marked as stale, the next request triggers
+            # a new attempt
+            print(f"Error refreshing availability for {key}: {e}")
+            current = self._snapshots.get(key)
+            if current is not None and not current.is_stale:
+                self.put(key, current.model_copy(update={"is_stale": True}))
+            return
+        self.put(key, snapshot)
+
+
+_availability_cache: AvailabilityCache | None = None
+_club_availability_caches: dict[str, AvailabilityCache] = {}
+
+
+def _create_availability_cache_from_env() -> AvailabilityCache:
+    return AvailabilityCache(
+        ttl_seconds=float(
+            os.getenv(
+                ENV_VAR_NAME_AVAILABILITY_CACHE_TTL,
+                DEFAULT_AVAILABILITY_CACHE_TTL_SECONDS,
+            )
+        ),
+        max_entries=int(
+            os.getenv(
+                ENV_VAR_NAME_AVAILABILITY_CACHE_MAX_ENTRIES,
+                DEFAULT_AVAILABILITY_CACHE_MAX_ENTRIES,
+            )
+        ),
+    )
+
+
+def get_availability_cache(club_id: str | None = None) -> AvailabilityCache:
+    """
+    Return the process-wide availability cache of a club, configured from the
+    environment.
+
+    Args:
+        club_id: ID of the club, None for the default club
+    """
+    global _availability_cache
+    club_registry = get_club_registry()
+    club = club_registry.get(club_id)
+    if club is not club_registry.default:
+        if club.club_id not in _club_availability_caches:
+            _club_availability_caches[club.club_id] = (
+                _create_availability_cache_from_env()
+            )
+        return _club_availability_caches[club.club_id]
+    if _availability_cache is None:
+        _availability_cache = _create_availability_cache_from_env()
+    return _availability_cache
+
+
+_snapshot_fetches: SingleFlight[tuple[date, bool, str], AvailabilitySnapshot] = (
+    SingleFlight()
+)
+
+
+gauge(
+    "ebusy_fetches_issued_total",
+    "eBuSy fetches issued after single-flight coalescing",
+    lambda: _snapshot_fetches.issued,
+    kind="counter",
+)
+gauge(
+    "ebusy_fetches_coalesced_total",
+    "Fetch requests served by an already running eBuSy fetch",
+    lambda: _snapshot_fetches.coalesced,
+    kind="counter",
+)
+
+
+def get_fetch_counters() -> dict[str, int]:
+    """Number of eBuSy fetches issued and of requests coalesced into a running fetch."""
+    return {
+        "issued": _snapshot_fetches.issued,
+        "coalesced": _snapshot_fetches.coalesced,
+    }
+
+
+# Payload version and snapshot of the last successful fetch per (club, date, module)
+_last_good_snapshots: OrderedDict[
+    tuple[str, date, bool], tuple[str, AvailabilitySnapshot]
+] = OrderedDict()
+
+
+async def _fetch_availability_snapshot(
+    target_date: date, for_indoors: bool, club_id: str
+) -> AvailabilitySnapshot:
+    key = (club_id, target_date, for_indoors)
+    last_good = _last_good_snapshots.get(key)
+    club = get_club_registry().get(club_id)
+    try:
+        response = await club.fetch_reservations(
+            for_indoors=for_indoors, target_date=target_date.strftime("%m/%d/%Y")
+        )
+    except EbusyUnavailableError as e:
+        if last_good is None:
+            raise
+        print(f"Serving last fetched availability of {key}, eBuSy unavailable: {e}")
+        return last_good[1].model_copy(update={"is_stale": True})
+
+    if last_good is not None and last_good[0] == response.version:
+        snapshot = last_good[1].model_copy(
+            update={"fetched_at": datetime.now(), "is_stale": False}
+        )
+    else:
+        booking_fetcher = CourtBookingFetcher(
+            target_date=target_date,
+            for_indoors=for_indoors,
+            raw_bookings=response.data,
+            court_registry=club.court_registry,
+        )
+        snapshot = AvailabilitySnapshot(
+            target_date=target_date,
+            for_indoors=for_indoors,
+            fetched_at=datetime.now(),
+            court_bookings=booking_fetcher.get_court_bookings(),
+            court_availabilities=booking_fetcher.get_court_availabilities(),
+        )
+        snapshot_interval_indexes(snapshot)
+    _last_good_snapshots[key] = (response.version, snapshot)
+    _last_good_snapshots.move_to_end(key)
+    while len(_last_good_snapshots) > MAX_LAST_GOOD_SNAPSHOTS:
+        _last_good_snapshots.popitem(last=False)
+    return snapshot
+
+
+async def fetch_availability_snapshot(
+    target_date: date, for_indoors: bool, club_id: str | None = None
+) -> AvailabilitySnapshot:
+    """
+    Fetch the bookings of `target_date` from eBuSy without consulting the cache.
+
+    Concurrent calls for the same date, club and booking module share a single request.
+    While eBuSy is unavailable the last fetched snapshot is returned with `is_stale` set.
+
+    Raises:
+        EbusyUnavailableError: If eBuSy is unavailable and the day was never fetched
+    """
+    club = get_club_registry().get(club_id)
+    return await _snapshot_fetches.do(
+        (target_date, for_indoors, club.club_id),
+        lambda: _fetch_availability_snapshot(
+            target_date=target_date, for_indoors=for_indoors, club_id=club.club_id
+        ),
+    )
+
+
+async def get_availability_snapshot(
+    target_date: date | str, for_indoors: bool, club_id: str | None = None
+) -> AvailabilitySnapshot:
+    """
+    Get the availability snapshot of a day, served from the process-wide cache.
+
+    Args:
+        target_date: Date object or string in DD.MM.YYYY format
+        for_indoors: Whether to fetch the indoor courts
+        club_id: ID of the club, None for the default club
+
+    Returns:
+        AvailabilitySnapshot of the requested day
+    """
+    day = CourtBookingFetcher.to_date(target_date)
+    return await get_availability_cache(club_id).get(
+        (day, for_indoors),
+        lambda: fetch_availability_snapshot(
+            target_date=day, for_indoors=for_indoors, club_id=club_id
+        ),
+    )
+
+
+async def get_interval_indexes(
+    target_date: date | str,
+    for_indoors: bool,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES,
+    club_id: str | None = None,
+) -> dict[str, CourtIntervalIndex]:
+    """
+    Get the minute resolution interval index of every court on a day.
+
+    Args:
+        target_date: Date object or string in DD.MM.YYYY format
+        for_indoors: Whether to fetch the indoor courts
+        slot_minutes: Granularity of the start times, 30 or 60 minutes
+        club_id: ID of the club, None for the default club
+
+    Returns:
+        Dictionary with court names as keys and their CourtIntervalIndex as values
+    """
+    snapshot = await get_availability_snapshot(
+        target_date=target_date, for_indoors=for_indoors, club_id=club_id
+    )
+    return snapshot_interval_indexes(snapshot, slot_minutes=slot_minutes)
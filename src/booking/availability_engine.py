@@ -0,0 +1,81 @@
+"""
+Bitmask based availability engine.
+
+Every court's day is represented by an integer whose bit `h` is set when the hour
+starting at `h` o'clock is (partially) booked. Marking a booking and checking whether a
+court is free between two hours are single bit operations.
+"""
+
+from collections import defaultdict
+from typing import Iterable
+
+from src.booking.constants import BOOKABLE_HOURS, CourtAvailability, CourtBooking
+
+MINUTES_PER_HOUR: int = 60
+MINUTES_PER_DAY: int = 24 * MINUTES_PER_HOUR
+
+
+def hour_mask(from_hour: int, to_hour: int) -> int:
+    """Bitmask with the bits of all hours in `[from_hour, to_hour)` set."""
+    if to_hour <= from_hour:
+        return 0
+    return ((1 << to_hour) - 1) ^ ((1 << from_hour) - 1)
+
+
+def booking_mask(booking: CourtBooking) -> int:
+    """Bitmask of all hours touched by `booking` on the day it starts."""
+    start_minute = (
+        booking.start_time.hour * MINUTES_PER_HOUR + booking.start_time.minute
+    )
+    if booking.end_time.date() > booking.start_time.date():
+        end_minute = MINUTES_PER_DAY
+    else:
+        end_minute = booking.end_time.hour * MINUTES_PER_HOUR + booking.end_time.minute
+    first_hour = start_minute // MINUTES_PER_HOUR
+    last_hour = (end_minute - 1) // MINUTES_PER_HOUR
+    return hour_mask(first_hour, last_hour + 1)
+
+
+BOOKABLE_HOURS_MASK: int = hour_mask(BOOKABLE_HOURS.start, BOOKABLE_HOURS.stop)
+
+
+class AvailabilityGrid:
+    """Booked hours of a set of courts on a single day."""
+
+    def __init__(self, court_names: Iterable[str], bookings: Iterable[CourtBooking]):
+        booked_masks: dict[str, int] = defaultdict(int)
+        for booking in bookings:
+            booked_masks[booking.court_name] |= booking_mask(booking)
+        self.booked_masks: dict[str, int] = {
+            court_name: booked_masks.get(court_name, 0)
+            for court_name in sorted(set(court_names))
+        }
+
+    @property
+    def court_names(self) -> list[str]:
+        return list(self.booked_masks)
+
+    def is_free(self, court_name: str, from_hour: int, to_hour: int) -> bool:
+        """Whether `court_name` is not booked at any time between `from_hour` and `to_hour`."""
+        return self.booked_masks[court_name] & hour_mask(from_hour, to_hour) == 0
+
+    def free_courts(self, from_hour: int, to_hour: int) -> list[str]:
+        """All courts that are free between `from_hour` and `to_hour`."""
+        mask = hour_mask(from_hour, to_hour)
+        return [
+            court_name
+            for court_name, booked_mask in self.booked_masks.items()
+            if booked_mask & mask == 0
+        ]
+
+    def to_court_availabilities(self) -> list[CourtAvailability]:
+        """Convert the grid to the hour -> availability structure used by the agent."""
+        return [
+            CourtAvailability(
+                court_name=court_name,
+                availability={
+                    hour: not booked_mask >> hour & 1 for hour in BOOKABLE_HOURS
+                },
+            )
+            for court_name, booked_mask in self.booked_masks.items()
+        ]
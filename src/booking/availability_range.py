@@ -0,0 +1,90 @@
+"""
+Availability of all courts over several consecutive days.
+
+The days are fetched concurrently through the availability cache, so a question about
+a whole week costs roughly the latency of a single eBuSy request.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from src.booking.availability_cache import get_availability_snapshot
+from src.booking.booking_fetcher import CourtBookingFetcher
+from src.booking.constants import (
+    MAX_AVAILABILITY_RANGE_DAYS,
+    MAX_CONCURRENT_DAY_FETCHES,
+    AvailabilitySnapshot,
+    CourtAvailabilityRange,
+    CourtAvailabilityRangeResponse,
+)
+
+
+async def get_availability_snapshots(
+    start_date: date | str,
+    num_days: int,
+    for_indoors: bool,
+    max_concurrency: int = MAX_CONCURRENT_DAY_FETCHES,
+) -> list[AvailabilitySnapshot]:
+    """
+    Get the availability snapshots of `num_days` consecutive days starting at `start_date`.
+
+    Args:
+        start_date: Date object or string in DD.MM.YYYY format
+        num_days: Number of days to fetch, at most MAX_AVAILABILITY_RANGE_DAYS
+        for_indoors: Whether to fetch the indoor courts
+        max_concurrency: Maximum number of days fetched at the same time
+
+    Returns:
+        List of AvailabilitySnapshot objects ordered by date
+    """
+    if not 1 <= num_days <= MAX_AVAILABILITY_RANGE_DAYS:
+        raise ValueError(
+            f"`num_days` must be between 1 and {MAX_AVAILABILITY_RANGE_DAYS}, got: {num_days}"
+        )
+    first_day = CourtBookingFetcher.to_date(start_date)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_day(day: date) -> AvailabilitySnapshot:
+        async with semaphore:
+            return await get_availability_snapshot(
+                target_date=day, for_indoors=for_indoors
+            )
+
+    return await asyncio.gather(
+        *(fetch_day(first_day + timedelta(days=offset)) for offset in range(num_days))
+    )
+
+
+def merge_availability_snapshots(
+    snapshots: list[AvailabilitySnapshot],
+) -> CourtAvailabilityRangeResponse:
+    """Merge daily snapshots into one court x date x hour grid."""
+    court_availabilities: dict[str, CourtAvailabilityRange] = {}
+    for snapshot in snapshots:
+        date_key = snapshot.target_date.strftime("%d.%m.%Y")
+        for court_availability in snapshot.court_availabilities:
+            court_range = court_availabilities.setdefault(
+                court_availability.court_name,
+                CourtAvailabilityRange(
+                    court_name=court_availability.court_name, availability={}
+                ),
+            )
+            court_range.availability[date_key] = court_availability.availability
+
+    return CourtAvailabilityRangeResponse(
+        snapshot_age_seconds=int(
+            max((snapshot.age_seconds() for snapshot in snapshots), default=0)
+        ),
+        is_stale=any(snapshot.is_stale for snapshot in snapshots),
+        court_availabilities=list(court_availabilities.values()),
+    )
+
+
+async def get_availability_range(
+    start_date: date | str, num_days: int, for_indoors: bool
+) -> CourtAvailabilityRangeResponse:
+    """Get the merged availability grid of `num_days` days starting at `start_date`."""
+    snapshots = await get_availability_snapshots(
+        start_date=start_date, num_days=num_days, for_indoors=for_indoors
+    )
+    return merge_availability_snapshots(snapshots)
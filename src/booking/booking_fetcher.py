@@ -3,93 +3,106 @@ STC (Sport- und Tennis-Club München Süd) booking system client.
 Fetches court availability from the eBuSy booking system.
 """
 
-import json
-import requests
-from datetime import datetime, date, timedelta
+import asyncio
+from datetime import datetime, date
 
 from src.booking.constants import (
-    COURT_STC_ID_TO_INTERNAL_ID,
-    INDOOR_COURT_STC_ID_TO_INTERNAL_ID,
-    COURT_INTERNAL_ID_TO_NAME,
+    STC_INDOOR_MODULE_PATH,
+    STC_OUTDOOR_MODULE_PATH,
     CourtBooking,
     CourtAvailability,
 )
+from src.booking.availability_engine import AvailabilityGrid
+from src.booking.clubs import get_club_registry
+from src.booking.reservation_parser import parse_reservations
+from src.utils.metrics import (
+    AVAILABILITY_CONVERSION_SECONDS,
+    RESERVATION_PARSE_SECONDS,
+)
 from src.utils.validation import validate_date
-from src.data.courts import get_all_court_names
-
-EBUSY_STC_MUNICH_BASE_URL: str = "https://siemens-tennisclub-muenchenv8.ebusy.de"
+from src.data.court_registry import CourtRegistry
+from src.data.courts import COURT_REGISTRY
 
 
 class CourtBookingFetcher:
     """Fetches all court bookings on a given date via the STC eBuSy booking system."""
 
-    def __init__(self, target_date: date | str, for_indoors: bool):
+    def __init__(
+        self,
+        target_date: date | str,
+        for_indoors: bool,
+        raw_bookings: dict,
+        court_registry: CourtRegistry = COURT_REGISTRY,
+    ):
         self.target_date = self._parse_target_date(target_date)
         self.for_indoors = for_indoors
+        self.court_registry = court_registry
 
-        if for_indoors:
-            self.court_stc_id_to_internal_id = INDOOR_COURT_STC_ID_TO_INTERNAL_ID
-        else:
-            self.court_stc_id_to_internal_id = COURT_STC_ID_TO_INTERNAL_ID
-
-        raw_bookings = self._fetch_all_bookings()
         self.court_bookings = self._parse_court_bookings(raw_bookings)
         self.court_availabilities = self.convert_bookings_to_availabilities(
             self.court_bookings
         )
 
+    @classmethod
+    async def fetch(
+        cls, target_date: date | str, for_indoors: bool, club_id: str | None = None
+    ) -> "CourtBookingFetcher":
+        """
+        Fetch the bookings of `target_date` from eBuSy without blocking the event loop.
+
+        Args:
+            target_date: Date object or string in DD.MM.YYYY format
+            for_indoors: Whether to fetch the indoor courts
+            club_id: ID of the club, None for the default club
+
+        Returns:
+            CourtBookingFetcher holding the parsed bookings and availabilities
+
+        Raises:
+            EbusyUnavailableError: If eBuSy could not be reached
+        """
+        club = get_club_registry().get(club_id)
+        response = await club.fetch_reservations(
+            for_indoors=for_indoors, target_date=cls._parse_target_date(target_date)
+        )
+        return cls(
+            target_date=target_date,
+            for_indoors=for_indoors,
+            raw_bookings=response.data,
+            court_registry=club.court_registry,
+        )
+
     @staticmethod
-    def _parse_target_date(target_date: date | str) -> str:
-        """Validate and parse the target date to the expected format '%m/%d/%Y'."""
-        if isinstance(target_date, date):
-            date_str = target_date.strftime("%m/%d/%Y")
+    def to_date(target_date: date | str) -> date:
+        """Validate the target date and convert it to a date object."""
+        if isinstance(target_date, datetime):
+            return target_date.date()
+        elif isinstance(target_date, date):
+            return target_date
         elif isinstance(target_date, str):
             validate_date(date_str=target_date)
-            date_str = datetime.strptime(target_date, "%d.%m.%Y").strftime("%m/%d/%Y")
+            return datetime.strptime(target_date, "%d.%m.%Y").date()
         else:
             raise ValueError(
                 "`target_date` must be a date object or a string in format DD.MM.YYYY"
             )
-        return date_str
-
-    def _get_base_url(self) -> str:
-        if self.for_indoors:
-            return f"{EBUSY_STC_MUNICH_BASE_URL}/court-module/1736"
-        else:
-            return f"{EBUSY_STC_MUNICH_BASE_URL}/lite-module/891"
-
-    def _fetch_all_bookings(self) -> dict:
-        """
-        Fetch court bookings for a specific target date.
 
-        Returns:
-            Raw JSON data from the booking system
-        """
-        url = f"{self._get_base_url()}?timestamp=&currentDate={self.target_date}"
+    @classmethod
+    def _parse_target_date(cls, target_date: date | str) -> str:
+        """Validate and parse the target date to the expected format '%m/%d/%Y'."""
+        return cls.to_date(target_date).strftime("%m/%d/%Y")
 
-        session = requests.Session()
-        session.headers.update(
-            {
-                "Accept": "application/json",
-            }
-        )
-        try:
-            response = session.get(url)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            print(f"Error fetching availability: {e}")
-            return {}
-        try:
-            data = response.json()
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON response: {e}")
-            return {}
-        return data
+    @staticmethod
+    def get_module_path(for_indoors: bool) -> str:
+        """Path of the eBuSy module holding the indoor or outdoor courts of the STC."""
+        if for_indoors:
+            return STC_INDOOR_MODULE_PATH
+        else:
+            return STC_OUTDOOR_MODULE_PATH
 
     def _parse_court_bookings(self, data: dict[str, list[dict]]) -> list[CourtBooking]:
         """
-        Parse booking data and return a dictionary with STC court IDs as keys
-        and lists of booking time slots as values.
+        Parse booking data and return the bookings of all courts.
 
         Args:
             data (dict): The JSON data containing reservations
@@ -97,57 +110,12 @@ class CourtBookingFetcher:
         Returns:
             list[CourtBooking]: List of court bookings
         """
-        court_bookings = []
-
-        reservations = data.get("reservations", [])
-        for reservation in reservations:
-            booking = self._parse_reservation_booking(reservation)
-            court_bookings.append(booking)
-        return court_bookings
-
-    def _convert_court_stc_id_to_name(self, stc_id: int) -> str:
-        """
-        Converts STC court IDs to internal ID and the resp. court's name.
-        """
-        court_stc_id_to_name_map = {
-            stc_id: COURT_INTERNAL_ID_TO_NAME[internal_id]
-            for stc_id, internal_id in self.court_stc_id_to_internal_id.items()
-        }
-        return court_stc_id_to_name_map[stc_id]
-
-    def _parse_reservation_booking(self, reservation: dict) -> CourtBooking | None:
-        """From a reservation entry, parse and return a CourtBooking object."""
-        booking_dict = {}
-
-        court_id = reservation.get("court")
-        if not court_id:
-            raise ValueError(
-                f"Missing court ID in reservation data: {repr(reservation)}"
+        with RESERVATION_PARSE_SECONDS.time():
+            return parse_reservations(
+                data.get("reservations", []),
+                stc_id_to_name=self.court_registry.stc_id_to_name(self.for_indoors),
             )
 
-        reservation_date = datetime.strptime(reservation.get("date"), "%m/%d/%Y").date()
-        if not reservation_date:
-            raise ValueError(f"Missing date in reservation data: {repr(reservation)}")
-        try:
-            from_time = datetime.strptime(reservation.get("fromTime"), "%H:%M").time()
-            start_time = datetime.combine(reservation_date, from_time)
-        except (ValueError, TypeError):
-            raise ValueError(
-                f"Invalid date format in reservation data! Got '{reservation.get('fromTime')}'"
-            )
-        try:
-            to_time = datetime.strptime(reservation.get("toTime"), "%H:%M").time()
-            end_time = datetime.combine(reservation_date, to_time)
-        except (ValueError, TypeError):
-            raise ValueError(
-                f"Invalid date format in reservation data! Got '{reservation.get('toTime')}'"
-            )
-        booking_dict["court_name"] = self._convert_court_stc_id_to_name(court_id)
-        booking_dict["start_time"] = start_time
-        booking_dict["end_time"] = end_time
-
-        return CourtBooking(**booking_dict)
-
     def get_court_bookings(self) -> list[CourtBooking]:
         return self.court_bookings.copy()
 
@@ -164,42 +132,22 @@ class CourtBookingFetcher:
             bookings: List of CourtBooking objects
 
         Returns:
-            Dictionary with court names as keys and hour->availability mapping as values
-            True means available, False means booked
+            List of CourtAvailability objects, sorted by court name, mapping each bookable
+            hour to its availability. True means available, False means booked
         """
-        all_court_availabilities = []
-
-        all_court_names = set(get_all_court_names(for_indoors=self.for_indoors))
-        for court_name in sorted(all_court_names):
-            print(f"Processing court: {court_name}")
-            bookable_hours = {hour: True for hour in range(7, 22)}
-            court_bookings = [b for b in bookings if b.court_name == court_name]
-            for booking in court_bookings:
-                # print(f"  Booking from {booking.start_time} to {booking.end_time}")
-                current_time = booking.start_time
-                while current_time < booking.end_time:
-                    current_hour = current_time.hour
-
-                    hour_start = current_time
-                    hour_end = current_time + timedelta(hours=1)
-                    if not (
-                        booking.end_time <= hour_start or booking.start_time >= hour_end
-                    ):
-                        # print(f"    Marking hour {current_hour} as booked")
-                        bookable_hours[current_hour] = False
-
-                    current_time += timedelta(hours=1)
-            court_availability = CourtAvailability(
-                court_name=court_name, availability=bookable_hours
+        with AVAILABILITY_CONVERSION_SECONDS.time():
+            availability_grid = AvailabilityGrid(
+                court_names=self.court_registry.court_names(self.for_indoors),
+                bookings=bookings,
             )
-            all_court_availabilities.append(court_availability)
-
-        return all_court_availabilities
+            return availability_grid.to_court_availabilities()
 
 
 # Global instance for easy access
 if __name__ == "__main__":
-    stc_client = CourtBookingFetcher(target_date=date.today(), for_indoors=False)
+    stc_client = asyncio.run(
+        CourtBookingFetcher.fetch(target_date=date.today(), for_indoors=False)
+    )
     bookings = stc_client.get_court_bookings()
     avails = stc_client.get_court_availabilities()
     print(bookings)
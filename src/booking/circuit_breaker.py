@@ -0,0 +1,77 @@
+"""
+Circuit breaker for requests to an unhealthy upstream.
+
+After `failure_threshold` consecutive failures the breaker opens and requests fail
+immediately instead of waiting for timeouts. Once `reset_timeout_seconds` have passed a
+single trial request is let through (half-open): its success closes the breaker, its
+failure opens it again.
+"""
+
+import time
+
+CIRCUIT_CLOSED: str = "closed"
+CIRCUIT_OPEN: str = "open"
+CIRCUIT_HALF_OPEN: str = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker, see module docstring."""
+
+    def __init__(self, failure_threshold: int, reset_timeout_seconds: float):
+        if failure_threshold < 1:
+            raise ValueError(
+                f"`failure_threshold` must be at least 1, got: {failure_threshold}"
+            )
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.consecutive_failures: int = 0
+        self.opened_at: float | None = None
+        self._trial_running: bool = False
+        self.rejected: int = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CIRCUIT_CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout_seconds:
+            return CIRCUIT_HALF_OPEN
+        return CIRCUIT_OPEN
+
+    def before_request(self) -> None:
+        """
+        Check whether a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or its trial request is running
+        """
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return
+        if state == CIRCUIT_HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return
+        self.rejected += 1
+        retry_in = self.reset_timeout_seconds - (time.monotonic() - self.opened_at)
+        raise CircuitOpenError(
+            f"Circuit open after {self.consecutive_failures} failures, "
+            f"retrying in {max(retry_in, 0.0):.0f} s"
+        )
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._trial_running or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+    def abort(self) -> None:
+        """Forget a request that ended without outcome, e.g. because it was cancelled."""
+        self._trial_running = False
@@ -0,0 +1,203 @@
+"""
+Registry of the clubs served by the assistant.
+
+Every club gets its own court registry, its own pool of connections to its eBuSy
+instance and a limit of concurrent requests, so a slow or overloaded club can not
+starve the others. Looking up a club is a dict access, so adding clubs does not slow
+down queries for a single club.
+"""
+
+import asyncio
+import os
+from types import MappingProxyType
+from typing import Iterator, Mapping
+
+from src.booking.ebusy_client import (
+    EbusyClient,
+    ReservationsResponse,
+    get_ebusy_client,
+)
+from src.constants import ENV_VAR_NAME_CLUBS_CONFIG_PATH
+from src.data.clubs import (
+    ClubConfig,
+    ClubsConfig,
+    default_club_config,
+    load_clubs_config,
+)
+from src.data.court_registry import CourtRegistry
+from src.data.courts import COURT_REGISTRY
+
+
+class Club:
+    """A configured club with its court registry, eBuSy client and fetch limit."""
+
+    def __init__(
+        self,
+        config: ClubConfig,
+        court_registry: CourtRegistry | None = None,
+        ebusy_client: EbusyClient | None = None,
+    ):
+        """
+        Args:
+            config: Configuration of the club
+            court_registry: Prebuilt registry of the courts, built from `config` if None
+            ebusy_client: Shared eBuSy client, a client owned by the club is created on
+                first use if None
+        """
+        self.config = config
+        self.club_id = config.club_id
+        self.name = config.name
+        if court_registry is None:
+            outdoor_module = config.module(for_indoors=False)
+            indoor_module = config.module(for_indoors=True)
+            court_registry = CourtRegistry(
+                courts=config.courts,
+                court_stc_id_to_internal_id=(
+                    outdoor_module.court_ids if outdoor_module else {}
+                ),
+                indoor_court_stc_id_to_internal_id=(
+                    indoor_module.court_ids if indoor_module else {}
+                ),
+            )
+        self.court_registry = court_registry
+        self._ebusy_client = ebusy_client
+        self._owns_ebusy_client = ebusy_client is None
+        self._fetch_slots = asyncio.Semaphore(config.max_concurrent_fetches)
+
+    @property
+    def ebusy_client(self) -> EbusyClient:
+        if self._ebusy_client is None:
+            self._ebusy_client = EbusyClient(
+                base_url=self.config.base_url,
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_connections,
+            )
+        return self._ebusy_client
+
+    def has_module(self, for_indoors: bool) -> bool:
+        return self.config.module(for_indoors) is not None
+
+    def module_path(self, for_indoors: bool) -> str:
+        """
+        Path of the indoor or outdoor booking module.
+
+        Raises:
+            ValueError: If the club has no such module
+        """
+        module = self.config.module(for_indoors)
+        if module is None:
+            raise ValueError(
+                f"{self.name} has no {'indoor' if for_indoors else 'outdoor'} courts"
+            )
+        return module.path
+
+    async def fetch_reservations(
+        self, for_indoors: bool, target_date: str
+    ) -> ReservationsResponse:
+        """
+        Fetch the raw reservations of a module, waiting while the club's limit of
+        concurrent requests is reached.
+
+        Args:
+            for_indoors: Whether to fetch the indoor module
+            target_date: Date in the eBuSy format MM/DD/YYYY
+
+        Returns:
+            ReservationsResponse with the raw JSON data from the booking system
+
+        Raises:
+            EbusyUnavailableError: If eBuSy could not be reached
+        """
+        module_path = self.module_path(for_indoors)
+        async with self._fetch_slots:
+            return await self.ebusy_client.fetch_reservations(
+                module_path=module_path, target_date=target_date
+            )
+
+    async def aclose(self) -> None:
+        """Close the eBuSy client if it is owned by the club."""
+        if self._owns_ebusy_client and self._ebusy_client is not None:
+            await self._ebusy_client.aclose()
+            self._ebusy_client = None
+
+
+class ClubRegistry:
+    """All configured clubs, indexed by ID and by lowercase name."""
+
+    def __init__(self, clubs: list[Club], default_club_id: str):
+        self.by_id: Mapping[str, Club] = MappingProxyType(
+            {club.club_id: club for club in clubs}
+        )
+        self.by_name: Mapping[str, Club] = MappingProxyType(
+            {club.name.lower(): club for club in clubs}
+        )
+        if default_club_id not in self.by_id:
+            raise ValueError(f"Default club '{default_club_id}' is not configured")
+        self.default: Club = self.by_id[default_club_id]
+
+    def __iter__(self) -> Iterator[Club]:
+        return iter(self.by_id.values())
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, club_id: str | None = None) -> Club:
+        """
+        The club with ID or name `club_id`, the default club if None.
+
+        Raises:
+            ValueError: If no such club is configured
+        """
+        if club_id is None:
+            return self.default
+        club = self.by_id.get(club_id) or self.by_name.get(club_id.lower())
+        if club is None:
+            raise ValueError(
+                f"Unknown club '{club_id}', available: {', '.join(self.by_id)}"
+            )
+        return club
+
+    async def aclose(self) -> None:
+        for club in self:
+            await club.aclose()
+
+
+def create_club_registry(config: ClubsConfig) -> ClubRegistry:
+    """
+    Build the registry of the clubs in `config` and the built-in STC.
+
+    The built-in STC shares the process-wide eBuSy client and court registry, unless
+    `config` defines a club with the same ID.
+    """
+    default_config = default_club_config()
+    clubs = {
+        default_config.club_id: Club(
+            default_config,
+            court_registry=COURT_REGISTRY,
+            ebusy_client=get_ebusy_client(),
+        )
+    }
+    for club_config in config.clubs:
+        clubs[club_config.club_id] = Club(club_config)
+    return ClubRegistry(
+        clubs=list(clubs.values()), default_club_id=config.default_club_id
+    )
+
+
+def create_club_registry_from_env() -> ClubRegistry:
+    """Club registry of the file at CLUBS_CONFIG_PATH, only the STC if not set."""
+    config_path = os.getenv(ENV_VAR_NAME_CLUBS_CONFIG_PATH)
+    if not config_path:
+        return create_club_registry(ClubsConfig())
+    return create_club_registry(load_clubs_config(config_path))
+
+
+_club_registry: ClubRegistry | None = None
+
+
+def get_club_registry() -> ClubRegistry:
+    """Return the process-wide club registry, configured from the environment."""
+    global _club_registry
+    if _club_registry is None:
+        _club_registry = create_club_registry_from_env()
+    return _club_registry
@@ -0,0 +1,192 @@
+"""
+Combined availability of the indoor and outdoor booking modules.
+
+The hall courts are listed in both eBuSy modules, the outdoor one in summer and the
+indoor one in winter. Instead of letting the agent guess which module to ask (and ask
+both in turn in spring and autumn), both are fetched concurrently and merged by internal
+court ID: a slot booked in either module is booked, and every slot is tagged with the
+module it is booked in, or for free slots the module it has to be booked in.
+"""
+
+import asyncio
+from datetime import date
+
+from src.booking.availability_cache import get_availability_snapshot
+from src.booking.booking_fetcher import CourtBookingFetcher
+from src.booking.clubs import Club, get_club_registry
+from src.booking.constants import (
+    AVAILABILITY_SOURCE_HALL,
+    AVAILABILITY_SOURCE_OPEN_AIR,
+    BOOKABLE_HOURS,
+    INDOOR_SEASON_MONTHS,
+    SEASON_OVERLAP_MONTHS,
+    AvailabilitySnapshot,
+    CombinedAvailabilityResponse,
+    CombinedCourtAvailability,
+    CourtAvailability,
+)
+from src.data.court_registry import CourtRegistry
+
+_SOURCES: dict[bool, str] = {
+    True: AVAILABILITY_SOURCE_HALL,
+    False: AVAILABILITY_SOURCE_OPEN_AIR,
+}
+
+
+def is_indoor_season(day: date) -> bool:
+    """Whether the hall courts are in the indoor module on `day` (October to April)."""
+    return day.month in INDOOR_SEASON_MONTHS
+
+
+def is_season_overlap(day: date) -> bool:
+    """Whether both the outdoor courts and the halls are played on `day`."""
+    return day.month in SEASON_OVERLAP_MONTHS
+
+
+def merge_module_snapshots(
+    snapshots: list[AvailabilitySnapshot],
+    court_registry: CourtRegistry,
+    hours: range = BOOKABLE_HOURS,
+) -> CombinedAvailabilityResponse:
+    """
+    Merge the snapshots of the indoor and outdoor module of one day by internal court ID.
+
+    Args:
+        snapshots: Snapshots of the same day, at most one per module
+        court_registry: Registry of the club's courts
+        hours: Hours of the merged schedule
+
+    Returns:
+        CombinedAvailabilityResponse with one entry per court, ordered by court ID
+    """
+    preferred_module = bool(snapshots) and is_indoor_season(snapshots[0].target_date)
+    by_court_id: dict[int, dict[bool, CourtAvailability]] = {}
+    for snapshot in snapshots:
+        for court_availability in snapshot.court_availabilities:
+            court = court_registry.by_name[court_availability.court_name]
+            by_court_id.setdefault(court.id, {})[
+                snapshot.for_indoors
+            ] = court_availability
+
+    court_availabilities = []
+    for court_id in sorted(by_court_id):
+        modules = by_court_id[court_id]
+        free_module = (
+            preferred_module if preferred_module in modules else next(iter(modules))
+        )
+        availability, source = {}, {}
+        for hour in hours:
+            booked_in = [
+                for_indoors
+                for for_indoors, court_availability in modules.items()
+                if not court_availability.is_available(hour)
+            ]
+            availability[hour] = not booked_in
+            source[hour] = _SOURCES[booked_in[0] if booked_in else free_module]
+        court_availabilities.append(
+            CombinedCourtAvailability(
+                court_name=court_registry.by_id[court_id].name,
+                availability=availability,
+                source=source,
+            )
+        )
+
+    return CombinedAvailabilityResponse(
+        snapshot_age_seconds=int(
+            max((snapshot.age_seconds() for snapshot in snapshots), default=0)
+        ),
+        is_stale=any(snapshot.is_stale for snapshot in snapshots),
+        court_availabilities=court_availabilities,
+    )
+
+
+def combine_module_snapshots(
+    snapshots: list[AvailabilitySnapshot], court_registry: CourtRegistry
+) -> AvailabilitySnapshot:
+    """
+    Combine the snapshots of the indoor and outdoor module of one day into one snapshot.
+
+    The combined snapshot holds the bookings of both modules, so the slot search on it
+    only finds slots of the hall courts that are free in both modules.
+
+    Args:
+        snapshots: Snapshots of the same day, at least one and at most one per module
+        court_registry: Registry of the club's courts
+
+    Returns:
+        AvailabilitySnapshot of the module the free slots are booked in on that day
+    """
+    merged = merge_module_snapshots(snapshots, court_registry)
+    return AvailabilitySnapshot(
+        target_date=snapshots[0].target_date,
+        for_indoors=is_indoor_season(snapshots[0].target_date),
+        fetched_at=min(snapshot.fetched_at for snapshot in snapshots),
+        court_bookings=[
+            booking for snapshot in snapshots for booking in snapshot.court_bookings
+        ],
+        court_availabilities=[
+            CourtAvailability(
+                court_name=court_availability.court_name,
+                availability=court_availability.availability,
+            )
+            for court_availability in merged.court_availabilities
+        ],
+        is_stale=merged.is_stale,
+    )
+
+
+async def _get_module_snapshots(day: date, club: Club) -> list[AvailabilitySnapshot]:
+    """Snapshots of all modules of `club` on `day`, fetched concurrently."""
+    snapshots = await asyncio.gather(
+        *(
+            get_availability_snapshot(
+                target_date=day, for_indoors=for_indoors, club_id=club.club_id
+            )
+            for for_indoors in (False, True)
+            if club.has_module(for_indoors)
+        )
+    )
+    return list(snapshots)
+
+
+async def get_combined_snapshot(
+    target_date: date | str, club_id: str | None = None
+) -> AvailabilitySnapshot:
+    """
+    Get the bookings of all indoor and outdoor courts on `target_date` as one snapshot.
+
+    Args:
+        target_date: Date object or string in DD.MM.YYYY format
+        club_id: ID of the club, None for the default club
+
+    Returns:
+        AvailabilitySnapshot combining both modules, see `combine_module_snapshots`
+    """
+    day = CourtBookingFetcher.to_date(target_date)
+    club = get_club_registry().get(club_id)
+    return combine_module_snapshots(
+        await _get_module_snapshots(day, club), club.court_registry
+    )
+
+
+async def get_combined_availability(
+    target_date: date | str, club_id: str | None = None
+) -> CombinedAvailabilityResponse:
+    """
+    Get the merged availability of all indoor and outdoor courts on `target_date`.
+
+    Both modules are fetched concurrently through the availability cache, so this takes
+    about as long as fetching a single one.
+
+    Args:
+        target_date: Date object or string in DD.MM.YYYY format
+        club_id: ID of the club, None for the default club
+
+    Returns:
+        CombinedAvailabilityResponse of the requested day
+    """
+    day = CourtBookingFetcher.to_date(target_date)
+    club = get_club_registry().get(club_id)
+    return merge_module_snapshots(
+        await _get_module_snapshots(day, club), club.court_registry
+    )
@@ -1,5 +1,5 @@
-from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from datetime import date, datetime, time
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 INDOOR_COURT_STC_ID_TO_INTERNAL_ID = {
     3261: 8,
@@ -66,6 +66,75 @@ COURT_NAME_TO_INTERNAL_ID: dict = {
     name: id for id, name in COURT_INTERNAL_ID_TO_NAME.items()
 }
 
+# Start hours of the bookable one hour slots (07:00 - 22:00)
+BOOKABLE_HOURS: range = range(7, 22)
+
+# Opening hours and start time granularity of the minute resolution interval index
+DEFAULT_OPENING_TIME: time = time(7, 0)
+DEFAULT_CLOSING_TIME: time = time(22, 0)
+SUPPORTED_SLOT_MINUTES: tuple[int, ...] = (30, 60)
+DEFAULT_SLOT_MINUTES: int = 60
+
+# Background prefetching of the upcoming days. The first `PREFETCH_NEAR_DAYS` days
+# (today, tomorrow) are refreshed more often than the rest of the window
+DEFAULT_PREFETCH_DAYS: int = 7
+PREFETCH_NEAR_DAYS: int = 2
+PREFETCH_NEAR_REFRESH_SECONDS: float = 45.0
+PREFETCH_FAR_REFRESH_SECONDS: float = 300.0
+PREFETCH_TICK_SECONDS: float = 5.0
+
+# SQLite file recording all fetched snapshots, used for warm starts and analytics
+DEFAULT_SNAPSHOT_STORE_PATH: str = ".data/snapshots.sqlite"
+
+# Output formats of the availability tool: pydantic models or one compact line per court
+AVAILABILITY_OUTPUT_FORMAT_MODEL: str = "model"
+AVAILABILITY_OUTPUT_FORMAT_COMPACT: str = "compact"
+DEFAULT_AVAILABILITY_OUTPUT_FORMAT: str = AVAILABILITY_OUTPUT_FORMAT_MODEL
+
+# Source tags of the combined indoor and outdoor availability: the module a slot is
+# booked in, or has to be booked in if it is free
+AVAILABILITY_SOURCE_HALL: str = "hall"
+AVAILABILITY_SOURCE_OPEN_AIR: str = "open-air"
+# Months in which the hall courts are booked in the indoor module (October to April)
+INDOOR_SEASON_MONTHS: frozenset[int] = frozenset((10, 11, 12, 1, 2, 3, 4))
+# Months in which both the outdoor courts and the halls are played (April and October)
+SEASON_OVERLAP_MONTHS: frozenset[int] = frozenset((4, 10))
+
+# Maximum number of free slots returned by the slot search
+DEFAULT_MAX_SLOT_RESULTS: int = 10
+
+# Connection settings for the eBuSy booking system
+EBUSY_CONNECT_TIMEOUT_SECONDS: float = 3.0
+EBUSY_READ_TIMEOUT_SECONDS: float = 10.0
+EBUSY_MAX_CONNECTIONS: int = 10
+EBUSY_MAX_KEEPALIVE_CONNECTIONS: int = 5
+# Upper bound of a whole request including connecting and waiting for a free connection
+EBUSY_TOTAL_TIMEOUT_SECONDS: float = 6.0
+# Consecutive failures after which requests fail fast, and seconds until the next trial
+EBUSY_CIRCUIT_FAILURE_THRESHOLD: int = 3
+EBUSY_CIRCUIT_RESET_SECONDS: float = 30.0
+# Number of URLs whose validators and payload are kept for conditional requests
+EBUSY_MAX_VALIDATOR_ENTRIES: int = 256
+# Number of last successfully fetched snapshots kept to be served while eBuSy is down
+MAX_LAST_GOOD_SNAPSHOTS: int = 256
+
+# The club served when no club is given, its booking modules on eBuSy
+DEFAULT_CLUB_ID: str = "stc"
+DEFAULT_CLUB_NAME: str = "Sport- und Tennis-Club München Süd"
+STC_OUTDOOR_MODULE_PATH: str = "/lite-module/891"
+STC_INDOOR_MODULE_PATH: str = "/court-module/1736"
+# Maximum number of concurrent eBuSy requests per club
+EBUSY_MAX_CONCURRENT_FETCHES: int = EBUSY_MAX_CONNECTIONS
+
+# Limits for fetching the availability of several consecutive days
+MAX_AVAILABILITY_RANGE_DAYS: int = 14
+MAX_CONCURRENT_DAY_FETCHES: int = 4
+
+# Seconds after which a cached availability snapshot is refreshed in the background
+DEFAULT_AVAILABILITY_CACHE_TTL_SECONDS: float = 60.0
+# Maximum number of (date, indoor/outdoor) snapshots kept in memory
+DEFAULT_AVAILABILITY_CACHE_MAX_ENTRIES: int = 64
+
 
 class CourtBooking(BaseModel):
     """Represents a single booking / reservation of a court."""
@@ -93,3 +162,115 @@ class CourtAvailability(BaseModel):
 
     def set_availability(self, hour: int, available: bool):
         self.availability[hour] = available
+
+
+class AvailabilitySnapshot(BaseModel):
+    """All bookings and derived availabilities of one day, as fetched at `fetched_at`."""
+
+    target_date: date = Field(description="The day the bookings belong to")
+    for_indoors: bool = Field(description="Whether the indoor courts were fetched")
+    fetched_at: datetime = Field(description="When the bookings were fetched")
+    court_bookings: list[CourtBooking] = Field(description="All bookings of the day")
+    court_availabilities: list[CourtAvailability] = Field(
+        description="Availability of every court on that day"
+    )
+    is_stale: bool = Field(
+        default=False,
+        description="True if eBuSy is unavailable and these are the last fetched bookings",
+    )
+    # slot_minutes -> interval index per court, see `snapshot_interval_indexes`
+    _interval_indexes: dict = PrivateAttr(default_factory=dict)
+
+    def age_seconds(self, now: datetime | None = None) -> float:
+        """Seconds elapsed since the snapshot was fetched."""
+        now = now or datetime.now()
+        return (now - self.fetched_at).total_seconds()
+
+
+class CourtAvailabilityResponse(BaseModel):
+    """Court availabilities as returned to the agent, including the age of the data."""
+
+    snapshot_age_seconds: int = Field(
+        description="How many seconds ago the availabilities were fetched from the booking system"
+    )
+    is_stale: bool = Field(
+        default=False,
+        description="True if the booking system is unavailable and the availabilities may be outdated",
+    )
+    court_availabilities: list[CourtAvailability] = Field(
+        description="Availability of every court on the requested day"
+    )
+
+
+class CombinedCourtAvailability(BaseModel):
+    """Schedule of a single court over the indoor and outdoor booking modules."""
+
+    court_name: str = Field(..., description="Name of the court")
+    availability: dict[int, bool] = Field(description="Hour to availability mapping")
+    source: dict[int, str] = Field(
+        description="Hour to the module the slot is booked in or bookable in, "
+        "'hall' or 'open-air'"
+    )
+
+
+class CombinedAvailabilityResponse(BaseModel):
+    """Availabilities of all indoor and outdoor courts on one day."""
+
+    snapshot_age_seconds: int = Field(
+        description="How many seconds ago the older of both modules was fetched from the booking system"
+    )
+    is_stale: bool = Field(
+        default=False,
+        description="True if the booking system is unavailable and the availabilities may be outdated",
+    )
+    court_availabilities: list[CombinedCourtAvailability] = Field(
+        description="Availability of every court of both modules on the requested day"
+    )
+
+
+class CourtAvailabilityRange(BaseModel):
+    """Represents the schedule of a single court over several days"""
+
+    court_name: str = Field(..., description="Name of the court")
+    availability: dict[str, dict[int, bool]] = Field(
+        description="Date (DD.MM.YYYY) to hour to availability mapping"
+    )
+
+
+class CourtAvailabilityRangeResponse(BaseModel):
+    """Court availabilities over several days as returned to the agent."""
+
+    snapshot_age_seconds: int = Field(
+        description="How many seconds ago the oldest of the days was fetched from the booking system"
+    )
+    is_stale: bool = Field(
+        default=False,
+        description="True if the booking system is unavailable and some days may be outdated",
+    )
+    court_availabilities: list[CourtAvailabilityRange] = Field(
+        description="Availability of every court on every requested day"
+    )
+
+
+class SlotCandidate(BaseModel):
+    """A free time window on a single court."""
+
+    court_name: str = Field(description="Name of the court")
+    start_time: str = Field(description="Start of the free window (HH:MM)")
+    end_time: str = Field(description="End of the free window (HH:MM)")
+    club_name: str | None = Field(
+        default=None, description="Name of the club, set when searching several clubs"
+    )
+
+
+class SlotWatch(BaseModel):
+    """A request to be notified once a court becomes free in a time range."""
+
+    watch_id: str = Field(description="Unique identifier of the watch")
+    target_date: date = Field(description="The day to watch")
+    for_indoors: bool = Field(description="Whether an indoor court is watched")
+    from_hour: int = Field(description="First watched start hour")
+    to_hour: int = Field(description="End hour of the watched range (exclusive)")
+    court_name: str | None = Field(
+        default=None, description="The watched court, None for any court"
+    )
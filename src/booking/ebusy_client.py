@@ -0,0 +1,212 @@
+"""
+Async HTTP client for the eBuSy booking system.
+
+A single `httpx.AsyncClient` is shared by the whole process, so all chat sessions reuse
+the same pool of keep-alive connections instead of opening a new one per request.
+
+Requests are conditional: the ETag and Last-Modified validators of the previous response
+of a URL are sent along, and a 304 answer returns the previous data without download.
+Servers without validators still send the full body, its hash tells the caller whether
+the reservations changed, so unchanged payloads are neither decoded nor parsed again.
+
+Failed requests raise `EbusyUnavailableError` and feed a circuit breaker, which fails
+fast while eBuSy is unhealthy, and every request is capped by a total timeout.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import httpx
+
+from src.booking.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.booking.constants import (
+    EBUSY_CIRCUIT_FAILURE_THRESHOLD,
+    EBUSY_CIRCUIT_RESET_SECONDS,
+    EBUSY_CONNECT_TIMEOUT_SECONDS,
+    EBUSY_MAX_CONNECTIONS,
+    EBUSY_MAX_KEEPALIVE_CONNECTIONS,
+    EBUSY_MAX_VALIDATOR_ENTRIES,
+    EBUSY_READ_TIMEOUT_SECONDS,
+    EBUSY_TOTAL_TIMEOUT_SECONDS,
+)
+from src.constants import ENV_VAR_NAME_EBUSY_BASE_URL
+from src.utils.metrics import (
+    EBUSY_JSON_PARSE_SECONDS,
+    EBUSY_REQUEST_SECONDS,
+    EBUSY_UNCHANGED_RESPONSES,
+)
+
+EBUSY_STC_MUNICH_BASE_URL: str = "https://siemens-tennisclub-muenchenv8.ebusy.de"
+
+
+class EbusyUnavailableError(Exception):
+    """Raised if eBuSy could not be reached or answered with an error."""
+
+
+class ReservationsResponse(NamedTuple):
+    """Reservations of a module on a day and the version of the payload."""
+
+    data: dict
+    # Hash of the response body, equal versions hold equal reservations
+    version: str
+    # True if eBuSy answered 304 Not Modified
+    not_modified: bool = False
+
+
+class _CachedResponse(NamedTuple):
+    etag: str | None
+    last_modified: str | None
+    response: ReservationsResponse
+
+
+class EbusyClient:
+    """Fetches raw reservation data from an eBuSy instance over pooled connections."""
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = EBUSY_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = EBUSY_READ_TIMEOUT_SECONDS,
+        total_timeout: float = EBUSY_TOTAL_TIMEOUT_SECONDS,
+        max_connections: int = EBUSY_MAX_CONNECTIONS,
+        max_keepalive_connections: int = EBUSY_MAX_KEEPALIVE_CONNECTIONS,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        self.base_url = base_url
+        self.total_timeout = total_timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=EBUSY_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout_seconds=EBUSY_CIRCUIT_RESET_SECONDS,
+        )
+        # Validators and payload of the latest response per URL
+        self._cached_responses: OrderedDict[str, _CachedResponse] = OrderedDict()
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Accept": "application/json"},
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+    async def fetch_reservations(
+        self, module_path: str, target_date: str
+    ) -> ReservationsResponse:
+        """
+        Fetch all reservations of a booking module on a specific date.
+
+        Args:
+            module_path: Path of the eBuSy module, e.g. '/lite-module/891'
+            target_date: Date in the eBuSy format MM/DD/YYYY
+
+        Returns:
+            ReservationsResponse with the raw JSON data from the booking system
+
+        Raises:
+            EbusyUnavailableError: If the request failed, timed out or the circuit is
+                open
+        """
+        url = f"{module_path}?timestamp=&currentDate={target_date}"
+        try:
+            self.circuit_breaker.before_request()
+        except CircuitOpenError as e:
+            EBUSY_REQUEST_SECONDS.observe(0.0, module=module_path, outcome="rejected")
+            raise EbusyUnavailableError(str(e)) from e
+
+        try:
+            return await self._fetch_admitted(url, module_path)
+        except BaseException:
+            # Release a half-open trial on any error without outcome, e.g. cancellation,
+            # otherwise the circuit rejects every later request and never recovers
+            self.circuit_breaker.abort()
+            raise
+
+    async def _fetch_admitted(self, url: str, module_path: str) -> ReservationsResponse:
+        """Send a request admitted by the circuit breaker and record its outcome."""
+        cached = self._cached_responses.get(url)
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.total_timeout):
+                http_response = await self._client.get(url, headers=headers)
+            if http_response.status_code != 304:
+                http_response.raise_for_status()
+        except (httpx.HTTPError, TimeoutError) as e:
+            self.circuit_breaker.record_failure()
+            EBUSY_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, module=module_path, outcome="error"
+            )
+            raise EbusyUnavailableError(
+                f"Error fetching availability: {type(e).__name__}: {e}"
+            ) from e
+
+        if http_response.status_code == 304 and cached is not None:
+            self.circuit_breaker.record_success()
+            EBUSY_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, module=module_path, outcome="not_modified"
+            )
+            EBUSY_UNCHANGED_RESPONSES.inc(validator="not_modified")
+            self._cached_responses.move_to_end(url)
+            return cached.response._replace(not_modified=True)
+
+        version = hashlib.blake2b(http_response.content, digest_size=16).hexdigest()
+        if cached is not None and cached.response.version == version:
+            EBUSY_UNCHANGED_RESPONSES.inc(validator="body_hash")
+            response = cached.response._replace(not_modified=False)
+        else:
+            try:
+                with EBUSY_JSON_PARSE_SECONDS.time():
+                    data = http_response.json()
+            except ValueError as e:
+                # Invalid JSON or a body that is not valid UTF-8
+                self.circuit_breaker.record_failure()
+                EBUSY_REQUEST_SECONDS.observe(
+                    time.perf_counter() - start, module=module_path, outcome="error"
+                )
+                raise EbusyUnavailableError(f"Error parsing JSON response: {e}") from e
+            response = ReservationsResponse(data=data, version=version)
+
+        self.circuit_breaker.record_success()
+        EBUSY_REQUEST_SECONDS.observe(
+            time.perf_counter() - start, module=module_path, outcome="ok"
+        )
+        self._cached_responses[url] = _CachedResponse(
+            etag=http_response.headers.get("ETag"),
+            last_modified=http_response.headers.get("Last-Modified"),
+            response=response,
+        )
+        self._cached_responses.move_to_end(url)
+        while len(self._cached_responses) > EBUSY_MAX_VALIDATOR_ENTRIES:
+            self._cached_responses.popitem(last=False)
+        return response
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_ebusy_client: EbusyClient | None = None
+
+
+def get_ebusy_client() -> EbusyClient:
+    """
+    Return the process-wide eBuSy client, creating it on first use.
+
+    The base URL can be overridden with EBUSY_BASE_URL, e.g. to point the assistant to
+    the local stand-in server of the load test.
+    """
+    global _ebusy_client
+    if _ebusy_client is None:
+        _ebusy_client = EbusyClient(
+            base_url=os.getenv(ENV_VAR_NAME_EBUSY_BASE_URL) or EBUSY_STC_MUNICH_BASE_URL
+        )
+    return _ebusy_client
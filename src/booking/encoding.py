@@ -0,0 +1,183 @@
+"""
+Token efficient text encoding of court availabilities.
+
+The pydantic output repeats `court_name`, `availability` and every hour key for every
+court. The compact encoding states the hours once in a header and renders every court as
+a single line of fixed-position flags, e.g.
+
+    snapshot_age_seconds=12 hours=07-21 1=free 0=booked
+    Platz 1: 111111111110011
+
+The combined indoor and outdoor availability uses H (free, hall), O (free, open-air)
+and 0 (booked) as flags.
+
+Court attributes are static, so every court is serialized once into a line of name,
+surface, attribute flags and location, and the encoding of each filter result is cached:
+
+    courts=2 columns=name;surface;flags;location flags: I=indoors in winter ...
+    Platz 10;granulat;I;Eingang rechts, Granulatplätze
+"""
+
+import os
+from weakref import WeakKeyDictionary
+
+from src.booking.constants import (
+    AVAILABILITY_OUTPUT_FORMAT_COMPACT,
+    AVAILABILITY_OUTPUT_FORMAT_MODEL,
+    AVAILABILITY_SOURCE_HALL,
+    BOOKABLE_HOURS,
+    DEFAULT_AVAILABILITY_OUTPUT_FORMAT,
+    CombinedAvailabilityResponse,
+    CourtAvailability,
+    CourtAvailabilityResponse,
+)
+from src.constants import ENV_VAR_NAME_AVAILABILITY_OUTPUT_FORMAT
+from src.data.court_registry import MAX_CACHED_MASKS, CourtRegistry
+
+COURT_ATTRIBUTES_LEGEND: str = (
+    "columns=name;surface;flags;location "
+    "flags: I=indoors in winter M=middle court S=singles only W=Wingfield -=none"
+)
+
+# Court lines and encodings per mask of every registry, released with the registry
+_court_attribute_encodings: WeakKeyDictionary[
+    CourtRegistry, tuple[tuple[str, ...], dict[int, str]]
+] = WeakKeyDictionary()
+
+
+def get_availability_output_format() -> str:
+    """Configured output format of the availability tool, 'model' or 'compact'."""
+    output_format = os.getenv(
+        ENV_VAR_NAME_AVAILABILITY_OUTPUT_FORMAT, DEFAULT_AVAILABILITY_OUTPUT_FORMAT
+    ).lower()
+    if output_format not in (
+        AVAILABILITY_OUTPUT_FORMAT_MODEL,
+        AVAILABILITY_OUTPUT_FORMAT_COMPACT,
+    ):
+        raise ValueError(
+            f"Unknown availability output format, expected "
+            f"'{AVAILABILITY_OUTPUT_FORMAT_MODEL}' or '{AVAILABILITY_OUTPUT_FORMAT_COMPACT}', "
+            f"got: {output_format}"
+        )
+    return output_format
+
+
+def encode_availabilities_compact(
+    court_availabilities: list[CourtAvailability],
+    snapshot_age_seconds: int,
+    hours: range = BOOKABLE_HOURS,
+    is_stale: bool = False,
+) -> str:
+    """
+    Encode court availabilities as a header plus one line per court.
+
+    Args:
+        court_availabilities: List of CourtAvailability objects
+        snapshot_age_seconds: Age of the underlying data in seconds
+        hours: Hours encoded at the positions of the flag strings
+        is_stale: Whether the data may be outdated because eBuSy is unavailable
+
+    Returns:
+        Text where position i of a court's flags is 1 if hour `hours[i]` is free
+    """
+    lines = [
+        f"snapshot_age_seconds={snapshot_age_seconds} "
+        f"hours={hours.start:02d}-{hours.stop - 1:02d} 1=free 0=booked"
+        + (" stale=1" if is_stale else "")
+    ]
+    for court_availability in court_availabilities:
+        flags = "".join(
+            "1" if court_availability.is_available(hour) else "0" for hour in hours
+        )
+        lines.append(f"{court_availability.court_name}: {flags}")
+    return "\n".join(lines)
+
+
+def encode_availability_response(
+    response: CourtAvailabilityResponse, output_format: str
+) -> CourtAvailabilityResponse | str:
+    """Return `response` in the requested output format."""
+    if output_format == AVAILABILITY_OUTPUT_FORMAT_COMPACT:
+        return encode_availabilities_compact(
+            response.court_availabilities,
+            response.snapshot_age_seconds,
+            is_stale=response.is_stale,
+        )
+    return response
+
+
+def encode_combined_availability_response(
+    response: CombinedAvailabilityResponse,
+    output_format: str,
+    hours: range = BOOKABLE_HOURS,
+) -> CombinedAvailabilityResponse | str:
+    """Return the combined `response` in the requested output format."""
+    if output_format != AVAILABILITY_OUTPUT_FORMAT_COMPACT:
+        return response
+    lines = [
+        f"snapshot_age_seconds={response.snapshot_age_seconds} "
+        f"hours={hours.start:02d}-{hours.stop - 1:02d} "
+        "H=free hall O=free open-air 0=booked"
+        + (" stale=1" if response.is_stale else "")
+    ]
+    for court_availability in response.court_availabilities:
+        flags = "".join(
+            (
+                "0"
+                if not court_availability.availability.get(hour, False)
+                else (
+                    "H"
+                    if court_availability.source.get(hour) == AVAILABILITY_SOURCE_HALL
+                    else "O"
+                )
+            )
+            for hour in hours
+        )
+        lines.append(f"{court_availability.court_name}: {flags}")
+    return "\n".join(lines)
+
+
+def _court_attribute_lines(court_registry: CourtRegistry) -> tuple[str, ...]:
+    """One compact line per court of `court_registry`, ordered by ID like its bitmasks."""
+    lines = []
+    for court in court_registry.courts:
+        flags = "".join(
+            flag
+            for flag, is_set in (
+                ("I", court.is_indoors),
+                ("M", court.is_middle_court),
+                ("S", court.is_singles_only),
+                ("W", court.is_wingfield),
+            )
+            if is_set
+        )
+        lines.append(f"{court.name};{court.court_type};{flags or '-'};{court.location}")
+    return tuple(lines)
+
+
+def encode_court_attributes(court_registry: CourtRegistry, mask: int) -> str:
+    """
+    Encode the attributes of the courts in `mask` as a header plus one line per court.
+
+    Args:
+        court_registry: Registry of the club's courts
+        mask: Bitmask of the courts to encode, see `CourtRegistry.mask`
+
+    Returns:
+        Compact text encoding, cached per registry and mask
+    """
+    if court_registry not in _court_attribute_encodings:
+        _court_attribute_encodings[court_registry] = (
+            _court_attribute_lines(court_registry),
+            {},
+        )
+    court_lines, encodings = _court_attribute_encodings[court_registry]
+    encoding = encodings.get(mask)
+    if encoding is None:
+        lines = [
+            line for position, line in enumerate(court_lines) if mask >> position & 1
+        ]
+        encoding = "\n".join([f"courts={len(lines)} {COURT_ATTRIBUTES_LEGEND}", *lines])
+        if len(encodings) < MAX_CACHED_MASKS:
+            encodings[mask] = encoding
+    return encoding
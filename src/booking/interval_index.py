@@ -0,0 +1,209 @@
+"""
+Minute resolution interval index of court bookings.
+
+For every court the bookings of a day are merged into sorted busy intervals, from which
+the free gaps within the opening hours are derived. Times are given in minutes since
+midnight, e.g. 18:30 is 1110. Questions like "is there a free 90 minute window starting
+between 18:00 and 19:30" are answered with a binary search over the free gaps.
+
+The indexes of a cached availability snapshot are built once and kept with the snapshot,
+so repeated queries on the same day do not scan the bookings again.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import time
+from typing import Iterable
+
+from src.booking.availability_engine import MINUTES_PER_DAY, MINUTES_PER_HOUR
+from src.booking.constants import (
+    DEFAULT_CLOSING_TIME,
+    DEFAULT_OPENING_TIME,
+    DEFAULT_SLOT_MINUTES,
+    SUPPORTED_SLOT_MINUTES,
+    AvailabilitySnapshot,
+    CourtBooking,
+)
+
+
+def to_minutes(value: time | str) -> int:
+    """Convert a time object or a 'HH:MM' string to minutes since midnight."""
+    if isinstance(value, str):
+        hours, _, minutes = value.partition(":")
+        return int(hours) * MINUTES_PER_HOUR + int(minutes or 0)
+    return value.hour * MINUTES_PER_HOUR + value.minute
+
+
+def format_minutes(minutes: int) -> str:
+    """Convert minutes since midnight to a 'HH:MM' string."""
+    return f"{minutes // MINUTES_PER_HOUR:02d}:{minutes % MINUTES_PER_HOUR:02d}"
+
+
+def booking_interval(booking: CourtBooking) -> tuple[int, int]:
+    """Busy interval `[start, end)` of `booking` in minutes since midnight of its day."""
+    start = to_minutes(booking.start_time.time())
+    if booking.end_time.date() > booking.start_time.date():
+        end = MINUTES_PER_DAY
+    else:
+        end = to_minutes(booking.end_time.time())
+    return start, end
+
+
+class CourtIntervalIndex:
+    """Free gaps of a single court on a single day, sorted by start."""
+
+    def __init__(
+        self,
+        busy_intervals: Iterable[tuple[int, int]],
+        opening_time: time = DEFAULT_OPENING_TIME,
+        closing_time: time = DEFAULT_CLOSING_TIME,
+        slot_minutes: int = DEFAULT_SLOT_MINUTES,
+    ):
+        if slot_minutes not in SUPPORTED_SLOT_MINUTES:
+            raise ValueError(
+                f"`slot_minutes` must be one of {SUPPORTED_SLOT_MINUTES}, got: {slot_minutes}"
+            )
+        self.opening_minute = to_minutes(opening_time)
+        self.closing_minute = to_minutes(closing_time)
+        self.slot_minutes = slot_minutes
+
+        self._free_starts: list[int] = []
+        self._free_ends: list[int] = []
+        free_from = self.opening_minute
+        for busy_start, busy_end in sorted(busy_intervals):
+            if busy_start > free_from:
+                self._add_free_gap(free_from, min(busy_start, self.closing_minute))
+            free_from = max(free_from, busy_end)
+        self._add_free_gap(free_from, self.closing_minute)
+
+    def _add_free_gap(self, start: int, end: int) -> None:
+        if start < end:
+            self._free_starts.append(start)
+            self._free_ends.append(end)
+
+    @property
+    def free_gaps(self) -> list[tuple[int, int]]:
+        return list(zip(self._free_starts, self._free_ends))
+
+    def _align_to_slot(self, minute: int) -> int:
+        """Round `minute` up to the next slot start counted from the opening time."""
+        offset = max(minute - self.opening_minute, 0)
+        slots = -(-offset // self.slot_minutes)
+        return self.opening_minute + slots * self.slot_minutes
+
+    def is_free(self, start: int, end: int) -> bool:
+        """Whether the court is free during the whole interval `[start, end)`."""
+        gap = bisect_right(self._free_starts, start) - 1
+        return gap >= 0 and self._free_ends[gap] >= end
+
+    def find_free_window(
+        self, duration: int, earliest_start: int, latest_start: int
+    ) -> int | None:
+        """
+        Find the first free window of `duration` minutes starting in the given range.
+
+        Only starts on the slot grid are considered. Runs in O(log n + k) for n free gaps
+        and k gaps overlapping `[earliest_start, latest_start]`.
+
+        Args:
+            duration: Length of the window in minutes
+            earliest_start: Earliest start in minutes since midnight
+            latest_start: Latest start in minutes since midnight
+
+        Returns:
+            Start of the window in minutes since midnight or None if there is none
+        """
+        gap = max(bisect_right(self._free_starts, earliest_start) - 1, 0)
+        while gap < len(self._free_starts) and self._free_starts[gap] <= latest_start:
+            start = self._align_to_slot(max(self._free_starts[gap], earliest_start))
+            if start <= latest_start and start + duration <= self._free_ends[gap]:
+                return start
+            gap += 1
+        return None
+
+    def free_windows(
+        self, duration: int, earliest_start: int, latest_start: int
+    ) -> list[int]:
+        """All slot starts in the given range that begin a free window of `duration` minutes."""
+        starts = []
+        gap = max(bisect_right(self._free_starts, earliest_start) - 1, 0)
+        while gap < len(self._free_starts) and self._free_starts[gap] <= latest_start:
+            start = self._align_to_slot(max(self._free_starts[gap], earliest_start))
+            last_start = min(latest_start, self._free_ends[gap] - duration)
+            while start <= last_start:
+                starts.append(start)
+                start += self.slot_minutes
+            gap += 1
+        return starts
+
+    def slot_availability(self) -> dict[str, bool]:
+        """Map every slot start ('HH:MM') of the day to whether the whole slot is free."""
+        return {
+            format_minutes(start): self.is_free(start, start + self.slot_minutes)
+            for start in range(
+                self.opening_minute,
+                self.closing_minute - self.slot_minutes + 1,
+                self.slot_minutes,
+            )
+        }
+
+
+def build_interval_indexes(
+    court_names: Iterable[str],
+    bookings: Iterable[CourtBooking],
+    opening_time: time = DEFAULT_OPENING_TIME,
+    closing_time: time = DEFAULT_CLOSING_TIME,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES,
+) -> dict[str, CourtIntervalIndex]:
+    """
+    Build the interval index of every court from a list of bookings of a single day.
+
+    Args:
+        court_names: Names of all courts, also those without bookings
+        bookings: List of CourtBooking objects
+        opening_time: Start of the first bookable slot
+        closing_time: End of the last bookable slot
+        slot_minutes: Granularity of the start times, 30 or 60 minutes
+
+    Returns:
+        Dictionary with court names as keys and their CourtIntervalIndex as values
+    """
+    busy_intervals: dict[str, list[tuple[int, int]]] = defaultdict(list)
+    for booking in bookings:
+        busy_intervals[booking.court_name].append(booking_interval(booking))
+    return {
+        court_name: CourtIntervalIndex(
+            busy_intervals.get(court_name, []),
+            opening_time=opening_time,
+            closing_time=closing_time,
+            slot_minutes=slot_minutes,
+        )
+        for court_name in sorted(set(court_names))
+    }
+
+
+def snapshot_interval_indexes(
+    snapshot: AvailabilitySnapshot, slot_minutes: int = DEFAULT_SLOT_MINUTES
+) -> dict[str, CourtIntervalIndex]:
+    """
+    Interval indexes of all courts of `snapshot`, built on first use and kept with it.
+
+    Args:
+        snapshot: AvailabilitySnapshot of a single day
+        slot_minutes: Granularity of the start times, 30 or 60 minutes
+
+    Returns:
+        Dictionary with court names as keys and their CourtIntervalIndex as values
+    """
+    interval_indexes = snapshot._interval_indexes.get(slot_minutes)
+    if interval_indexes is None:
+        interval_indexes = build_interval_indexes(
+            court_names=[
+                court_availability.court_name
+                for court_availability in snapshot.court_availabilities
+            ],
+            bookings=snapshot.court_bookings,
+            slot_minutes=slot_minutes,
+        )
+        snapshot._interval_indexes[slot_minutes] = interval_indexes
+    return interval_indexes
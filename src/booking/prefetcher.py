@@ -0,0 +1,138 @@
+"""
+Background prefetcher keeping the availability of the upcoming days warm.
+
+The prefetcher runs as an asyncio task next to the Chainlit app and writes fresh
+snapshots into the process-wide availability cache, so interactive tool calls are
+almost always served from memory. Nearer days are refreshed more often than later ones.
+"""
+
+import asyncio
+import os
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable
+
+from src.booking.availability_cache import (
+    AvailabilityCache,
+    CacheKey,
+    fetch_availability_snapshot,
+    get_availability_cache,
+)
+from src.booking.constants import (
+    DEFAULT_PREFETCH_DAYS,
+    MAX_CONCURRENT_DAY_FETCHES,
+    PREFETCH_FAR_REFRESH_SECONDS,
+    PREFETCH_NEAR_DAYS,
+    PREFETCH_NEAR_REFRESH_SECONDS,
+    PREFETCH_TICK_SECONDS,
+)
+from src.booking.watches import get_watch_registry
+from src.constants import ENV_VAR_NAME_PREFETCH_DAYS, ENV_VAR_NAME_PREFETCH_ENABLED
+
+
+class AvailabilityPrefetcher:
+    """Periodically refreshes the indoor and outdoor snapshots of the next `num_days` days."""
+
+    def __init__(
+        self,
+        cache: AvailabilityCache,
+        num_days: int = DEFAULT_PREFETCH_DAYS,
+        near_days: int = PREFETCH_NEAR_DAYS,
+        near_refresh_seconds: float = PREFETCH_NEAR_REFRESH_SECONDS,
+        far_refresh_seconds: float = PREFETCH_FAR_REFRESH_SECONDS,
+        tick_seconds: float = PREFETCH_TICK_SECONDS,
+        modules: tuple[bool, ...] = (False, True),
+        extra_keys: Callable[[], Iterable[CacheKey]] | None = None,
+    ):
+        self.cache = cache
+        self.num_days = num_days
+        self.near_days = near_days
+        self.near_refresh_seconds = near_refresh_seconds
+        self.far_refresh_seconds = far_refresh_seconds
+        self.tick_seconds = tick_seconds
+        self.modules = modules
+        self.extra_keys = extra_keys
+        self._task: asyncio.Task | None = None
+
+    def refresh_interval(self, day_offset: int) -> float:
+        """Seconds between two refreshes of the day `day_offset` days from today."""
+        if day_offset < self.near_days:
+            return self.near_refresh_seconds
+        return self.far_refresh_seconds
+
+    def due_keys(self, now: datetime | None = None) -> list[tuple[date, bool]]:
+        """
+        All (date, for_indoors) keys whose cached snapshot is missing or too old.
+
+        Besides the upcoming `num_days` days this includes the future keys returned by
+        `extra_keys`, e.g. days with active slot watches.
+        """
+        now = now or datetime.now()
+        today = now.date()
+        keys = {
+            (today + timedelta(days=day_offset), for_indoors)
+            for day_offset in range(self.num_days)
+            for for_indoors in self.modules
+        }
+        if self.extra_keys is not None:
+            keys.update(key for key in self.extra_keys() if key[0] >= today)
+
+        due = []
+        for day, for_indoors in sorted(keys):
+            snapshot = self.cache.peek((day, for_indoors))
+            max_age = self.refresh_interval((day - today).days)
+            if snapshot is None or snapshot.age_seconds(now) >= max_age:
+                due.append((day, for_indoors))
+        return due
+
+    async def refresh_due(self) -> int:
+        """Refresh all due snapshots concurrently and return how many were refreshed."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DAY_FETCHES)
+
+        async def refresh(day: date, for_indoors: bool) -> bool:
+            async with semaphore:
+                try:
+                    snapshot = await fetch_availability_snapshot(
+                        target_date=day, for_indoors=for_indoors
+                    )
+                except Exception as e:
+                    print(f"Error prefetching availability for {day}: {e}")
+                    return False
+            self.cache.put((day, for_indoors), snapshot)
+            return True
+
+        results = await asyncio.gather(
+            *(refresh(day, for_indoors) for day, for_indoors in self.due_keys())
+        )
+        return sum(results)
+
+    async def run(self) -> None:
+        """Refresh due snapshots forever, checking every `tick_seconds`."""
+        while True:
+            await self.refresh_due()
+            await asyncio.sleep(self.tick_seconds)
+
+    def start(self) -> None:
+        """Start the prefetcher as a background task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def create_prefetcher_from_env() -> AvailabilityPrefetcher | None:
+    """Create the prefetcher of the process-wide cache, None if disabled by PREFETCH_ENABLED."""
+    if os.getenv(ENV_VAR_NAME_PREFETCH_ENABLED, "true").lower() in ("0", "false", "no"):
+        return None
+    return AvailabilityPrefetcher(
+        cache=get_availability_cache(),
+        num_days=int(os.getenv(ENV_VAR_NAME_PREFETCH_DAYS, DEFAULT_PREFETCH_DAYS)),
+        extra_keys=get_watch_registry().watched_keys,
+    )
@@ -0,0 +1,69 @@
+"""
+Bulk parser for eBuSy reservations.
+
+A day of reservations contains a single date string and few distinct 'HH:MM' times, so
+every distinct (date, time) pair is parsed once and memoized. The raw reservations are
+checked in a single pass and validated into bookings.
+"""
+
+from datetime import datetime
+from typing import Mapping
+
+from src.booking.constants import CourtBooking
+
+
+class _DateTimeMemo(dict):
+    """Memoizes `datetime.strptime` of eBuSy ('MM/DD/YYYY', 'HH:MM') pairs."""
+
+    def __missing__(self, key: tuple[str, str]) -> datetime:
+        date_str, time_str = key
+        value = datetime.strptime(f"{date_str} {time_str}", "%m/%d/%Y %H:%M")
+        self[key] = value
+        return value
+
+
+def _parse_datetime(memo: _DateTimeMemo, reservation: dict, time_key: str) -> datetime:
+    try:
+        return memo[reservation["date"], reservation[time_key]]
+    except (KeyError, ValueError, TypeError):
+        raise ValueError(
+            f"Invalid date format in reservation data! Got '{reservation.get('date')}' "
+            f"and '{reservation.get(time_key)}'"
+        )
+
+
+def parse_reservations(
+    reservations: list[dict],
+    stc_id_to_name: Mapping[int, str],
+) -> list[CourtBooking]:
+    """
+    Parse raw eBuSy reservations into court bookings.
+
+    Args:
+        reservations: The 'reservations' list of an eBuSy response
+        stc_id_to_name: Mapping of STC court IDs to court names of the booking module
+
+    Returns:
+        list[CourtBooking]: List of court bookings in the order of the reservations
+    """
+    memo = _DateTimeMemo()
+    court_bookings = []
+    for reservation in reservations:
+        court_id = reservation.get("court")
+        if not court_id:
+            raise ValueError(
+                f"Missing court ID in reservation data: {repr(reservation)}"
+            )
+        try:
+            court_name = stc_id_to_name[court_id]
+        except KeyError:
+            raise ValueError(f"Unknown court ID in reservation data: {court_id}")
+        start_time = _parse_datetime(memo, reservation, "fromTime")
+        end_time = _parse_datetime(memo, reservation, "toTime")
+
+        court_bookings.append(
+            CourtBooking(
+                court_name=court_name, start_time=start_time, end_time=end_time
+            )
+        )
+    return court_bookings
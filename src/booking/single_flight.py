@@ -0,0 +1,48 @@
+"""
+Coalescing of concurrent identical requests.
+
+While a call for a key is in flight, further calls for the same key wait for its result
+instead of issuing their own request.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """Runs at most one call per key at a time and shares its result with all waiters."""
+
+    def __init__(self):
+        self._in_flight: dict[K, asyncio.Task] = {}
+        self.issued: int = 0
+        self.coalesced: int = 0
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """
+        Return the result of `func()`, sharing it with concurrent calls for `key`.
+
+        Cancelling a single waiter does not cancel the shared call, exceptions of the call
+        are raised to every waiter.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.issued += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter was cancelled
+            task.exception()
@@ -0,0 +1,225 @@
+"""
+Server-side search for free court slots.
+
+Instead of handing the availability of every court to the agent, the search only
+returns the free (court, start, end) windows matching the user's constraints.
+"""
+
+import asyncio
+from datetime import date
+
+from src.booking.availability_cache import get_availability_snapshot
+from src.booking.clubs import get_club_registry
+from src.booking.constants import (
+    DEFAULT_MAX_SLOT_RESULTS,
+    AvailabilitySnapshot,
+    SlotCandidate,
+)
+from src.booking.interval_index import (
+    format_minutes,
+    snapshot_interval_indexes,
+    to_minutes,
+)
+from src.data.court_registry import CourtRegistry
+from src.data.courts import COURT_REGISTRY, Court
+
+
+def filter_courts(
+    for_indoors: bool,
+    court_type: str | None = None,
+    is_singles_only: bool | None = None,
+    is_middle_court: bool | None = None,
+    is_wingfield: bool | None = None,
+    court_registry: CourtRegistry = COURT_REGISTRY,
+) -> list[Court]:
+    """Courts of the indoor or outdoor module matching all given attributes."""
+    return list(
+        court_registry.filter(
+            for_indoors=for_indoors,
+            court_type=court_type,
+            is_singles_only=is_singles_only,
+            is_middle_court=is_middle_court,
+            is_wingfield=is_wingfield,
+        )
+    )
+
+
+def search_free_slots(
+    snapshot: AvailabilitySnapshot,
+    courts: list[Court],
+    duration_minutes: int,
+    earliest_start: str,
+    latest_start: str,
+    max_results: int = DEFAULT_MAX_SLOT_RESULTS,
+    slot_minutes: int = 30,
+) -> list[SlotCandidate]:
+    """
+    Find free windows on `courts` in an availability snapshot.
+
+    Candidates are ranked by start time, courts with the same start time keep the order
+    of `courts`.
+
+    Args:
+        snapshot: AvailabilitySnapshot of the requested day
+        courts: Courts to consider
+        duration_minutes: Length of the game in minutes
+        earliest_start: Earliest start time (HH:MM)
+        latest_start: Latest start time (HH:MM)
+        max_results: Maximum number of returned candidates
+        slot_minutes: Granularity of the start times, 30 or 60 minutes
+
+    Returns:
+        List of at most `max_results` SlotCandidate objects
+    """
+    if duration_minutes <= 0:
+        raise ValueError(
+            f"`duration_minutes` must be positive, got: {duration_minutes}"
+        )
+    earliest = to_minutes(earliest_start)
+    latest = to_minutes(latest_start)
+
+    interval_indexes = snapshot_interval_indexes(snapshot, slot_minutes=slot_minutes)
+    candidates = []
+    for rank, court in enumerate(courts):
+        for start in interval_indexes[court.name].free_windows(
+            duration_minutes, earliest, latest
+        ):
+            candidates.append((start, rank, court.name))
+    candidates.sort()
+
+    return [
+        SlotCandidate(
+            court_name=court_name,
+            start_time=format_minutes(start),
+            end_time=format_minutes(start + duration_minutes),
+        )
+        for start, _, court_name in candidates[:max_results]
+    ]
+
+
+async def find_free_slots(
+    target_date: date | str,
+    duration_minutes: int,
+    earliest_start: str,
+    latest_start: str,
+    for_indoors: bool,
+    court_type: str | None = None,
+    is_singles_only: bool | None = None,
+    is_middle_court: bool | None = None,
+    is_wingfield: bool | None = None,
+    max_results: int = DEFAULT_MAX_SLOT_RESULTS,
+    club_id: str | None = None,
+) -> list[SlotCandidate]:
+    """
+    Find free slots on `target_date` for courts matching the given attributes.
+
+    Args:
+        target_date: Date object or string in DD.MM.YYYY format
+        duration_minutes: Length of the game in minutes
+        earliest_start: Earliest start time (HH:MM)
+        latest_start: Latest start time (HH:MM)
+        for_indoors: Whether to search the indoor courts
+        court_type: Optional surface, 'sand' or 'granulat'
+        is_singles_only: Optional filter on singles-only courts
+        is_middle_court: Optional filter on middle courts
+        is_wingfield: Optional filter on courts with a Wingfield system
+        max_results: Maximum number of returned candidates
+        club_id: ID of the club, None for the default club
+
+    Returns:
+        List of SlotCandidate objects ranked by start time
+    """
+    club = get_club_registry().get(club_id)
+    courts = filter_courts(
+        for_indoors=for_indoors,
+        court_type=court_type,
+        is_singles_only=is_singles_only,
+        is_middle_court=is_middle_court,
+        is_wingfield=is_wingfield,
+        court_registry=club.court_registry,
+    )
+    snapshot = await get_availability_snapshot(
+        target_date=target_date, for_indoors=for_indoors, club_id=club.club_id
+    )
+    return search_free_slots(
+        snapshot=snapshot,
+        courts=courts,
+        duration_minutes=duration_minutes,
+        earliest_start=earliest_start,
+        latest_start=latest_start,
+        max_results=max_results,
+    )
+
+
+async def find_free_slots_in_clubs(
+    target_date: date | str,
+    duration_minutes: int,
+    earliest_start: str,
+    latest_start: str,
+    for_indoors: bool,
+    club_ids: list[str] | None = None,
+    court_type: str | None = None,
+    is_singles_only: bool | None = None,
+    is_middle_court: bool | None = None,
+    is_wingfield: bool | None = None,
+    max_results: int = DEFAULT_MAX_SLOT_RESULTS,
+) -> list[SlotCandidate]:
+    """
+    Find free slots in several clubs at once.
+
+    The clubs are searched concurrently, each within its own fetch limit, and their
+    candidates are merged by start time. Clubs given more than once are searched once,
+    clubs without the requested module or whose search fails are skipped.
+
+    Args:
+        club_ids: IDs or names of the searched clubs, None for all clubs
+        target_date, duration_minutes, earliest_start, latest_start, for_indoors,
+        court_type, is_singles_only, is_middle_court, is_wingfield, max_results: See
+            `find_free_slots`
+
+    Returns:
+        List of at most `max_results` SlotCandidate objects with the club name set,
+        ranked by start time
+    """
+    club_registry = get_club_registry()
+    if club_ids is None:
+        clubs = list(club_registry)
+    else:
+        # IDs and names of the same club resolve to one club, keep the first occurrence
+        clubs = list(
+            {
+                club.club_id: club
+                for club in (club_registry.get(club_id) for club_id in club_ids)
+            }.values()
+        )
+    clubs = [club for club in clubs if club.has_module(for_indoors)]
+
+    results = await asyncio.gather(
+        *(
+            find_free_slots(
+                target_date=target_date,
+                duration_minutes=duration_minutes,
+                earliest_start=earliest_start,
+                latest_start=latest_start,
+                for_indoors=for_indoors,
+                court_type=court_type,
+                is_singles_only=is_singles_only,
+                is_middle_court=is_middle_court,
+                is_wingfield=is_wingfield,
+                max_results=max_results,
+                club_id=club.club_id,
+            )
+            for club in clubs
+        ),
+        return_exceptions=True,
+    )
+    candidates = []
+    for rank, (club, result) in enumerate(zip(clubs, results)):
+        if isinstance(result, BaseException):
+            print(f"Error searching free slots of {club.name}: {result}")
+            continue
+        for candidate in result:
+            candidate.club_name = club.name
+            candidates.append((candidate.start_time, rank, candidate))
+    candidates.sort(key=lambda item: item[:2])
+    return [candidate for _, _, candidate in candidates[:max_results]]
@@ -0,0 +1,193 @@
+"""
+Persistent store of fetched availability snapshots.
+
+Every snapshot stored in the availability cache is recorded in a SQLite database in WAL
+mode together with its fetch timestamp. Identical booking sets are stored only once and
+referenced by their hash, so frequent refreshes of an unchanged day only add a single
+row. On startup the latest snapshot of every upcoming day is loaded back into the cache,
+so the first requests after a cold start are served warm.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+from src.booking.availability_cache import AvailabilityCache, CacheKey
+from src.booking.availability_engine import AvailabilityGrid
+from src.booking.constants import (
+    DEFAULT_SNAPSHOT_STORE_PATH,
+    AvailabilitySnapshot,
+    CourtBooking,
+)
+from src.constants import ENV_VAR_NAME_SNAPSHOT_STORE_PATH
+from src.data.courts import get_all_court_names
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS booking_sets (
+    set_hash TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    set_hash TEXT NOT NULL REFERENCES booking_sets (set_hash),
+    court_name TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bookings_set_hash ON bookings (set_hash);
+CREATE TABLE IF NOT EXISTS snapshots (
+    target_date TEXT NOT NULL,
+    for_indoors INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    set_hash TEXT NOT NULL REFERENCES booking_sets (set_hash)
+);
+CREATE INDEX IF NOT EXISTS snapshots_key
+    ON snapshots (target_date, for_indoors, fetched_at);
+"""
+
+
+def hash_bookings(bookings: list[CourtBooking]) -> str:
+    """Order independent hash of a set of bookings."""
+    digest = hashlib.sha1()
+    for row in sorted(
+        (b.court_name, b.start_time.isoformat(), b.end_time.isoformat())
+        for b in bookings
+    ):
+        digest.update("|".join(row).encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class SnapshotStore:
+    """SQLite backed history of availability snapshots."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._last_saved: dict[CacheKey, datetime] = {}
+        self._write_tasks: set[asyncio.Task] = set()
+
+    def save(self, snapshot: AvailabilitySnapshot) -> None:
+        """Record `snapshot`, storing its bookings only if this set is not known yet."""
+        key = (snapshot.target_date, snapshot.for_indoors)
+        set_hash = hash_bookings(snapshot.court_bookings)
+        with self._lock, self._connection:
+            inserted = self._connection.execute(
+                "INSERT OR IGNORE INTO booking_sets (set_hash) VALUES (?)", (set_hash,)
+            ).rowcount
+            if inserted:
+                self._connection.executemany(
+                    "INSERT INTO bookings VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            set_hash,
+                            booking.court_name,
+                            booking.start_time.isoformat(),
+                            booking.end_time.isoformat(),
+                        )
+                        for booking in snapshot.court_bookings
+                    ],
+                )
+            self._connection.execute(
+                "INSERT INTO snapshots VALUES (?, ?, ?, ?)",
+                (
+                    snapshot.target_date.isoformat(),
+                    int(snapshot.for_indoors),
+                    snapshot.fetched_at.isoformat(),
+                    set_hash,
+                ),
+            )
+            self._last_saved[key] = snapshot.fetched_at
+
+    def load_latest(self, since: date) -> list[AvailabilitySnapshot]:
+        """The most recent snapshot of every (date, module) on or after `since`."""
+        with self._lock:
+            rows = self._connection.execute(
+                """
+                SELECT target_date, for_indoors, MAX(fetched_at), set_hash
+                FROM snapshots
+                WHERE target_date >= ?
+                GROUP BY target_date, for_indoors
+                """,
+                (since.isoformat(),),
+            ).fetchall()
+            snapshots = []
+            for target_date, for_indoors, fetched_at, set_hash in rows:
+                bookings = [
+                    CourtBooking(
+                        court_name=court_name,
+                        start_time=datetime.fromisoformat(start_time),
+                        end_time=datetime.fromisoformat(end_time),
+                    )
+                    for court_name, start_time, end_time in self._connection.execute(
+                        "SELECT court_name, start_time, end_time FROM bookings "
+                        "WHERE set_hash = ?",
+                        (set_hash,),
+                    )
+                ]
+                snapshots.append(
+                    AvailabilitySnapshot(
+                        target_date=date.fromisoformat(target_date),
+                        for_indoors=bool(for_indoors),
+                        fetched_at=datetime.fromisoformat(fetched_at),
+                        court_bookings=bookings,
+                        court_availabilities=AvailabilityGrid(
+                            court_names=get_all_court_names(
+                                for_indoors=bool(for_indoors)
+                            ),
+                            bookings=bookings,
+                        ).to_court_availabilities(),
+                    )
+                )
+        return snapshots
+
+    def warm_start(self, cache: AvailabilityCache, since: date) -> int:
+        """Load the latest snapshots on or after `since` into `cache`, return their count."""
+        snapshots = self.load_latest(since=since)
+        for snapshot in snapshots:
+            key = (snapshot.target_date, snapshot.for_indoors)
+            self._last_saved[key] = snapshot.fetched_at
+            cache.put(key, snapshot)
+        return len(snapshots)
+
+    def on_snapshot(
+        self, previous: AvailabilitySnapshot | None, current: AvailabilitySnapshot
+    ) -> None:
+        """Cache listener recording every newly fetched snapshot off the event loop."""
+        key = (current.target_date, current.for_indoors)
+        if self._last_saved.get(key) == current.fetched_at:
+            return
+        self._last_saved[key] = current.fetched_at
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save(current)
+            return
+        task = loop.create_task(asyncio.to_thread(self._save_logged, current))
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+
+    def _save_logged(self, snapshot: AvailabilitySnapshot) -> None:
+        try:
+            self.save(snapshot)
+        except sqlite3.Error as e:
+            print(f"Error saving availability snapshot: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def create_snapshot_store_from_env() -> SnapshotStore | None:
+    """Create the snapshot store at SNAPSHOT_STORE_PATH, None if it is set to an empty string."""
+    path = os.getenv(ENV_VAR_NAME_SNAPSHOT_STORE_PATH, DEFAULT_SNAPSHOT_STORE_PATH)
+    if not path:
+        return None
+    return SnapshotStore(path)
@@ -0,0 +1,189 @@
+"""
+Slot watches notifying users when a court becomes free.
+
+Whenever the availability cache stores a new snapshot of a (date, module), it is diffed
+against the previous one into freed and taken hours. Freed hours are matched against the
+registered watches through an index keyed by (date, module, hour, court), so the cost of
+a refresh depends on the number of changes, not on the number of active watches.
+"""
+
+import uuid
+from collections import defaultdict
+from datetime import date
+from typing import Callable, NamedTuple
+
+from src.booking.availability_cache import CacheKey, get_availability_cache
+from src.booking.constants import AvailabilitySnapshot, SlotWatch
+from src.utils.notifications import enqueue_push_notification
+
+WatchIndexKey = tuple[date, bool, int, str | None]
+
+
+class AvailabilityChange(NamedTuple):
+    """A single court hour that changed between two snapshots."""
+
+    target_date: date
+    for_indoors: bool
+    court_name: str
+    hour: int
+    freed: bool
+
+
+def diff_snapshots(
+    previous: AvailabilitySnapshot, current: AvailabilitySnapshot
+) -> list[AvailabilityChange]:
+    """All court hours that were freed or taken between `previous` and `current`."""
+    previous_availabilities = {
+        court_availability.court_name: court_availability.availability
+        for court_availability in previous.court_availabilities
+    }
+    changes = []
+    for court_availability in current.court_availabilities:
+        previous_availability = previous_availabilities.get(
+            court_availability.court_name
+        )
+        if previous_availability is None:
+            continue
+        for hour, available in court_availability.availability.items():
+            if previous_availability.get(hour, available) != available:
+                changes.append(
+                    AvailabilityChange(
+                        target_date=current.target_date,
+                        for_indoors=current.for_indoors,
+                        court_name=court_availability.court_name,
+                        hour=hour,
+                        freed=available,
+                    )
+                )
+    return changes
+
+
+def format_watch_notification(
+    watch: SlotWatch, changes: list[AvailabilityChange]
+) -> str:
+    """Push notification text for the freed hours matching `watch`."""
+    freed = ", ".join(
+        f"{change.court_name} um {change.hour:02d}:00"
+        for change in sorted(changes, key=lambda c: (c.hour, c.court_name))
+    )
+    return f"Am {watch.target_date.strftime('%d.%m.%Y')} ist frei geworden: {freed}"
+
+
+class WatchRegistry:
+    """Active slot watches, indexed by (date, module, hour, court)."""
+
+    def __init__(self, notify: Callable[[str], object] = enqueue_push_notification):
+        """
+        Args:
+            notify: Non-blocking callable sending a notification message
+        """
+        self.notify = notify
+        self._watches: dict[str, SlotWatch] = {}
+        self._index: dict[WatchIndexKey, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    @staticmethod
+    def _index_keys(watch: SlotWatch) -> list[WatchIndexKey]:
+        return [
+            (watch.target_date, watch.for_indoors, hour, watch.court_name)
+            for hour in range(watch.from_hour, watch.to_hour)
+        ]
+
+    def add(
+        self,
+        target_date: date,
+        for_indoors: bool,
+        from_hour: int,
+        to_hour: int,
+        court_name: str | None = None,
+    ) -> SlotWatch:
+        """Register a watch and return it, dropping the watches of past days."""
+        if not from_hour < to_hour:
+            raise ValueError(
+                f"`from_hour` must be before `to_hour`, got: {from_hour} and {to_hour}"
+            )
+        self.remove_expired(today=date.today())
+        watch = SlotWatch(
+            watch_id=uuid.uuid4().hex,
+            target_date=target_date,
+            for_indoors=for_indoors,
+            from_hour=from_hour,
+            to_hour=to_hour,
+            court_name=court_name,
+        )
+        self._watches[watch.watch_id] = watch
+        for index_key in self._index_keys(watch):
+            self._index[index_key].add(watch.watch_id)
+        return watch
+
+    def remove(self, watch_id: str) -> SlotWatch | None:
+        watch = self._watches.pop(watch_id, None)
+        if watch is None:
+            return None
+        for index_key in self._index_keys(watch):
+            watch_ids = self._index.get(index_key)
+            if watch_ids is not None:
+                watch_ids.discard(watch_id)
+                if not watch_ids:
+                    del self._index[index_key]
+        return watch
+
+    def remove_expired(self, today: date) -> int:
+        """Remove all watches of days before `today` and return how many were removed."""
+        expired = [
+            watch_id
+            for watch_id, watch in self._watches.items()
+            if watch.target_date < today
+        ]
+        for watch_id in expired:
+            self.remove(watch_id)
+        return len(expired)
+
+    def watched_keys(self) -> set[CacheKey]:
+        """All (date, for_indoors) keys with at least one active watch."""
+        return {
+            (watch.target_date, watch.for_indoors) for watch in self._watches.values()
+        }
+
+    def match(
+        self, changes: list[AvailabilityChange]
+    ) -> dict[str, list[AvailabilityChange]]:
+        """Map the IDs of all watches matched by the freed hours in `changes` to them."""
+        matches: dict[str, list[AvailabilityChange]] = defaultdict(list)
+        for change in changes:
+            if not change.freed:
+                continue
+            for court_name in (change.court_name, None):
+                index_key = (
+                    change.target_date,
+                    change.for_indoors,
+                    change.hour,
+                    court_name,
+                )
+                for watch_id in self._index.get(index_key, ()):
+                    matches[watch_id].append(change)
+        return matches
+
+    def on_snapshot(
+        self, previous: AvailabilitySnapshot | None, current: AvailabilitySnapshot
+    ) -> None:
+        """Cache listener notifying and removing all watches matched by the new snapshot."""
+        if previous is None or not self._watches:
+            return
+        for watch_id, changes in self.match(diff_snapshots(previous, current)).items():
+            watch = self.remove(watch_id)
+            self.notify(format_watch_notification(watch, changes))
+
+
+_watch_registry: WatchRegistry | None = None
+
+
+def get_watch_registry() -> WatchRegistry:
+    """Return the process-wide watch registry listening on the availability cache."""
+    global _watch_registry
+    if _watch_registry is None:
+        _watch_registry = WatchRegistry()
+        get_availability_cache().add_listener(_watch_registry.on_snapshot)
+    return _watch_registry
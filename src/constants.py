@@ -4,3 +4,19 @@ ENV_VAR_NAME_OPENAI_API_KEY: str = "OPENAI_API_KEY"
 ENV_VAR_NAME_MODEL_NAME: str = "LLM_MODEL_NAME"
 ENV_VAR_NAME_GOOGLE_API_KEY: str = "GOOGLE_API_KEY"
 ENV_VAR_NAME_GEMINI_API_BASE_URL: str = "GEMINI_API_BASE_URL"
+ENV_VAR_NAME_AVAILABILITY_CACHE_TTL: str = "AVAILABILITY_CACHE_TTL_SECONDS"
+ENV_VAR_NAME_AVAILABILITY_CACHE_MAX_ENTRIES: str = "AVAILABILITY_CACHE_MAX_ENTRIES"
+ENV_VAR_NAME_AVAILABILITY_OUTPUT_FORMAT: str = "AVAILABILITY_OUTPUT_FORMAT"
+ENV_VAR_NAME_PREFETCH_ENABLED: str = "PREFETCH_ENABLED"
+ENV_VAR_NAME_PREFETCH_DAYS: str = "PREFETCH_DAYS"
+ENV_VAR_NAME_SNAPSHOT_STORE_PATH: str = "SNAPSHOT_STORE_PATH"
+ENV_VAR_NAME_SESSION_STORE_PATH: str = "SESSION_STORE_PATH"
+ENV_VAR_NAME_SESSION_MAX_ACTIVE: str = "SESSION_MAX_ACTIVE"
+ENV_VAR_NAME_SESSION_IDLE_TTL: str = "SESSION_IDLE_TTL_SECONDS"
+ENV_VAR_NAME_SESSION_MAX_TURNS: str = "SESSION_MAX_TURNS"
+ENV_VAR_NAME_SESSION_RETENTION_DAYS: str = "SESSION_RETENTION_DAYS"
+ENV_VAR_NAME_FAST_PATH_ENABLED: str = "FAST_PATH_ENABLED"
+ENV_VAR_NAME_STREAMING_ENABLED: str = "STREAMING_ENABLED"
+ENV_VAR_NAME_EBUSY_BASE_URL: str = "EBUSY_BASE_URL"
+ENV_VAR_NAME_CLUBS_CONFIG_PATH: str = "CLUBS_CONFIG_PATH"
+ENV_VAR_NAME_METRICS_TOKEN: str = "METRICS_TOKEN"
@@ -0,0 +1,152 @@
+"""
+Configuration of the clubs served by the assistant.
+
+Every club is an eBuSy instance with up to one outdoor and one indoor booking module,
+a map of the eBuSy court IDs of each module to internal court IDs and the attributes of
+its courts. Clubs are loaded from a JSON file, so adding a club needs no code change:
+
+    {
+        "default_club_id": "stc",
+        "clubs": [
+            {
+                "club_id": "tc-nord",
+                "name": "TC Nord",
+                "base_url": "https://tc-nord.ebusy.de",
+                "modules": [
+                    {"path": "/lite-module/12", "for_indoors": false,
+                     "court_ids": {"501": 1, "502": 2}}
+                ],
+                "courts": [
+                    {"id": 1, "name": "Platz 1", "location": "vorne",
+                     "is_middle_court": false, "is_singles_only": false,
+                     "court_type": "sand"},
+                    ...
+                ]
+            }
+        ]
+    }
+
+The STC is always available as built-in club derived from the constants, unless the
+file defines a club with the same ID. `python -m src.data.clubs` prints its
+configuration as a starting point for new clubs.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.booking.constants import (
+    COURT_STC_ID_TO_INTERNAL_ID,
+    DEFAULT_CLUB_ID,
+    DEFAULT_CLUB_NAME,
+    EBUSY_MAX_CONCURRENT_FETCHES,
+    EBUSY_MAX_CONNECTIONS,
+    INDOOR_COURT_STC_ID_TO_INTERNAL_ID,
+    STC_INDOOR_MODULE_PATH,
+    STC_OUTDOOR_MODULE_PATH,
+)
+from src.booking.ebusy_client import EBUSY_STC_MUNICH_BASE_URL
+from src.constants import ENV_VAR_NAME_EBUSY_BASE_URL
+from src.data.courts import COURT_ATTRIBUTES, Court
+
+
+class ModuleConfig(BaseModel):
+    """An eBuSy booking module of a club."""
+
+    path: str = Field(description="Path of the module, e.g. '/lite-module/891'")
+    for_indoors: bool = Field(description="Whether the module holds the indoor courts")
+    court_ids: dict[int, int] = Field(
+        description="eBuSy court ID -> internal court ID of the courts in the module"
+    )
+
+
+class ClubConfig(BaseModel):
+    """A club with its eBuSy instance, booking modules and courts."""
+
+    club_id: str = Field(description="Short unique identifier, e.g. 'stc'")
+    name: str = Field(description="Display name of the club")
+    base_url: str = Field(description="Base URL of the eBuSy instance of the club")
+    max_connections: int = Field(
+        default=EBUSY_MAX_CONNECTIONS,
+        description="Size of the connection pool to the eBuSy instance",
+    )
+    max_concurrent_fetches: int = Field(
+        default=EBUSY_MAX_CONCURRENT_FETCHES,
+        description="Maximum number of concurrent requests to the eBuSy instance",
+    )
+    modules: list[ModuleConfig] = Field(description="Booking modules of the club")
+    courts: list[Court] = Field(description="Attributes of all courts of the club")
+
+    @model_validator(mode="after")
+    def validate_modules(self):
+        court_ids = {court.id for court in self.courts}
+        seen_modules = set()
+        for module in self.modules:
+            if module.for_indoors in seen_modules:
+                raise ValueError(
+                    f"Club '{self.club_id}' has more than one "
+                    f"{'indoor' if module.for_indoors else 'outdoor'} module"
+                )
+            seen_modules.add(module.for_indoors)
+            unknown_ids = set(module.court_ids.values()) - court_ids
+            if unknown_ids:
+                raise ValueError(
+                    f"Module {module.path} of club '{self.club_id}' refers to unknown "
+                    f"courts: {sorted(unknown_ids)}"
+                )
+        return self
+
+    def module(self, for_indoors: bool) -> ModuleConfig | None:
+        """The indoor or outdoor module, None if the club has none."""
+        for module in self.modules:
+            if module.for_indoors == for_indoors:
+                return module
+        return None
+
+
+class ClubsConfig(BaseModel):
+    """Content of the clubs configuration file."""
+
+    default_club_id: str = Field(
+        default=DEFAULT_CLUB_ID, description="Club used when no club is given"
+    )
+    clubs: list[ClubConfig] = Field(default_factory=list)
+
+
+def default_club_config() -> ClubConfig:
+    """Configuration of the STC built from the constants and court attributes."""
+    return ClubConfig(
+        club_id=DEFAULT_CLUB_ID,
+        name=DEFAULT_CLUB_NAME,
+        base_url=os.getenv(ENV_VAR_NAME_EBUSY_BASE_URL) or EBUSY_STC_MUNICH_BASE_URL,
+        modules=[
+            ModuleConfig(
+                path=STC_OUTDOOR_MODULE_PATH,
+                for_indoors=False,
+                court_ids=COURT_STC_ID_TO_INTERNAL_ID,
+            ),
+            ModuleConfig(
+                path=STC_INDOOR_MODULE_PATH,
+                for_indoors=True,
+                court_ids=INDOOR_COURT_STC_ID_TO_INTERNAL_ID,
+            ),
+        ],
+        courts=COURT_ATTRIBUTES,
+    )
+
+
+def load_clubs_config(path: str | Path) -> ClubsConfig:
+    """
+    Load the clubs configuration from a JSON file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        pydantic.ValidationError: If the file does not match `ClubsConfig`
+    """
+    return ClubsConfig.model_validate(json.loads(Path(path).read_text()))
+
+
+if __name__ == "__main__":
+    print(ClubsConfig(clubs=[default_club_config()]).model_dump_json(indent=2))
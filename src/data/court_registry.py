@@ -0,0 +1,209 @@
+"""
+Immutable lookup indexes over the court attributes and the eBuSy court ID maps.
+
+The registry is built once at import time. Besides lookups by internal ID, name and
+STC ID it holds one bitmask per attribute, where bit `i` stands for the i-th court
+ordered by ID, so combined filters like "sand and not singles-only and indoors" are a
+single AND of precomputed integers. Location filters match a substring of the
+lowercase locations, their masks are cached per substring.
+"""
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+if TYPE_CHECKING:
+    from src.data.courts import Court
+
+MAX_CACHED_MASKS: int = 256
+
+
+class CourtRegistry:
+    """Precomputed indexes over a fixed set of courts."""
+
+    def __init__(
+        self,
+        courts: list["Court"],
+        court_stc_id_to_internal_id: Mapping[int, int],
+        indoor_court_stc_id_to_internal_id: Mapping[int, int],
+    ):
+        self.courts: tuple["Court", ...] = tuple(sorted(courts, key=lambda c: c.id))
+        self.by_id: Mapping[int, "Court"] = MappingProxyType(
+            {court.id: court for court in self.courts}
+        )
+        self.by_name: Mapping[str, "Court"] = MappingProxyType(
+            {court.name: court for court in self.courts}
+        )
+        self._by_stc_id: dict[bool, Mapping[int, "Court"]] = {
+            False: MappingProxyType(
+                {
+                    stc_id: self.by_id[internal_id]
+                    for stc_id, internal_id in court_stc_id_to_internal_id.items()
+                }
+            ),
+            True: MappingProxyType(
+                {
+                    stc_id: self.by_id[internal_id]
+                    for stc_id, internal_id in indoor_court_stc_id_to_internal_id.items()
+                }
+            ),
+        }
+        self._stc_id_to_name: dict[bool, Mapping[int, str]] = {
+            for_indoors: MappingProxyType(
+                {stc_id: court.name for stc_id, court in by_stc_id.items()}
+            )
+            for for_indoors, by_stc_id in self._by_stc_id.items()
+        }
+
+        self._bit: dict[int, int] = {
+            court.id: 1 << position for position, court in enumerate(self.courts)
+        }
+        self.all_mask: int = self._mask_of(self.courts)
+        self.indoors_mask: int = self._mask_of(c for c in self.courts if c.is_indoors)
+        self.middle_court_mask: int = self._mask_of(
+            c for c in self.courts if c.is_middle_court
+        )
+        self.singles_only_mask: int = self._mask_of(
+            c for c in self.courts if c.is_singles_only
+        )
+        self.wingfield_mask: int = self._mask_of(
+            c for c in self.courts if c.is_wingfield
+        )
+        self.court_type_masks: Mapping[str, int] = MappingProxyType(
+            {
+                court_type: self._mask_of(
+                    c for c in self.courts if c.court_type.lower() == court_type
+                )
+                for court_type in {c.court_type.lower() for c in self.courts}
+            }
+        )
+        self._locations: tuple[str, ...] = tuple(
+            court.location.lower() for court in self.courts
+        )
+        # Per registry caches, bounded to MAX_CACHED_MASKS entries each
+        self._location_masks: dict[str, int] = {}
+        self._courts_by_mask: dict[int, tuple["Court", ...]] = {}
+        self._module_masks: dict[bool, int] = {
+            for_indoors: self._mask_of(by_stc_id.values())
+            for for_indoors, by_stc_id in self._by_stc_id.items()
+        }
+        self._module_court_names: dict[bool, tuple[str, ...]] = {
+            for_indoors: tuple(
+                court.name for court in self.courts if self._bit[court.id] & mask
+            )
+            for for_indoors, mask in self._module_masks.items()
+        }
+
+    def _mask_of(self, courts: Iterable["Court"]) -> int:
+        mask = 0
+        for court in courts:
+            mask |= self._bit[court.id]
+        return mask
+
+    def location_mask(self, location: str) -> int:
+        """Bitmask of all courts whose location contains `location`, ignoring case."""
+        location = location.lower()
+        mask = self._location_masks.get(location)
+        if mask is None:
+            mask = 0
+            for position, court_location in enumerate(self._locations):
+                if location in court_location:
+                    mask |= 1 << position
+            if len(self._location_masks) < MAX_CACHED_MASKS:
+                self._location_masks[location] = mask
+        return mask
+
+    def by_stc_id(self, for_indoors: bool) -> Mapping[int, "Court"]:
+        """STC court ID -> Court of the indoor or outdoor booking module."""
+        return self._by_stc_id[for_indoors]
+
+    def stc_id_to_name(self, for_indoors: bool) -> Mapping[int, str]:
+        """STC court ID -> court name of the indoor or outdoor booking module."""
+        return self._stc_id_to_name[for_indoors]
+
+    def module_mask(self, for_indoors: bool) -> int:
+        """Bitmask of all courts bookable in the indoor or outdoor booking module."""
+        return self._module_masks[for_indoors]
+
+    def court_names(self, for_indoors: bool) -> list[str]:
+        """Names of all courts bookable in the indoor or outdoor module, ordered by ID."""
+        return list(self._module_court_names[for_indoors])
+
+    def mask(
+        self,
+        for_indoors: bool | None = None,
+        is_indoors: bool | None = None,
+        court_type: str | None = None,
+        is_singles_only: bool | None = None,
+        is_middle_court: bool | None = None,
+        is_wingfield: bool | None = None,
+        location: str | None = None,
+    ) -> int:
+        """
+        Bitmask of all courts matching every given filter, None means no filter.
+
+        Args:
+            for_indoors: Restrict to the courts of the indoor or outdoor booking module
+            is_indoors: Filter on courts with a roof in winter
+            court_type: Surface, e.g. 'sand' or 'granulat'
+            is_singles_only: Filter on singles-only courts
+            is_middle_court: Filter on middle courts
+            is_wingfield: Filter on courts with a Wingfield system
+            location: Substring of the location, e.g. 'hinten' or 'Tennisschule'
+
+        Returns:
+            Integer with the bits of all matching courts set
+        """
+        mask = self.all_mask
+        if for_indoors is not None:
+            mask &= self._module_masks[for_indoors]
+        if court_type is not None:
+            mask &= self.court_type_masks.get(court_type.lower(), 0)
+        if location:
+            mask &= self.location_mask(location)
+        for value, attribute_mask in (
+            (is_indoors, self.indoors_mask),
+            (is_singles_only, self.singles_only_mask),
+            (is_middle_court, self.middle_court_mask),
+            (is_wingfield, self.wingfield_mask),
+        ):
+            if value is True:
+                mask &= attribute_mask
+            elif value is False:
+                mask &= ~attribute_mask
+        return mask
+
+    def courts_from_mask(self, mask: int) -> tuple["Court", ...]:
+        """All courts whose bits are set in `mask`, ordered by ID."""
+        courts = self._courts_by_mask.get(mask)
+        if courts is None:
+            courts = tuple(
+                court
+                for position, court in enumerate(self.courts)
+                if mask >> position & 1
+            )
+            if len(self._courts_by_mask) < MAX_CACHED_MASKS:
+                self._courts_by_mask[mask] = courts
+        return courts
+
+    def filter(
+        self,
+        for_indoors: bool | None = None,
+        is_indoors: bool | None = None,
+        court_type: str | None = None,
+        is_singles_only: bool | None = None,
+        is_middle_court: bool | None = None,
+        is_wingfield: bool | None = None,
+        location: str | None = None,
+    ) -> tuple["Court", ...]:
+        """All courts matching every given filter, see `mask`."""
+        return self.courts_from_mask(
+            self.mask(
+                for_indoors=for_indoors,
+                is_indoors=is_indoors,
+                court_type=court_type,
+                is_singles_only=is_singles_only,
+                is_middle_court=is_middle_court,
+                is_wingfield=is_wingfield,
+                location=location,
+            )
+        )
@@ -5,6 +5,12 @@ Court data and context information for the tennis booking assistant.
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+from src.booking.constants import (
+    COURT_STC_ID_TO_INTERNAL_ID,
+    INDOOR_COURT_STC_ID_TO_INTERNAL_ID,
+)
+from src.data.court_registry import CourtRegistry
+
 
 from pydantic import BaseModel, Field
 
@@ -248,20 +254,25 @@ COURT_ATTRIBUTES = [
 ]
 
 
+COURT_REGISTRY = CourtRegistry(
+    courts=COURT_ATTRIBUTES,
+    court_stc_id_to_internal_id=COURT_STC_ID_TO_INTERNAL_ID,
+    indoor_court_stc_id_to_internal_id=INDOOR_COURT_STC_ID_TO_INTERNAL_ID,
+)
+
+
 def get_all_court_names(for_indoors: bool = False) -> list[str]:
     """Get a list of all court names."""
     if for_indoors:
-        return [court.name for court in COURT_ATTRIBUTES if court.is_indoors]
+        courts = COURT_REGISTRY.filter(is_indoors=True)
     else:
-        return [court.name for court in COURT_ATTRIBUTES]
+        courts = COURT_REGISTRY.courts
+    return [court.name for court in courts]
 
 
 def get_court_by_id(court_id: int) -> Optional[Court]:
     """Get a court by its ID."""
-    for court in COURT_ATTRIBUTES:
-        if court.id == court_id:
-            return court
-    return None
+    return COURT_REGISTRY.by_id.get(court_id)
 
 
 def get_available_courts() -> List[Court]:
@@ -271,23 +282,19 @@ def get_available_courts() -> List[Court]:
 
 def get_courts_by_type(court_type: str) -> List[Court]:
     """Get courts by type (e.g., 'clay', 'hard', 'indoor')."""
-    return [
-        court
-        for court in COURT_ATTRIBUTES
-        if court.court_type.lower() == court_type.lower()
-    ]
+    return list(COURT_REGISTRY.filter(court_type=court_type))
 
 
 def get_middle_courts() -> List[Court]:
     """Get all middle courts."""
-    return [court for court in COURT_ATTRIBUTES if court.is_middle_court]
+    return list(COURT_REGISTRY.filter(is_middle_court=True))
 
 
 def get_singles_courts() -> List[Court]:
     """Get courts that are singles only."""
-    return [court for court in COURT_ATTRIBUTES if court.is_singles_only]
+    return list(COURT_REGISTRY.filter(is_singles_only=True))
 
 
 def get_wingfield_courts() -> List[Court]:
     """Get courts that are Wingfield courts."""
-    return [court for court in COURT_ATTRIBUTES if court.is_wingfield]
+    return list(COURT_REGISTRY.filter(is_wingfield=True))
@@ -0,0 +1,246 @@
+"""
+Process-wide latency histograms and counters.
+
+Metrics are kept in memory and rendered in the Prometheus text exposition format by
+`render_metrics`, which run.py serves at /metrics next to the Chainlit app.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: LabelValues) -> str:
+    if not label_names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{value}"' for name, value in zip(label_names, label_values)
+    )
+    return f"{{{pairs}}}"
+
+
+class Counter:
+    """Monotonically increasing count per label combination."""
+
+    kind: str = "counter"
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(
+            tuple(str(labels[name]) for name in self.label_names), 0.0
+        )
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {value}"
+            for key, value in values
+        ]
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets per label combination."""
+
+    kind: str = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        # Per label combination: counts per bucket (last one is +Inf), sum
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the `with` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        values = self._values.get(tuple(str(labels[name]) for name in self.label_names))
+        return sum(values[0]) if values else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(
+                (key, (list(counts), total[0]))
+                for key, (counts, total) in self._values.items()
+            )
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bound = "+Inf" if upper_bound == float("inf") else repr(upper_bound)
+                labels = _format_labels(self.label_names + ("le",), key + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Value read from a callback whenever the metrics are rendered.
+
+    Set `kind` to 'counter' for callbacks returning a count kept elsewhere.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        read: Callable[[], float],
+        kind: str = "gauge",
+    ):
+        self.name = name
+        self.description = description
+        self.read = read
+        self.kind = kind
+
+    def render(self) -> list[str]:
+        try:
+            return [f"{self.name} {float(self.read())}"]
+        except Exception as e:
+            print(f"Error reading gauge {self.name}: {e}")
+            return []
+
+
+_metrics: dict[str, Counter | Histogram | Gauge] = {}
+
+
+def _register(metric):
+    existing = _metrics.get(metric.name)
+    if existing is not None:
+        return existing
+    _metrics[metric.name] = metric
+    return metric
+
+
+def counter(name: str, description: str, label_names: tuple[str, ...] = ()) -> Counter:
+    """Return the counter `name`, registering it on first use."""
+    return _register(Counter(name, description, label_names))
+
+
+def histogram(
+    name: str,
+    description: str,
+    label_names: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+) -> Histogram:
+    """Return the histogram `name`, registering it on first use."""
+    return _register(Histogram(name, description, label_names, buckets))
+
+
+def gauge(
+    name: str, description: str, read: Callable[[], float], kind: str = "gauge"
+) -> Gauge:
+    """Register a gauge reading its value from `read`, replacing an existing one."""
+    _metrics[name] = Gauge(name, description, read, kind=kind)
+    return _metrics[name]
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for name, metric in sorted(_metrics.items()):
+        lines.append(f"# HELP {name} {metric.description}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+EBUSY_REQUEST_SECONDS = histogram(
+    "ebusy_request_seconds",
+    "Duration of eBuSy HTTP requests",
+    ("module", "outcome"),
+)
+EBUSY_UNCHANGED_RESPONSES = counter(
+    "ebusy_unchanged_responses_total",
+    "eBuSy responses with unchanged reservations by detection (not_modified or body_hash)",
+    ("validator",),
+)
+EBUSY_JSON_PARSE_SECONDS = histogram(
+    "ebusy_json_parse_seconds", "Duration of decoding eBuSy JSON responses"
+)
+RESERVATION_PARSE_SECONDS = histogram(
+    "reservation_parse_seconds", "Duration of parsing eBuSy reservations into bookings"
+)
+AVAILABILITY_CONVERSION_SECONDS = histogram(
+    "availability_conversion_seconds",
+    "Duration of converting bookings into court availabilities",
+)
+AVAILABILITY_CACHE_REQUESTS = counter(
+    "availability_cache_requests_total",
+    "Availability cache lookups by result (hit, stale or miss)",
+    ("result",),
+)
+TOOL_CALL_SECONDS = histogram(
+    "agent_tool_call_seconds", "Duration of agent tool calls", ("tool",)
+)
+LLM_TURN_SECONDS = histogram(
+    "agent_llm_turn_seconds",
+    "Duration of a single LLM call of the agent",
+    ("model",),
+)
+MESSAGE_SECONDS = histogram(
+    "chat_message_seconds",
+    "End-to-end latency of answering a chat message",
+    ("path",),
+)
@@ -0,0 +1,235 @@
+"""
+Push notifications via Pushover.
+
+Notifications are enqueued to a `PushDispatcher`, which delivers them from a background
+task through a pluggable sink, so callers on the event loop never wait for the HTTP
+request. Identical messages within a short window are sent only once, messages queued at
+the same time are batched into a single push and failed deliveries are retried with
+exponential backoff.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+import httpx
+
+PUSHOVER_URL: str = "https://api.pushover.net/1/messages.json"
+PUSHOVER_MAX_MESSAGE_LENGTH: int = 1024
+
+PUSH_QUEUE_SIZE: int = 100
+PUSH_MAX_RETRIES: int = 3
+PUSH_BACKOFF_SECONDS: float = 1.0
+PUSH_DEDUP_WINDOW_SECONDS: float = 60.0
+PUSH_MAX_BATCH_SIZE: int = 5
+PUSH_TIMEOUT_SECONDS: float = 10.0
+
+NotificationSink = Callable[[str], Awaitable[None]]
+
+
+class NotificationRejectedError(Exception):
+    """Raised by a sink if a message can not be delivered by retrying, e.g. bad credentials."""
+
+
+class PushoverSink:
+    """Sink posting messages to Pushover with a pooled HTTP client."""
+
+    def __init__(
+        self,
+        token: str | None,
+        user: str | None,
+        url: str = PUSHOVER_URL,
+        timeout: float = PUSH_TIMEOUT_SECONDS,
+    ):
+        self.token = token
+        self.user = user
+        self.url = url
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=1),
+        )
+
+    async def __call__(self, message: str) -> None:
+        response = await self._client.post(
+            self.url,
+            data={"user": self.user, "token": self.token, "message": message},
+        )
+        if response.status_code < 500 and response.status_code != 429:
+            if response.is_error:
+                raise NotificationRejectedError(
+                    f"Pushover rejected the message ({response.status_code}): "
+                    f"{response.text}"
+                )
+            return
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class PushDispatcher:
+    """Bounded queue of push notifications delivered by a background task."""
+
+    def __init__(
+        self,
+        sink: NotificationSink,
+        max_queue_size: int = PUSH_QUEUE_SIZE,
+        max_retries: int = PUSH_MAX_RETRIES,
+        backoff_seconds: float = PUSH_BACKOFF_SECONDS,
+        dedup_window_seconds: float = PUSH_DEDUP_WINDOW_SECONDS,
+        max_batch_size: int = PUSH_MAX_BATCH_SIZE,
+        max_message_length: int = PUSHOVER_MAX_MESSAGE_LENGTH,
+    ):
+        self.sink = sink
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.dedup_window_seconds = dedup_window_seconds
+        self.max_batch_size = max_batch_size
+        self.max_message_length = max_message_length
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self._recent: OrderedDict[str, float] = OrderedDict()
+        self._task: asyncio.Task | None = None
+        # Message taken from the queue that did not fit into the previous batch
+        self._carry: str | None = None
+        self.sent: int = 0
+        self.failed: int = 0
+        self.dropped: int = 0
+
+    def enqueue(self, message: str) -> bool:
+        """
+        Queue `message` for delivery without waiting for it.
+
+        Returns:
+            False if the message was dropped as duplicate or because the queue is full
+        """
+        now = time.monotonic()
+        while self._recent:
+            oldest_message, enqueued_at = next(iter(self._recent.items()))
+            if now - enqueued_at < self.dedup_window_seconds:
+                break
+            del self._recent[oldest_message]
+        if message in self._recent:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            print(f"Push queue full, dropping: {message}")
+            self.dropped += 1
+            return False
+        self._recent[message] = now
+        self.start()
+        return True
+
+    def _next_batch(self, first: str) -> tuple[str, int]:
+        """
+        Join `first` with the messages already queued as long as they fit one push.
+
+        Returns:
+            Tuple of (batched message, number of messages taken from the queue)
+        """
+        messages = [first]
+        length = len(first)
+        while len(messages) < self.max_batch_size and not self._queue.empty():
+            next_message = self._queue.get_nowait()
+            if length + 1 + len(next_message) > self.max_message_length:
+                self._carry = next_message
+                break
+            messages.append(next_message)
+            length += 1 + len(next_message)
+        return "\n".join(messages), len(messages)
+
+    async def _deliver(self, message: str) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.sink(message)
+                return True
+            except NotificationRejectedError as e:
+                print(f"Error sending push notification: {e}")
+                return False
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(
+                        f"Error sending push notification after {attempt + 1} "
+                        f"attempts: {e}"
+                    )
+                    return False
+                await asyncio.sleep(self.backoff_seconds * 2**attempt)
+        return False
+
+    async def run(self) -> None:
+        """Deliver queued messages forever."""
+        while True:
+            if self._carry is not None:
+                message, self._carry = self._carry, None
+            else:
+                message = await self._queue.get()
+            batch, num_messages = self._next_batch(message)
+            try:
+                if await self._deliver(batch):
+                    self.sent += num_messages
+                else:
+                    self.failed += num_messages
+            finally:
+                for _ in range(num_messages):
+                    self._queue.task_done()
+
+    def start(self) -> None:
+        """Start the delivery task if an event loop is running, else on the next call."""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self.run())
+
+    async def flush(self) -> None:
+        """Wait until all queued messages were delivered or given up on."""
+        self.start()
+        await self._queue.join()
+
+    async def stop(self, timeout: float = PUSH_TIMEOUT_SECONDS) -> None:
+        """
+        Deliver the queued messages for at most `timeout` seconds, then stop and close
+        the sink if it has an `aclose` method.
+        """
+        aclose = getattr(self.sink, "aclose", None)
+        if self._task is None:
+            if aclose is not None:
+                await aclose()
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"Dropping {self._queue.qsize()} undelivered push notifications")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if aclose is not None:
+            await aclose()
+
+
+_push_dispatcher: PushDispatcher | None = None
+
+
+def get_push_dispatcher() -> PushDispatcher:
+    """Return the process-wide push dispatcher sending to Pushover."""
+    global _push_dispatcher
+    if _push_dispatcher is None:
+        _push_dispatcher = PushDispatcher(
+            sink=PushoverSink(
+                token=os.getenv("PUSHOVER_TOKEN"), user=os.getenv("PUSHOVER_USER")
+            )
+        )
+    return _push_dispatcher
+
+
+def enqueue_push_notification(message: str) -> bool:
+    """Queue `message` as push notification on the process-wide dispatcher."""
+    return get_push_dispatcher().enqueue(message)
@@ -3,13 +3,13 @@
 Test script to verify the tennis booking assistant setup.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 from datetime import date
 
-# Add src to Python path
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
 
 
 def test_imports():
@@ -17,21 +17,21 @@ def test_imports():
     print("🔍 Testing imports...")
 
     try:
-        from data.courts import COURT_ATTRIBUTES, get_court_by_id
+        from src.data.courts import COURT_ATTRIBUTES, get_court_by_id
 
         print("✅ Courts module imported successfully")
 
-        from data.user_preferences import user_preferences
+        from src.data.user_preferences import set_user_preferences
 
         print("✅ User preferences module imported successfully")
 
-        from booking.stc_client import stc_client
+        from src.booking.booking_fetcher import CourtBookingFetcher
 
-        print("✅ STC client module imported successfully")
+        print("✅ Booking fetcher module imported successfully")
 
-        from agent.tennis_agent import TennisBookingAgent
+        from src.agent.openai_agent.agent import BookingManager
 
-        print("✅ Tennis agent module imported successfully")
+        print("✅ Booking agent module imported successfully")
 
         return True
     except ImportError as e:
@@ -43,7 +43,7 @@ def test_court_data():
     """Test court data functionality."""
     print("\n🎾 Testing court data...")
 
-    from data.courts import (
+    from src.data.courts import (
         COURT_ATTRIBUTES,
         get_court_by_id,
         get_courts_by_type,
@@ -53,7 +53,7 @@ def test_court_data():
     print(f"✅ Found {len(COURT_ATTRIBUTES)} courts")
 
     # Test court lookup
-    court = get_court_by_id("court_1")
+    court = get_court_by_id(1)
     if court:
         print(f"✅ Court lookup works: {court.name}")
 
@@ -74,7 +74,9 @@ def test_user_preferences():
     """Test user preferences functionality."""
     print("\n👤 Testing user preferences...")
 
-    from data.user_preferences import user_preferences
+    from src.data.user_preferences import set_user_preferences
+
+    user_preferences = set_user_preferences()
 
     # Test getting preferences
     laura_prefs = user_preferences.get_preferred_courts("Laura")
@@ -96,48 +98,109 @@ def test_user_preferences():
     return True
 
 
-def test_stc_client():
-    """Test STC client functionality."""
-    print("\n🌐 Testing STC client...")
+def test_booking_fetcher():
+    """Test fetching bookings from eBuSy."""
+    print("\n🌐 Testing booking fetcher...")
 
-    from booking.stc_client import stc_client
+    from src.booking.booking_fetcher import CourtBookingFetcher
+    from src.booking.ebusy_client import EbusyUnavailableError
 
     try:
         # Test fetching availability for today
         today = date.today()
-        availability = stc_client.get_court_availability(today)
-
-        if availability:
-            print(f"✅ Successfully fetched availability for {len(availability)} courts")
+        booking_fetcher = asyncio.run(
+            CourtBookingFetcher.fetch(target_date=today, for_indoors=False)
+        )
+        availability = booking_fetcher.get_court_availabilities()
+
+        if booking_fetcher.get_court_bookings():
+            print(
+                f"✅ Successfully fetched availability for {len(availability)} courts"
+            )
             for court_avail in availability[:3]:  # Show first 3
-                print(
-                    f"   - {court_avail.court_name}: {len(court_avail.time_slots)} slots"
-                )
+                free_hours = sum(court_avail.availability.values())
+                print(f"   - {court_avail.court_name}: {free_hours} free hours")
         else:
-            print("⚠️ No availability data returned (this might be normal)")
+            print("⚠️ No booking data returned (this might be normal)")
+
+        return True
+    except EbusyUnavailableError as e:
+        print(f"⚠️ eBuSy not reachable (this might be normal offline): {e}")
+        return True
+    except Exception as e:
+        print(f"❌ Booking fetcher error: {e}")
+        return False
+
 
+def test_ebusy_circuit_breaker():
+    """Test that the circuit recovers after a half-open trial with an undecodable body."""
+    print("\n🔌 Testing eBuSy circuit breaker...")
+
+    import httpx
+
+    from src.booking.circuit_breaker import CIRCUIT_CLOSED, CircuitBreaker
+    from src.booking.ebusy_client import EbusyClient, EbusyUnavailableError
+
+    # Server error, then a body that is not valid UTF-8, then a valid response
+    responses = [
+        httpx.Response(500),
+        httpx.Response(200, content=b'{"reservations": "\xff"}'),
+        httpx.Response(200, json={"reservations": []}),
+    ]
+
+    async def fetch_all() -> list[str]:
+        # Opens after a single failure and lets a trial request through right away
+        client = EbusyClient(
+            base_url="http://ebusy.test",
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=1, reset_timeout_seconds=0
+            ),
+        )
+        client._client = httpx.AsyncClient(
+            base_url="http://ebusy.test",
+            transport=httpx.MockTransport(lambda request: responses.pop(0)),
+        )
+        outcomes = []
+        for _ in range(3):
+            try:
+                await client.fetch_reservations("/lite-module/891", "06/14/2025")
+                outcomes.append("ok")
+            except EbusyUnavailableError:
+                outcomes.append("unavailable")
+        outcomes.append(client.circuit_breaker.state)
+        await client.aclose()
+        return outcomes
+
+    try:
+        outcomes = asyncio.run(fetch_all())
+        if outcomes != ["unavailable", "unavailable", "ok", CIRCUIT_CLOSED]:
+            print(f"❌ Circuit breaker did not recover: {outcomes}")
+            return False
+        print("✅ Circuit breaker recovers after an undecodable response")
         return True
     except Exception as e:
-        print(f"❌ STC client error: {e}")
+        print(f"❌ Circuit breaker error: {type(e).__name__}: {e}")
         return False
 
 
 def test_agent():
-    """Test tennis agent functionality."""
-    print("\n🤖 Testing tennis agent...")
+    """Test booking agent functionality."""
+    print("\n🤖 Testing booking agent...")
 
-    from agent.tennis_agent import TennisBookingAgent
+    from src.agent.openai_agent.agent import BookingManager, OpenAIAgent
+    from src.agent.fast_path import parse_query
 
     try:
         # Create agent with dummy API key for testing
-        agent = TennisBookingAgent("dummy-key")
-        print("✅ Tennis agent created successfully")
+        agent = OpenAIAgent.build_agent("dummy-key", "gpt-4o-mini")
+        BookingManager(agent=agent)
+        print("✅ Booking agent created successfully")
 
         # Test request parsing
-        test_message = "I want to play tennis tomorrow at 3pm"
-        request = agent._parse_user_request(test_message)
+        test_message = "Ich möchte morgen um 15 Uhr spielen"
+        request = parse_query(test_message, today=date.today())
 
-        if request.target_date:
+        if request is not None:
             print(f"✅ Request parsing works: {request.target_date}")
 
         return True
@@ -154,7 +217,8 @@ def main():
         test_imports,
         test_court_data,
         test_user_preferences,
-        test_stc_client,
+        test_booking_fetcher,
+        test_ebusy_circuit_breaker,
         test_agent,
     ]
 